@@ -1,18 +1,27 @@
 import os
 from openai import OpenAI
+from ..service.answer_cache import AnswerCache
 from ..service.chat_session_manager import ChatSessionManager
+from ..service.league_digest import get_league_digest_service
+from ..service.league_search_service import get_league_search_service
+from ..service.league_tools import get_league_tool_service
 from ..service.openai_agent_manager import OpenaiAgentManager
 from ..service.openai_file_manager import OpenaiFileManager
 from ..service.vector_store_manager import VectorStoreManager
+from ..repository.storage.chat_session_store import create_chat_session_store
 from ..repository.supaBase.repositories.vector_metadata_repository import (
     VectorStoreMetadataRepository,
 )
+from ..repository.supaBase.repositories.openai_file_registry_repository import (
+    OpenaiFileRegistryRepository,
+)
 
 _openai_client = None
 _openai_agent_manager = None
 _openai_file_manager = None
 _vector_store_manager = None
 _chat_session_manager = None
+_answer_cache = None
 
 
 def set_services():
@@ -21,16 +30,41 @@ def set_services():
         _openai_agent_manager, \
         _openai_file_manager, \
         _vector_store_manager, \
-        _chat_session_manager
-
-    _openai_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-    _chat_session_manager = ChatSessionManager()
+        _chat_session_manager, \
+        _answer_cache
+
+    # Retries are done by the OpenAI gateway, which also limits concurrency
+    _openai_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"], max_retries=0)
+    _chat_session_manager = ChatSessionManager(
+        create_chat_session_store(),
+        max_sessions=int(os.environ.get("CHAT_SESSION_MAX_SESSIONS", "10000")),
+        idle_ttl_seconds=float(os.environ.get("CHAT_SESSION_IDLE_TTL_SECONDS", "21600")),
+    )
+    file_registry_repository = OpenaiFileRegistryRepository()
     _vector_store_manager = VectorStoreManager(
-        VectorStoreMetadataRepository(), _openai_client
+        VectorStoreMetadataRepository(), _openai_client, file_registry_repository
+    )
+    _openai_file_manager = OpenaiFileManager(
+        _vector_store_manager, _openai_client, file_registry_repository
+    )
+    # Answers to repeated first-turn questions (ANSWER_CACHE_MAX_ENTRIES=0 disables it)
+    answer_cache_max_entries = int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "512"))
+    _answer_cache = (
+        AnswerCache(
+            max_entries=answer_cache_max_entries,
+            ttl_seconds=float(os.environ.get("ANSWER_CACHE_TTL_SECONDS", "900")),
+        )
+        if answer_cache_max_entries > 0
+        else None
     )
-    _openai_file_manager = OpenaiFileManager(_vector_store_manager, _openai_client)
     _openai_agent_manager = OpenaiAgentManager(
-        _chat_session_manager, _vector_store_manager, _openai_client
+        _chat_session_manager,
+        _vector_store_manager,
+        _openai_client,
+        get_league_search_service(),
+        get_league_tool_service(),
+        get_league_digest_service(),
+        _answer_cache,
     )
 
 
@@ -54,3 +88,5 @@ def chat_session_manager() -> ChatSessionManager:
     return _chat_session_manager
 
 
+def answer_cache() -> AnswerCache:
+    return _answer_cache
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Tuple
 
+from ..repository.storage.league_data_store import LeagueDataStore
+
 class SyncLeagueData(ABC):
     """Abstract base class that all platform syncs must implement"""
     
@@ -35,8 +37,8 @@ class SyncLeagueData(ABC):
         pass
     
     @abstractmethod
-    def sync_full_league(self, start_week: int = 1, end_week: int = 20, days_back: int = 7) -> Dict[str, str]:
-        """Sync all league data and save to JSON files"""
+    def sync_full_league(self, data_store: LeagueDataStore, start_week: int = 1, end_week: int = 20, days_back: int = 7) -> Dict[str, str]:
+        """Sync all league data and save it to the data store"""
         pass
     
     
\ No newline at end of file
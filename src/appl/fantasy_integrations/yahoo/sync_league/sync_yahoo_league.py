@@ -5,7 +5,8 @@ from typing import Any, Dict
 
 import yahoo_fantasy_api as yfa
 from ...i_sync_league import SyncLeagueData
-from ....repository.azure.azure_blob_storage import AzureBlobStorage
+from ....model.file import SerializedSection
+from ....repository.storage.league_data_store import LeagueDataStore
 
 logger = logging.getLogger(__name__)
 STAT_ID_TO_NAME = {
@@ -348,35 +349,34 @@ class YahooLeague(SyncLeagueData):
 
     def sync_full_league(
         self,
-        azure_blob_storage: AzureBlobStorage,
+        data_store: LeagueDataStore,
         start_week: int = 1,
         end_week: int = 20,
         days_back: int = 7,
     ) -> Dict[str, any]:
         """
-        Sync all league data to Azure using robust upload with retries.
+        Sync all league data to the data store using robust upload with retries.
         Each blob is uploaded independently - one failure doesn't stop others.
 
         Args:
-            azure_blob_storage: Azure Blob Storage instance for saving data
+            data_store: League data store (Azure, local or in-memory) for saving data
             start_week: Starting week for matchups (default: 1)
             end_week: Ending week for matchups (default: 20)
             days_back: Number of days back for daily roster (default: 7)
 
+        Each section is serialized once; the same SerializedSection is uploaded to
+        the data store and returned for the OpenAI upload.
+
         Returns:
-            Dict[str, bool]: Results mapping blob type to success status
-                - True: Upload succeeded or was skipped (content unchanged)
-                - False: Upload failed after retries
+            Dict[str, SerializedSection]: Sections that were uploaded or skipped
+            (content unchanged). Sections that failed are left out.
 
         Example:
             {
-                'league_settings': True,
-                'standings': True,
-                'matchups': False,  # Failed
-                'free_agents': True,
-                'team_roster': True,
-                'schedule': True,
-                'daily_roster': True
+                'league_settings': SerializedSection(...),
+                'standings': SerializedSection(...),
+                'free_agents': SerializedSection(...),
+                'team_rosters': SerializedSection(...),
             }
         """
         results = {}
@@ -384,8 +384,8 @@ class YahooLeague(SyncLeagueData):
 
         # 1. League settings
         try:
-            league_settings = self._league_setting()
-            success = azure_blob_storage.upload_json_with_retries(
+            league_settings = SerializedSection.from_data("league_settings", self._league_setting())
+            success = data_store.upload_json_with_retries(
                 league_settings, f"{directory_name}/league_settings.json"
             )
             if success:
@@ -395,8 +395,8 @@ class YahooLeague(SyncLeagueData):
 
         # 2. Standings
         try:
-            standings = self._standings()
-            success = azure_blob_storage.upload_json_with_retries(
+            standings = SerializedSection.from_data("standings", self._standings())
+            success = data_store.upload_json_with_retries(
                 standings, f"{directory_name}/standings.json"
             )
             if success:
@@ -406,8 +406,8 @@ class YahooLeague(SyncLeagueData):
 
         # 3. Matchups
         try:
-            matchups = self._matchups(start_week, end_week)
-            success = azure_blob_storage.upload_json_with_retries(
+            matchups = SerializedSection.from_data("matchups", self._matchups(start_week, end_week))
+            success = data_store.upload_json_with_retries(
                 matchups, f"{directory_name}/matchups.json"
             )
             if success:
@@ -417,8 +417,8 @@ class YahooLeague(SyncLeagueData):
 
         # 4. Free agents
         try:
-            free_agents = self._free_agents()
-            success = azure_blob_storage.upload_json_with_retries(
+            free_agents = SerializedSection.from_data("free_agents", self._free_agents())
+            success = data_store.upload_json_with_retries(
                 free_agents, f"{directory_name}/free_agents.json"
             )
             if success:
@@ -428,8 +428,8 @@ class YahooLeague(SyncLeagueData):
 
         # 5. Team current roster
         try:
-            team_rosters = self._team_current_roster()
-            success = azure_blob_storage.upload_json_with_retries(
+            team_rosters = SerializedSection.from_data("team_rosters", self._team_current_roster())
+            success = data_store.upload_json_with_retries(
                 team_rosters, f"{directory_name}/team_roster.json"
             )
             if success:
@@ -439,8 +439,8 @@ class YahooLeague(SyncLeagueData):
 
         # 6. Schedule
         try:
-            schedule = self._schedule()
-            success = azure_blob_storage.upload_json_with_retries(
+            schedule = SerializedSection.from_data("schedule", self._schedule())
+            success = data_store.upload_json_with_retries(
                 schedule, f"{directory_name}/schedule.json"
             )
             if success:
@@ -453,7 +453,7 @@ class YahooLeague(SyncLeagueData):
         #     end_date = datetime.now().strftime("%Y-%m-%d")
         #     start_date = "2025-22-10"  # (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
         #     daily_roster = self._daily_roster(start_date, end_date)
-        #     success = azure_blob_storage.upload_json_with_retries(
+        #     success = data_store.upload_json_with_retries(
         #         daily_roster, f"{directory_name}/daily_roster.json"
         #     )
         #     if success:
@@ -462,16 +462,8 @@ class YahooLeague(SyncLeagueData):
         #     logger.error(f"Error preparing daily_roster: {e}")
 
 
-        # 8. Player stats
-        try:
-            player_stats = self._player_stats()
-            success = azure_blob_storage.upload_json_with_retries(
-                player_stats, f"{directory_name}/player_stats.json"
-            )
-            if success:
-                results["player_stats"] = player_stats
-        except Exception as e:
-            logger.error(f"Error preparing player_stats: {e}")
+        # NBA player stats are league-independent: the chat tools read them from
+        # the general player stats file (see league_sql_database.get_nba_player_stats)
 
         # Log summary
         total_blobs = len(results)
@@ -1,5 +1,4 @@
 import logging
-import os
 import threading
 from datetime import datetime, timezone
 from typing import Any, Dict
@@ -8,10 +7,14 @@ import requests
 from yahoo_fantasy_api.league import yfa
 from .league_sync_manager import get_sync_manager
 from ....fantasy_integrations.yahoo.sync_league.sync_yahoo_league import YahooLeague
-from ....repository.azure.azure_blob_storage import AzureBlobStorage
+from ....repository.storage.store_factory import create_league_data_store
 from ....repository.supaBase.repositories.yahoo_league_repository import (
     YahooLeagueRepository,
 )
+from ....service.league_digest import get_league_digest_service, manager_team_keys
+from ....service.league_document_renderer import render_league_documents
+from ....service.league_search_service import get_league_search_service
+from ....service.league_tools import get_league_tool_service
 from ....service.openai_file_manager import OpenaiFileManager
 
 logger = logging.getLogger(__name__)
@@ -115,7 +118,9 @@ class YahooService:
 
         try:
             # Step 1: Check if sync is needed based on TTL
-            existing_league = yahoo_league_repo.get_by_league_id(league_id)
+            existing_league = yahoo_league_repo.get_by_league_id(
+                league_id, columns="league_id,last_blob_sync"
+            )
             last_blob_sync = None
 
             if existing_league and existing_league.get("last_blob_sync"):
@@ -161,7 +166,8 @@ class YahooService:
                 league_name = league_settings.get("name", "Unknown League")
 
                 # Get user's team information
-                user_data = league.teams()[league.team_key()]
+                teams = league.teams()
+                user_data = teams[league.team_key()]
                 user_team_name = user_data.get("name", "Unknown Team")
                 user_team_id = user_data.get("team_id", "")
                 
@@ -187,24 +193,34 @@ class YahooService:
                     yahoo_league_repo.create(league_data)
                     db_message = "League added to database"
 
-                # Step 5: Sync to Azure using new upload method
-                azure_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-                if not azure_connection_string:
-                    logger.warning("Azure Storage not configured")
-                    return {"success": False, "error": "Azure Storage not configured", "db_message": "No database update - Azure Storage not configured"}
+                # Step 5: Sync to the configured league data store
+                try:
+                    data_store = create_league_data_store(azure_container)
+                except ValueError as e:
+                    logger.warning(f"League data store not configured: {e}")
+                    return {"success": False, "error": "League data store not configured", "db_message": "No database update - league data store not configured"}
 
-                azure_storage = AzureBlobStorage(container_name=azure_container)
                 yahoo_league = YahooLeague(league)
 
                 # Call sync - returns Dict[str, bool]
-                sync_results = yahoo_league.sync_full_league(azure_storage)
+                sync_results = yahoo_league.sync_full_league(data_store)
 
                 # Step 7: Update last_blob_sync ONLY if all critical blobs succeeded
                 yahoo_league_repo.update_by_league_id_and_yahoo_user_id(
                     league_id, yahoo_user_id, {"last_blob_sync": datetime.now(timezone.utc).isoformat()}
                 )
 
-                self.openai_file_manager.update_league_files(league_id, sync_results)
+                # Render once: the same documents feed the local search index and OpenAI
+                documents = render_league_documents(sync_results)
+                get_league_search_service().index_league(league_id, documents, data_store)
+                get_league_tool_service().index_league(league_id, sync_results, data_store)
+                # Digests of every team, so members whose own sync is skipped get one too
+                team_keys_by_manager = manager_team_keys(teams)
+                team_keys_by_manager[yahoo_user_id] = league.team_key()
+                get_league_digest_service().update_digests(
+                    league_id, sync_results, team_keys_by_manager, data_store
+                )
+                self.openai_file_manager.update_league_files(league_id, documents)
 
                 logger.info(f"League {league_id}: Sync completed successfully")
 
@@ -1,5 +1,9 @@
+import hmac
+import os
 from functools import wraps
-from flask import redirect, url_for, session
+from flask import redirect, request, url_for, session
+
+LOCAL_ADDRESSES = {"127.0.0.1", "::1"}
 
 def require_google_auth(f):
     """Decorator to require Google authentication"""
@@ -9,3 +13,22 @@ def require_google_auth(f):
             return redirect(url_for('google_login'))
         return f(*args, **kwargs)
     return decorated_function
+
+
+def require_metrics_access(f):
+    """
+    Decorator for operator-only endpoints. Requires "Authorization: Bearer <METRICS_TOKEN>";
+    without METRICS_TOKEN configured, only requests from this host are allowed.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = os.environ.get("METRICS_TOKEN")
+        if token:
+            provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            allowed = hmac.compare_digest(provided.encode("utf-8"), token.encode("utf-8"))
+        else:
+            allowed = request.remote_addr in LOCAL_ADDRESSES
+        if not allowed:
+            return {"error": "Forbidden"}, 403
+        return f(*args, **kwargs)
+    return decorated_function
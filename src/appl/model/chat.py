@@ -7,6 +7,8 @@ class ChatRequest(BaseModel):
     session_id: str
     user_message: str
     league_id: Optional[str] = None
+    # Yahoo user of the web session, used to pick the user's team digest
+    user_guid: Optional[str] = None
 
 class ChatSession(BaseModel):
     session_id: str
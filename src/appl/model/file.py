@@ -1,6 +1,8 @@
+import hashlib
+import json
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 
 class FilePurpose(Enum):
@@ -27,3 +29,44 @@ class UpdateFile:
 class OpenaiStoredFiles:
     openai_vs_id: str
     file_metadata: list[FileMetadata]
+
+
+@dataclass(frozen=True)
+class SerializedSection:
+    """
+    A league data section serialized once to compact UTF-8 JSON.
+    The same bytes and hash are shared by the blob upload and the OpenAI upload.
+    Rendered text documents use the same type with a text extension.
+    """
+
+    name: str
+    payload: bytes
+    content_sha256: str
+    extension: str = "json"
+
+    @classmethod
+    def from_data(cls, name: str, data: Any) -> "SerializedSection":
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+        return cls(
+            name=name,
+            payload=payload,
+            content_sha256=hashlib.sha256(payload).hexdigest(),
+        )
+
+    @classmethod
+    def from_text(
+        cls, name: str, text: str, extension: str = "md"
+    ) -> "SerializedSection":
+        payload = text.encode("utf-8")
+        return cls(
+            name=name,
+            payload=payload,
+            content_sha256=hashlib.sha256(payload).hexdigest(),
+            extension=extension,
+        )
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.name}.{self.extension}"
@@ -11,4 +11,14 @@ class VectorStoreMetadata(BaseModel):
 
 
 def generate_league_vector_store_id(league_id: str) -> str:
-    return f"{FilePurpose.LEAGUE.value}_{league_id}"
\ No newline at end of file
+    return f"{FilePurpose.LEAGUE.value}_{league_id}"
+
+class OpenaiFileRecord(BaseModel):
+    # Content-addressed registry entry: an uploaded OpenAI file for one section
+    # of a vector store, keyed by the section's content hash
+    # (table: repository/supaBase/schema/openai_file_registry.sql)
+    vector_store_id: str
+    file_name: str
+    content_sha256: str
+    openai_file_id: str
+    created_at: Optional[str] = None
@@ -1,23 +1,40 @@
 import os
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import time
 import random
-import hashlib
+import tempfile
+from azure.core import MatchConditions
 from azure.storage.blob import BlobServiceClient
-from azure.core.exceptions import ResourceNotFoundError, AzureError
+from azure.core.exceptions import (
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+    ResourceNotModifiedError,
+    AzureError,
+)
 import logging
 from dotenv import load_dotenv
 
+from .blob_cache import BlobCache
+from ..storage.league_data_store import LeagueDataStore
+from ...model.file import SerializedSection
+
 load_dotenv(".env")  # Loads from .env or .env.vault if DOTENV_KEY is set
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MANIFEST_BLOB_NAME = "manifest.json"
+MANIFEST_HISTORY_LIMIT = 20
+# Small blobs rewritten in place that say which data is current. They are always
+# revalidated, so another process's sync is seen on the next read.
+POINTER_BLOB_NAMES = {MANIFEST_BLOB_NAME, "digests.json", "tool_data_version.json"}
+
 
-class AzureBlobStorage:
+class AzureBlobStorage(LeagueDataStore):
     """
     Handles Azure Blob Storage operations for fantasy league data.
     Responsible for uploading and fetching data from Azure Blob Storage.
@@ -27,6 +44,10 @@ class AzureBlobStorage:
         self,
         connection_string: Optional[str] = None,
         container_name: str = "fantasy-league-data",
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        cache_fresh_seconds: Optional[float] = None,
+        enable_cache: bool = True,
     ):
         """
         Initialize Azure Blob Storage client.
@@ -35,6 +56,16 @@ class AzureBlobStorage:
             connection_string (str): Azure Storage connection string.
                                    If None, will try to get from environment variable AZURE_STORAGE_CONNECTION_STRING
             container_name (str): Name of the blob container to use
+            cache_dir (str): Local directory for the download cache.
+                             If None, uses AZURE_BLOB_CACHE_DIR or a directory under the system temp dir
+            cache_max_bytes (int): Size limit of the download cache.
+                                   If None, uses AZURE_BLOB_CACHE_MAX_MB (default 256 MB)
+            cache_fresh_seconds (float): How long a parsed blob is served from memory before
+                                         it is revalidated against Azure, so writes by other
+                                         processes may be missed for that long. Pointer blobs
+                                         (POINTER_BLOB_NAMES) are always revalidated.
+                                         If None, uses AZURE_BLOB_CACHE_FRESH_SECONDS (default 30)
+            enable_cache (bool): Whether downloads go through the local cache
         """
         self.connection_string = connection_string or os.getenv(
             "AZURE_STORAGE_CONNECTION_STRING"
@@ -52,6 +83,23 @@ class AzureBlobStorage:
             container_name
         )
 
+        self.blob_cache: Optional[BlobCache] = None
+        self.cache_fresh_seconds = (
+            cache_fresh_seconds
+            if cache_fresh_seconds is not None
+            else float(os.getenv("AZURE_BLOB_CACHE_FRESH_SECONDS", "30"))
+        )
+        if enable_cache:
+            self.blob_cache = BlobCache(
+                cache_dir
+                or os.getenv("AZURE_BLOB_CACHE_DIR")
+                or os.path.join(
+                    tempfile.gettempdir(), "fantasy-blob-cache", container_name
+                ),
+                max_bytes=cache_max_bytes
+                or int(os.getenv("AZURE_BLOB_CACHE_MAX_MB", "256")) * 1024 * 1024,
+            )
+
         # Ensure container exists
         self._ensure_container_exists()
 
@@ -86,6 +134,7 @@ class AzureBlobStorage:
 
             # Upload the data
             blob_client.upload_blob(json_data, overwrite=overwrite)
+            self._invalidate_cache(blob_name)
 
             logger.info(f"Successfully uploaded data to blob: {blob_name}")
             return True
@@ -98,20 +147,6 @@ class AzureBlobStorage:
     # Robust upload helpers
     # =====================
 
-    def _compute_sha256(self, payload: bytes) -> str:
-        """
-        Compute the SHA-256 hash of the given payload.
-
-        Args:
-            payload: Raw bytes to hash
-
-        Returns:
-            Hexadecimal string representation of the SHA-256 hash
-        """
-        sha = hashlib.sha256()
-        sha.update(payload)
-        return sha.hexdigest()
-
     def _get_blob_sha256(self, blob_name: str) -> Optional[str]:
         """
         Retrieve the stored SHA-256 hash from a blob's metadata.
@@ -139,26 +174,24 @@ class AzureBlobStorage:
 
     def upload_json_with_retries(
         self,
-        data: Dict[str, Any],
+        data: Union[Dict[str, Any], SerializedSection],
         blob_name: str,
         max_retries: int = 4,
     ) -> bool:
         """
         Upload JSON with exponential backoff retries and content-hash short-circuit.
         Stores a 'content_sha256' metadata to skip unchanged content.
+        A SerializedSection is uploaded from its existing bytes and hash.
 
         Returns:
             bool: True if upload succeeded or was skipped (content unchanged), False if failed
         """
         try:
-            payload = json.dumps(
-                data, separators=(",", ":"), ensure_ascii=False
-            ).encode("utf-8")
+            payload, desired_sha = self._serialize(data)
         except Exception as e:
             logger.error(f"Failed to serialize JSON for '{blob_name}': {e}")
             return False
 
-        desired_sha = self._compute_sha256(payload)
         existing_sha = self._get_blob_sha256(blob_name)
 
         # Skip upload if content hasn't changed
@@ -177,6 +210,7 @@ class AzureBlobStorage:
                 blob_client.upload_blob(
                     payload, overwrite=True, metadata={"content_sha256": desired_sha}
                 )
+                self._invalidate_cache(blob_name)
                 logger.info(f"Uploaded '{blob_name}' (attempt {attempts})")
                 return True
             except AzureError as e:
@@ -218,6 +252,7 @@ class AzureBlobStorage:
 
             with open(file_path, "rb") as data:
                 blob_client.upload_blob(data, overwrite=overwrite)
+            self._invalidate_cache(blob_name)
 
             logger.info(
                 f"Successfully uploaded file '{file_path}' to blob: {blob_name}"
@@ -230,16 +265,95 @@ class AzureBlobStorage:
             )
             return False
 
+    def _invalidate_cache(self, blob_name: str):
+        """Drop any cached copy of a blob after it was written or deleted."""
+        if self.blob_cache is not None:
+            self.blob_cache.invalidate(blob_name)
+
     def download_json_data(self, blob_name: str) -> Optional[Dict[str, Any]]:
         """
         Download JSON data from Azure Blob Storage.
 
+        Reads go through the local cache when enabled: a recently validated parsed
+        object is returned without any request, otherwise the cached copy is
+        revalidated with a conditional request and reused on 304 Not Modified.
+        Returned objects may be shared with other callers and must not be mutated.
+
         Args:
             blob_name (str): Name of the blob in the container
 
         Returns:
             Optional[Dict[str, Any]]: Downloaded data as dictionary, None if failed
         """
+        if self.blob_cache is None:
+            return self._download_json_uncached(blob_name)
+
+        cache = self.blob_cache
+        data = cache.get_parsed(blob_name, max_age_seconds=self._fresh_seconds(blob_name))
+        if data is not None:
+            logger.debug(f"Serving '{blob_name}' from memory cache")
+            return data
+
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            cached_etag = cache.get_etag(blob_name)
+
+            if cached_etag is not None:
+                try:
+                    blob_data = blob_client.download_blob(
+                        etag=cached_etag, match_condition=MatchConditions.IfModified
+                    )
+                except ResourceNotModifiedError:
+                    data = self._load_cached_json(blob_name, cached_etag)
+                    if data is not None:
+                        logger.info(f"Blob '{blob_name}' not modified, served from cache")
+                        return data
+                    # Cached bytes were lost; fall through to a full download
+                    blob_data = blob_client.download_blob()
+            else:
+                blob_data = blob_client.download_blob()
+
+            payload = blob_data.readall()
+            etag = blob_data.properties.etag
+            data = json.loads(payload.decode("utf-8"))
+
+            cache.put_bytes(blob_name, etag, payload)
+            cache.put_parsed(blob_name, etag, data)
+
+            logger.info(f"Successfully downloaded data from blob: {blob_name}")
+            return data
+
+        except ResourceNotFoundError:
+            logger.warning(f"Blob not found: {blob_name}")
+            self._invalidate_cache(blob_name)
+            return None
+        except Exception as e:
+            logger.error(f"Error downloading data from blob '{blob_name}': {str(e)}")
+            return None
+
+    def _fresh_seconds(self, blob_name: str) -> float:
+        """How long a parsed copy of the blob may be served without asking Azure."""
+        if blob_name.rsplit("/", 1)[-1] in POINTER_BLOB_NAMES:
+            return 0.0
+        return self.cache_fresh_seconds
+
+    def _load_cached_json(self, blob_name: str, etag: str) -> Optional[Any]:
+        """Return the cached object for a blob confirmed unchanged, parsing cached bytes if needed."""
+        cache = self.blob_cache
+        data = cache.get_parsed(blob_name, etag=etag)
+        if data is not None:
+            cache.mark_validated(blob_name)
+            return data
+
+        payload = cache.get_bytes(blob_name, etag)
+        if payload is None:
+            return None
+
+        data = json.loads(payload.decode("utf-8"))
+        cache.put_parsed(blob_name, etag, data)
+        return data
+
+    def _download_json_uncached(self, blob_name: str) -> Optional[Dict[str, Any]]:
         try:
             blob_client = self.container_client.get_blob_client(blob_name)
 
@@ -330,6 +444,7 @@ class AzureBlobStorage:
         try:
             blob_client = self.container_client.get_blob_client(blob_name)
             blob_client.delete_blob()
+            self._invalidate_cache(blob_name)
 
             logger.info(f"Successfully deleted blob: {blob_name}")
             return True
@@ -387,6 +502,7 @@ class AzureBlobStorage:
     ) -> bool:
         """
         Upload league data with organized naming convention.
+        The league manifest is updated to point at the new version.
 
         Args:
             league_id (str): League identifier
@@ -401,7 +517,14 @@ class AzureBlobStorage:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         blob_name = f"{league_id}/{data_type}/{timestamp}.json"
-        return self.upload_json_data(data, blob_name)
+        if not self.upload_json_data(data, blob_name):
+            return False
+
+        if not self._record_league_version(league_id, data_type, blob_name):
+            logger.warning(
+                f"Uploaded '{blob_name}' but could not update manifest for league '{league_id}'"
+            )
+        return True
 
     def download_latest_league_data(
         self, league_id: str, data_type: str
@@ -409,6 +532,10 @@ class AzureBlobStorage:
         """
         Download the latest version of league data.
 
+        The latest version is resolved with a single read of the league manifest.
+        Leagues uploaded before manifests existed fall back to listing the prefix,
+        and the manifest is backfilled so the next lookup is a point read.
+
         Args:
             league_id (str): League identifier
             data_type (str): Type of data to download
@@ -416,6 +543,11 @@ class AzureBlobStorage:
         Returns:
             Optional[Dict[str, Any]]: Latest data, None if not found
         """
+        manifest = self.download_json_data(self._manifest_blob_name(league_id)) or {}
+        entry = manifest.get("data_types", {}).get(data_type)
+        if entry and entry.get("latest"):
+            return self.download_json_data(entry["latest"])
+
         # List all blobs for this league and data type
         prefix = f"{league_id}/{data_type}/"
         blobs = self.list_blobs(name_starts_with=prefix)
@@ -428,4 +560,170 @@ class AzureBlobStorage:
 
         # Get the most recent blob (highest timestamp)
         latest_blob = sorted(blobs)[-1]
+        self._record_league_version(league_id, data_type, latest_blob)
         return self.download_json_data(latest_blob)
+
+    # =====================
+    # League manifest
+    # =====================
+
+    def _manifest_blob_name(self, league_id: str) -> str:
+        return f"{league_id}/{MANIFEST_BLOB_NAME}"
+
+    def _read_manifest_for_update(
+        self, league_id: str
+    ) -> tuple[Dict[str, Any], Optional[str]]:
+        """
+        Read the league manifest together with its ETag, bypassing the cache.
+
+        Returns:
+            Tuple of (manifest, etag). The etag is None if the manifest doesn't exist yet.
+        """
+        blob_client = self.container_client.get_blob_client(
+            self._manifest_blob_name(league_id)
+        )
+        try:
+            blob_data = blob_client.download_blob()
+            manifest = json.loads(blob_data.readall().decode("utf-8"))
+            return manifest, blob_data.properties.etag
+        except ResourceNotFoundError:
+            return {"league_id": league_id, "data_types": {}}, None
+
+    def _write_manifest(
+        self, league_id: str, manifest: Dict[str, Any], etag: Optional[str]
+    ):
+        """
+        Write the league manifest, failing if it changed since it was read.
+
+        Raises:
+            ResourceModifiedError: Another writer updated the manifest first
+            ResourceExistsError: Another writer created the manifest first
+        """
+        blob_name = self._manifest_blob_name(league_id)
+        blob_client = self.container_client.get_blob_client(blob_name)
+        payload = json.dumps(manifest, indent=2, ensure_ascii=False)
+
+        if etag is None:
+            blob_client.upload_blob(payload, overwrite=False)
+        else:
+            blob_client.upload_blob(
+                payload,
+                overwrite=True,
+                etag=etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+        self._invalidate_cache(blob_name)
+
+    def _update_manifest(self, league_id: str, mutate, max_retries: int = 5) -> bool:
+        """
+        Apply ``mutate(manifest)`` to the league manifest with optimistic concurrency.
+        The read-modify-write is retried when another writer got in first.
+
+        Returns:
+            bool: True if the manifest was written, False otherwise
+        """
+        for attempt in range(1, max_retries + 1):
+            try:
+                manifest, etag = self._read_manifest_for_update(league_id)
+                mutate(manifest)
+                manifest["updated_at"] = datetime.now().isoformat()
+                self._write_manifest(league_id, manifest, etag)
+                return True
+            except (ResourceModifiedError, ResourceExistsError):
+                logger.info(
+                    f"Manifest for league '{league_id}' changed concurrently, retrying (attempt {attempt})"
+                )
+                time.sleep(random.uniform(0, 0.2))
+            except Exception as e:
+                logger.error(f"Error updating manifest for league '{league_id}': {e}")
+                return False
+
+        logger.error(f"Exhausted retries updating manifest for league '{league_id}'")
+        return False
+
+    def _record_league_version(
+        self, league_id: str, data_type: str, blob_name: str
+    ) -> bool:
+        """Make blob_name the latest version of data_type and push it onto the bounded history."""
+
+        def mutate(manifest: Dict[str, Any]):
+            entry = manifest.setdefault("data_types", {}).setdefault(
+                data_type, {"latest": None, "history": []}
+            )
+            history = [name for name in entry.get("history", []) if name != blob_name]
+            history.insert(0, blob_name)
+            history.sort(reverse=True)
+            entry["history"] = history[:MANIFEST_HISTORY_LIMIT]
+            entry["latest"] = entry["history"][0]
+
+        return self._update_manifest(league_id, mutate)
+
+    def get_league_manifest(self, league_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the manifest of a league.
+
+        Returns:
+            Optional[Dict[str, Any]]: Manifest with the latest version and history per data type,
+                                      None if the league has no manifest
+        """
+        return self.download_json_data(self._manifest_blob_name(league_id))
+
+    def compact_league_data(
+        self, league_id: str, keep_versions: int = 5, dry_run: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Retention job for versioned league data.
+        Keeps the newest ``keep_versions`` versions of each data type in the manifest
+        and deletes every other version blob under the data type prefix.
+
+        Args:
+            league_id (str): League identifier
+            keep_versions (int): Number of versions to keep per data type (at least 1)
+            dry_run (bool): Only report what would be deleted
+
+        Returns:
+            Dict[str, List[str]]: Deleted (or, in dry-run mode, deletable) blob names per data type
+        """
+        keep_versions = max(1, keep_versions)
+        manifest = self.get_league_manifest(league_id)
+        if not manifest:
+            logger.warning(f"No manifest found for league '{league_id}', nothing to compact")
+            return {}
+
+        report = {}
+        for data_type, entry in manifest.get("data_types", {}).items():
+            latest = entry.get("latest")
+            if not latest:
+                continue
+            kept = set(entry.get("history", [])[:keep_versions])
+            kept.add(latest)
+
+            # Only versions older than the latest are eligible, so a version uploaded
+            # while the job runs is never deleted before it reaches the manifest
+            prefix = f"{league_id}/{data_type}/"
+            stale = [
+                name
+                for name in self.list_blobs(name_starts_with=prefix)
+                if name not in kept and name < latest
+            ]
+            report[data_type] = stale
+
+            if dry_run:
+                continue
+            for blob_name in stale:
+                self.delete_blob(blob_name)
+
+        if not dry_run:
+
+            def mutate(current: Dict[str, Any]):
+                for entry in current.get("data_types", {}).values():
+                    entry["history"] = entry.get("history", [])[:keep_versions]
+
+            self._update_manifest(league_id, mutate)
+
+        deleted = sum(len(names) for names in report.values())
+        logger.info(
+            f"Compacted league '{league_id}': "
+            f"{'would delete' if dry_run else 'deleted'} {deleted} old versions"
+        )
+        return report
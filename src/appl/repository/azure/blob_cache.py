@@ -0,0 +1,287 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BlobCache:
+    """
+    Read-through cache for blob downloads.
+
+    Raw blob bytes are kept in a local directory keyed by blob name and ETag,
+    evicted least-recently-used once the total size exceeds ``max_bytes``.
+    The directory may be shared by several processes, so each data file starts
+    with the ETag of its content and reads check it: a copy replaced by another
+    process is never served under the ETag this process last saw.
+    Parsed JSON objects are kept in a small in-memory LRU on top of that, so hot
+    blobs skip both the download and the JSON parsing.
+
+    Objects returned from the parsed cache are shared between callers and must
+    be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_parsed_entries: int = 64,
+    ):
+        """
+        Args:
+            cache_dir: Directory where cached blob bytes are stored
+            max_bytes: Maximum total size of cached blob bytes on disk
+            max_parsed_entries: Maximum number of parsed objects kept in memory
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_parsed_entries = max_parsed_entries
+
+        # blob_name -> (etag, size), ordered from least to most recently used
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._total_bytes = 0
+        # blob_name -> (etag, parsed object, last validated), ordered from least to most recently used
+        self._parsed: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    # =====================
+    # Disk layout
+    # =====================
+
+    def _key(self, blob_name: str) -> str:
+        return hashlib.sha256(blob_name.encode("utf-8")).hexdigest()
+
+    def _data_path(self, blob_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._key(blob_name)}.blob")
+
+    def _meta_path(self, blob_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._key(blob_name)}.meta")
+
+    def _load_index(self):
+        """Rebuild the LRU index from entries left on disk by a previous process."""
+        found = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(".meta"):
+                continue
+            meta_path = os.path.join(self.cache_dir, file_name)
+            data_path = meta_path[: -len(".meta")] + ".blob"
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                stat = os.stat(data_path)
+                found.append((stat.st_mtime, meta["blob_name"], meta["etag"], stat.st_size))
+            except (OSError, ValueError, KeyError):
+                self._remove_files(meta_path, data_path)
+
+        for _, blob_name, etag, size in sorted(found):
+            self._entries[blob_name] = (etag, size)
+            self._total_bytes += size
+
+        self._evict()
+        if self._entries:
+            logger.info(
+                f"Loaded {len(self._entries)} cached blobs ({self._total_bytes} bytes) from '{self.cache_dir}'"
+            )
+
+    def _write_atomic(self, path: str, *parts: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for part in parts:
+                    f.write(part)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove_files(tmp_path)
+            raise
+
+    def _remove_files(self, *paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove cache file '{path}': {e}")
+
+    def _drop(self, blob_name: str):
+        """Remove a blob from the disk index and delete its files. Caller holds the lock."""
+        entry = self._entries.pop(blob_name, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+        self._remove_files(self._data_path(blob_name), self._meta_path(blob_name))
+
+    def _forget(self, blob_name: str):
+        """Remove a blob from this process's indexes, leaving the shared files alone."""
+        with self._lock:
+            entry = self._entries.pop(blob_name, None)
+            if entry is not None:
+                self._total_bytes -= entry[1]
+            self._parsed.pop(blob_name, None)
+
+    def _evict(self):
+        """Evict least recently used blobs until the cache fits in max_bytes. Caller holds the lock."""
+        while self._entries and self._total_bytes > self.max_bytes:
+            blob_name = next(iter(self._entries))
+            self._drop(blob_name)
+            self._parsed.pop(blob_name, None)
+            logger.debug(f"Evicted cached blob '{blob_name}'")
+
+    # =====================
+    # Raw bytes
+    # =====================
+
+    def get_etag(self, blob_name: str) -> Optional[str]:
+        """
+        Get the ETag of the cached copy of a blob.
+
+        Returns:
+            The cached ETag, None if the blob is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(blob_name)
+            return entry[0] if entry else None
+
+    def get_bytes(self, blob_name: str, etag: str) -> Optional[bytes]:
+        """
+        Read the cached bytes of a blob if the cached copy matches the given ETag.
+
+        Args:
+            blob_name: Name of the blob
+            etag: ETag the cached copy must match
+
+        Returns:
+            Cached bytes, None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(blob_name)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(blob_name)
+
+        try:
+            data_path = self._data_path(blob_name)
+            with open(data_path, "rb") as f:
+                cached_etag = f.readline()[:-1].decode("utf-8", errors="replace")
+                payload = f.read() if cached_etag == etag else None
+            if payload is None:
+                # Another process replaced the file with a different version
+                self._forget(blob_name)
+                return None
+            # Keep mtime in step with recency so the LRU order survives a restart
+            os.utime(data_path)
+            return payload
+        except OSError as e:
+            logger.warning(f"Cached copy of '{blob_name}' is unreadable: {e}")
+            self.invalidate(blob_name)
+            return None
+
+    def put_bytes(self, blob_name: str, etag: str, payload: bytes):
+        """
+        Store the bytes of a blob under its ETag, replacing any older copy.
+
+        Args:
+            blob_name: Name of the blob
+            etag: ETag of the downloaded content
+            payload: Raw blob content
+        """
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            try:
+                self._write_atomic(
+                    self._data_path(blob_name), etag.encode("utf-8") + b"\n", payload
+                )
+                self._write_atomic(
+                    self._meta_path(blob_name),
+                    json.dumps({"blob_name": blob_name, "etag": etag}).encode("utf-8"),
+                )
+            except OSError as e:
+                logger.warning(f"Could not cache blob '{blob_name}': {e}")
+                self._drop(blob_name)
+                return
+
+            previous = self._entries.pop(blob_name, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[blob_name] = (etag, len(payload))
+            self._total_bytes += len(payload)
+
+            parsed = self._parsed.get(blob_name)
+            if parsed is not None and parsed[0] != etag:
+                del self._parsed[blob_name]
+
+            self._evict()
+
+    # =====================
+    # Parsed objects
+    # =====================
+
+    def get_parsed(
+        self,
+        blob_name: str,
+        etag: Optional[str] = None,
+        max_age_seconds: Optional[float] = None,
+    ) -> Optional[Any]:
+        """
+        Get the parsed object for a blob from the in-memory LRU.
+
+        Args:
+            blob_name: Name of the blob
+            etag: If given, the cached object must have been parsed from this ETag
+            max_age_seconds: If given, the object must have been validated against
+                             the server within this many seconds
+
+        Returns:
+            The parsed object, None on a miss
+        """
+        with self._lock:
+            entry = self._parsed.get(blob_name)
+            if entry is None or (etag is not None and entry[0] != etag):
+                return None
+            if (
+                max_age_seconds is not None
+                and time.monotonic() - entry[2] > max_age_seconds
+            ):
+                return None
+            self._parsed.move_to_end(blob_name)
+            return entry[1]
+
+    def put_parsed(self, blob_name: str, etag: str, data: Any):
+        """Keep a parsed object in the in-memory LRU, marked as just validated."""
+        with self._lock:
+            self._parsed[blob_name] = (etag, data, time.monotonic())
+            self._parsed.move_to_end(blob_name)
+            while len(self._parsed) > self.max_parsed_entries:
+                self._parsed.popitem(last=False)
+
+    def mark_validated(self, blob_name: str):
+        """Record that the cached copy of a blob was just confirmed current by the server."""
+        with self._lock:
+            entry = self._parsed.get(blob_name)
+            if entry is not None:
+                self._parsed[blob_name] = (entry[0], entry[1], time.monotonic())
+
+    def invalidate(self, blob_name: str):
+        """Forget everything cached for a blob (e.g. after it was overwritten or deleted)."""
+        with self._lock:
+            self._parsed.pop(blob_name, None)
+            self._drop(blob_name)
+
+    def stats(self) -> Dict[str, int]:
+        """Current cache occupancy."""
+        with self._lock:
+            return {
+                "cached_blobs": len(self._entries),
+                "cached_bytes": self._total_bytes,
+                "parsed_entries": len(self._parsed),
+            }
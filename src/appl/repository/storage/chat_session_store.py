@@ -0,0 +1,126 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ...model.chat import ChatSession
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SESSION_STORE = "sqlite"
+MEMORY_SESSION_STORE = "memory"
+
+
+class ChatSessionStore(ABC):
+    """
+    Shared store of chat sessions, so a follow-up message served by another
+    worker continues the same OpenAI conversation.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str, max_idle_seconds: float) -> Optional[ChatSession]:
+        """Get a session used within the last max_idle_seconds"""
+        pass
+
+    @abstractmethod
+    def save(self, chat_session: ChatSession):
+        """Insert or replace a session and mark it as used now"""
+        pass
+
+    @abstractmethod
+    def delete_idle(self, max_idle_seconds: float) -> int:
+        """Delete sessions idle for longer than max_idle_seconds; returns how many"""
+        pass
+
+
+class SqliteChatSessionStore(ChatSessionStore):
+    """
+    Chat sessions in a SQLite file. Workers on the same host share it; WAL mode
+    lets readers run while another worker writes.
+    """
+
+    def __init__(self, path: str, timeout_seconds: float = 5.0):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(
+            path, timeout=timeout_seconds, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS chat_sessions ("
+                "session_id TEXT PRIMARY KEY, "
+                "previous_openai_response_id TEXT, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS chat_sessions_updated_at "
+                "ON chat_sessions (updated_at)"
+            )
+
+    def get(self, session_id: str, max_idle_seconds: float) -> Optional[ChatSession]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT previous_openai_response_id FROM chat_sessions "
+                "WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - max_idle_seconds),
+            ).fetchone()
+        if row is None:
+            return None
+        return ChatSession(session_id=session_id, previous_openai_response_id=row[0])
+
+    def save(self, chat_session: ChatSession):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO chat_sessions (session_id, previous_openai_response_id, updated_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET "
+                "previous_openai_response_id = excluded.previous_openai_response_id, "
+                "updated_at = excluded.updated_at",
+                (
+                    chat_session.session_id,
+                    chat_session.previous_openai_response_id,
+                    time.time(),
+                ),
+            )
+
+    def delete_idle(self, max_idle_seconds: float) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM chat_sessions WHERE updated_at < ?",
+                (time.time() - max_idle_seconds,),
+            )
+        return cursor.rowcount
+
+
+def create_chat_session_store() -> Optional[ChatSessionStore]:
+    """
+    Get the chat session store selected by the CHAT_SESSION_STORE environment variable.
+
+    Backends:
+        sqlite (default) - SqliteChatSessionStore at CHAT_SESSION_DB_PATH
+                           (default ./chat_sessions.sqlite3)
+        memory           - no shared store, sessions live only in the worker
+
+    Raises:
+        ValueError: Unknown backend
+    """
+    backend = os.getenv("CHAT_SESSION_STORE", SQLITE_SESSION_STORE).lower()
+    if backend == SQLITE_SESSION_STORE:
+        path = os.getenv("CHAT_SESSION_DB_PATH", "chat_sessions.sqlite3")
+        logger.info(f"Using SQLite chat session store at '{path}'")
+        return SqliteChatSessionStore(path)
+    if backend == MEMORY_SESSION_STORE:
+        return None
+
+    raise ValueError(
+        f"Unknown CHAT_SESSION_STORE '{backend}'. "
+        f"Allowed: {', '.join([SQLITE_SESSION_STORE, MEMORY_SESSION_STORE])}"
+    )
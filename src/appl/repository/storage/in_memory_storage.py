@@ -0,0 +1,63 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .league_data_store import LeagueDataStore
+from ...model.file import SerializedSection
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryStorage(LeagueDataStore):
+    """
+    League data store kept in process memory.
+    Useful for local runs and for measuring sync cost without any I/O.
+    Contents are lost when the process exits.
+    """
+
+    def __init__(self):
+        # blob_name -> (payload, content_sha256)
+        self._blobs: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def upload_json_with_retries(
+        self,
+        data: Union[Dict[str, Any], SerializedSection],
+        blob_name: str,
+        max_retries: int = 4,
+    ) -> bool:
+        try:
+            payload, desired_sha = self._serialize(data)
+        except Exception as e:
+            logger.error(f"Failed to serialize JSON for '{blob_name}': {e}")
+            return False
+
+        with self._lock:
+            existing = self._blobs.get(blob_name)
+            if existing is not None and existing[1] == desired_sha:
+                logger.info(f"Skipping write for '{blob_name}' (content unchanged)")
+                return True
+            self._blobs[blob_name] = (payload, desired_sha)
+        return True
+
+    def download_json_data(self, blob_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            existing = self._blobs.get(blob_name)
+        if existing is None:
+            logger.warning(f"Blob not found: {blob_name}")
+            return None
+        return json.loads(existing[0])
+
+    def list_blobs(self, name_starts_with: Optional[str] = None) -> List[str]:
+        with self._lock:
+            names = list(self._blobs)
+        return sorted(
+            name
+            for name in names
+            if name_starts_with is None or name.startswith(name_starts_with)
+        )
+
+    def delete_blob(self, blob_name: str) -> bool:
+        with self._lock:
+            return self._blobs.pop(blob_name, None) is not None
@@ -0,0 +1,86 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ...model.file import SerializedSection
+
+
+class LeagueDataStore(ABC):
+    """
+    Abstract base class that all league data stores must implement.
+    Blobs are JSON documents addressed by slash-separated names
+    (e.g. '{league_id}/standings.json').
+    """
+
+    def _compute_sha256(self, payload: bytes) -> str:
+        """
+        Compute the SHA-256 hash of the given payload.
+
+        Args:
+            payload: Raw bytes to hash
+
+        Returns:
+            Hexadecimal string representation of the SHA-256 hash
+        """
+        sha = hashlib.sha256()
+        sha.update(payload)
+        return sha.hexdigest()
+
+    def _serialize(
+        self, data: Union[Dict[str, Any], SerializedSection]
+    ) -> Tuple[bytes, str]:
+        """
+        Get the compact JSON payload and its SHA-256 hash.
+        A SerializedSection is used as is, so its bytes are never re-encoded or re-hashed.
+
+        Returns:
+            Tuple of (payload, content_sha256)
+        """
+        if isinstance(data, SerializedSection):
+            return data.payload, data.content_sha256
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+        return payload, self._compute_sha256(payload)
+
+    @abstractmethod
+    def upload_json_with_retries(
+        self,
+        data: Union[Dict[str, Any], SerializedSection],
+        blob_name: str,
+        max_retries: int = 4,
+    ) -> bool:
+        """
+        Upload JSON data, skipping the write when the stored content hash is unchanged.
+        Accepts either plain data or an already serialized section.
+
+        Returns:
+            bool: True if upload succeeded or was skipped (content unchanged), False if failed
+        """
+        pass
+
+    @abstractmethod
+    def download_json_data(self, blob_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Download and parse a JSON blob.
+
+        Returns:
+            Optional[Dict[str, Any]]: Parsed data, None if not found or failed
+        """
+        pass
+
+    @abstractmethod
+    def list_blobs(self, name_starts_with: Optional[str] = None) -> List[str]:
+        """List blob names, optionally filtered by prefix"""
+        pass
+
+    @abstractmethod
+    def delete_blob(self, blob_name: str) -> bool:
+        """
+        Delete a blob.
+
+        Returns:
+            bool: True if deletion successful, False otherwise
+        """
+        pass
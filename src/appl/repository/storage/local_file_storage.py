@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Union
+
+from .league_data_store import LeagueDataStore
+from ...model.file import SerializedSection
+
+logger = logging.getLogger(__name__)
+
+META_DIR_NAME = ".meta"
+
+
+class LocalFileStorage(LeagueDataStore):
+    """
+    League data store backed by a local directory.
+    Blob names map to relative file paths; writes use atomic rename so readers
+    never see a partially written file.
+    """
+
+    def __init__(self, root_dir: str):
+        """
+        Args:
+            root_dir (str): Directory holding the blobs (created if missing)
+        """
+        self.root_dir = os.path.abspath(root_dir)
+        self.meta_dir = os.path.join(self.root_dir, META_DIR_NAME)
+        os.makedirs(self.meta_dir, exist_ok=True)
+
+    def _path(self, blob_name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root_dir, blob_name))
+        if os.path.commonpath([path, self.root_dir]) != self.root_dir:
+            raise ValueError(f"Blob name escapes the storage directory: {blob_name}")
+        return path
+
+    def _sha_path(self, blob_name: str) -> str:
+        return os.path.join(self.meta_dir, f"{blob_name}.sha256")
+
+    def _write_atomic(self, path: str, payload: bytes):
+        """Write to a temp file in the target directory, then rename it into place."""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read_sha256(self, blob_name: str) -> Optional[str]:
+        try:
+            with open(self._sha_path(blob_name), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def upload_json_with_retries(
+        self,
+        data: Union[Dict[str, Any], SerializedSection],
+        blob_name: str,
+        max_retries: int = 4,
+    ) -> bool:
+        """
+        Write JSON to disk with a content-hash short-circuit.
+        Local writes don't fail transiently, so max_retries is accepted for interface parity only.
+
+        Returns:
+            bool: True if write succeeded or was skipped (content unchanged), False if failed
+        """
+        try:
+            payload, desired_sha = self._serialize(data)
+        except Exception as e:
+            logger.error(f"Failed to serialize JSON for '{blob_name}': {e}")
+            return False
+
+        path = self._path(blob_name)
+        if os.path.exists(path) and self._read_sha256(blob_name) == desired_sha:
+            logger.info(f"Skipping write for '{blob_name}' (content unchanged)")
+            return True
+
+        try:
+            self._write_atomic(path, payload)
+            self._write_atomic(self._sha_path(blob_name), desired_sha.encode("utf-8"))
+            logger.info(f"Wrote '{blob_name}' to local storage")
+            return True
+        except OSError as e:
+            logger.error(f"Error writing '{blob_name}' to local storage: {e}")
+            return False
+
+    def download_json_data(self, blob_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(blob_name), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    logger.warning(f"Blob is empty: {blob_name}")
+                    return None
+                # json needs the whole document in memory anyway, so read it directly
+                return json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Blob not found: {blob_name}")
+            return None
+        except Exception as e:
+            logger.error(f"Error reading blob '{blob_name}': {str(e)}")
+            return None
+
+    def list_blobs(self, name_starts_with: Optional[str] = None) -> List[str]:
+        blob_names = []
+        for directory, dir_names, file_names in os.walk(self.root_dir):
+            if directory == self.root_dir and META_DIR_NAME in dir_names:
+                dir_names.remove(META_DIR_NAME)
+            for file_name in file_names:
+                if file_name.endswith(".tmp"):
+                    continue
+                relative = os.path.relpath(
+                    os.path.join(directory, file_name), self.root_dir
+                ).replace(os.sep, "/")
+                if name_starts_with is None or relative.startswith(name_starts_with):
+                    blob_names.append(relative)
+        return sorted(blob_names)
+
+    def delete_blob(self, blob_name: str) -> bool:
+        try:
+            os.remove(self._path(blob_name))
+        except FileNotFoundError:
+            logger.warning(f"Blob not found for deletion: {blob_name}")
+            return False
+        except OSError as e:
+            logger.error(f"Error deleting blob '{blob_name}': {str(e)}")
+            return False
+
+        try:
+            os.remove(self._sha_path(blob_name))
+        except FileNotFoundError:
+            pass
+        return True
@@ -0,0 +1,69 @@
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+
+from .league_data_store import LeagueDataStore
+
+logger = logging.getLogger(__name__)
+
+AZURE_STORE = "azure"
+LOCAL_STORE = "local"
+MEMORY_STORE = "memory"
+
+_stores: Dict[Tuple[str, str], LeagueDataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def create_league_data_store(container_name: str = "fantasy1") -> LeagueDataStore:
+    """
+    Get the league data store selected by the LEAGUE_DATA_STORE environment variable.
+
+    Backends:
+        azure  (default) - AzureBlobStorage, requires AZURE_STORAGE_CONNECTION_STRING
+        local            - LocalFileStorage under LEAGUE_DATA_DIR (default ./league_data)
+        memory           - InMemoryStorage, process-local
+
+    Stores are created once per backend and container and then reused, so
+    caches and connections survive across syncs.
+
+    Args:
+        container_name: Azure container name, or sub-directory/namespace for the other backends
+
+    Raises:
+        ValueError: Unknown backend, or the selected backend is not configured
+    """
+    backend = os.getenv("LEAGUE_DATA_STORE", AZURE_STORE).lower()
+    key = (backend, container_name)
+
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _build_store(backend, container_name)
+            _stores[key] = store
+            logger.info(
+                f"Initialized {type(store).__name__} for container '{container_name}'"
+            )
+        return store
+
+
+def _build_store(backend: str, container_name: str) -> LeagueDataStore:
+    if backend == AZURE_STORE:
+        # Imported lazily so the other backends work without the Azure SDK configured
+        from ..azure.azure_blob_storage import AzureBlobStorage
+
+        return AzureBlobStorage(container_name=container_name)
+    if backend == LOCAL_STORE:
+        from .local_file_storage import LocalFileStorage
+
+        root_dir = os.getenv("LEAGUE_DATA_DIR", "league_data")
+        return LocalFileStorage(os.path.join(root_dir, container_name))
+    if backend == MEMORY_STORE:
+        from .in_memory_storage import InMemoryStorage
+
+        return InMemoryStorage()
+
+    raise ValueError(
+        f"Unknown LEAGUE_DATA_STORE '{backend}'. "
+        f"Allowed: {', '.join([AZURE_STORE, LOCAL_STORE, MEMORY_STORE])}"
+    )
@@ -1,15 +1,59 @@
 
 # Enhanced base_repository.py with better error handling
+import json
 from abc import ABC
-from typing import List, Dict, Any, Optional
+from typing import Callable, Hashable, Iterable, Iterator, List, Dict, Any, Optional
 from .connection import DatabaseManager
+from .repository_cache import CACHE_MISS, get_table_cache
 from ..exceptions.custom_exceptions import DatabaseError
 
+# Limits of one bulk request; larger writes are split into several requests
+MAX_BATCH_ROWS = 500
+MAX_BATCH_BYTES = 256 * 1024
+
+
+def chunk_rows(rows: List[Dict[str, Any]], max_rows: int = MAX_BATCH_ROWS, max_bytes: int = MAX_BATCH_BYTES) -> Iterator[List[Dict[str, Any]]]:
+    """Split rows into chunks of at most max_rows rows and about max_bytes of JSON"""
+    chunk, chunk_bytes = [], 2
+    for row in rows:
+        # +1 for the separating comma
+        row_bytes = len(json.dumps(row, default=str).encode("utf-8")) + 1
+        if chunk and (len(chunk) >= max_rows or chunk_bytes + row_bytes > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 2
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+
 class BaseRepository(ABC):
     
-    def __init__(self, table_name: str):
+    def __init__(self, table_name: str, cache_ttl_seconds: Optional[float] = None):
         self.db = DatabaseManager().get_client()
         self.table_name = table_name
+        # Read-through cache of get_by_field/get_by_two_fields, shared by all
+        # repositories of the table; None disables it
+        self.cache = (
+            get_table_cache(table_name, cache_ttl_seconds) if cache_ttl_seconds else None
+        )
+    
+    def _cached_read(self, key: Hashable, query: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Serve a single-row read from the cache, or run it and cache the result"""
+        if self.cache is None:
+            return query()
+        row = self.cache.get(key)
+        if row is not CACHE_MISS:
+            return row
+        generation = self.cache.generation()
+        row = query()
+        self.cache.put(key, row, generation)
+        return row
+    
+    def invalidate_cache(self):
+        """Drop the cached reads of this table (called after every write)"""
+        if self.cache is not None:
+            self.cache.invalidate()
     
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record"""
@@ -20,19 +64,87 @@ class BaseRepository(ABC):
             return response.data[0] if response.data else {}
         except Exception as e:
             raise DatabaseError(f"Failed to create record in {self.table_name}: {str(e)}")
+        finally:
+            self.invalidate_cache()
     
-    def get_by_field(self, field_name: str, value: Any) -> Optional[Dict[str, Any]]:
-        """Get single record by field value"""
+    def upsert(self, data: Dict[str, Any], on_conflict: str) -> Dict[str, Any]:
+        """
+        Insert a record, or update the one that conflicts on the given unique
+        column(s) (comma-separated), in a single request. Only the columns
+        present in data are written on update.
+        """
         try:
-            response = self.db.table(self.table_name).select("*").eq(field_name, value).execute()
+            # Remove None values and empty strings, as for updates, so an update keeps
+            # the stored value and an insert gets the default
+            clean_data = {k: v for k, v in data.items() if v is not None and v != ""}
+            response = self.db.table(self.table_name).upsert(clean_data, on_conflict=on_conflict).execute()
+            return response.data[0] if response.data else {}
+        except Exception as e:
+            raise DatabaseError(f"Failed to upsert record in {self.table_name}: {str(e)}")
+        finally:
+            self.invalidate_cache()
+    
+    def create_many(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create records in as few requests as the batch limits allow"""
+        # Remove None values; columns missing from a row get the database default
+        clean_rows = [{k: v for k, v in row.items() if v is not None} for row in rows]
+        return self._write_chunks(
+            "create",
+            clean_rows,
+            lambda chunk: self.db.table(self.table_name).insert(chunk, default_to_null=False),
+        )
+    
+    def upsert_many(self, rows: Iterable[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+        """
+        upsert() for many records in as few requests as the batch limits allow.
+        Rows are sent grouped by their set of columns, since a bulk upsert writes
+        every listed column of every row.
+        """
+        clean_rows = [{k: v for k, v in row.items() if v is not None and v != ""} for row in rows]
+        return self._write_chunks(
+            "upsert",
+            clean_rows,
+            lambda chunk: self.db.table(self.table_name).upsert(chunk, on_conflict=on_conflict),
+            group_by=frozenset,
+        )
+    
+    def _write_chunks(self, action: str, rows: List[Dict[str, Any]], build: Callable[[List[Dict[str, Any]]], Any], group_by: Optional[Callable[[Dict[str, Any]], Hashable]] = None) -> List[Dict[str, Any]]:
+        """Send rows chunk by chunk, never mixing rows of different groups, and collect the written records"""
+        written: List[Dict[str, Any]] = []
+        if not rows:
+            return written
+        groups: Dict[Hashable, List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(group_by(row) if group_by else None, []).append(row)
+        try:
+            for group in groups.values():
+                for chunk in chunk_rows(group):
+                    response = build(chunk).execute()
+                    written.extend(response.data or [])
+            return written
+        except Exception as e:
+            raise DatabaseError(
+                f"Failed to {action} records in {self.table_name} "
+                f"({len(written)} of {len(rows)} written): {str(e)}"
+            )
+        finally:
+            self.invalidate_cache()
+    
+    def get_by_field(self, field_name: str, value: Any, columns: str = "*") -> Optional[Dict[str, Any]]:
+        """Get single record by field value, with only the given columns (comma-separated)"""
+        def query():
+            response = self.db.table(self.table_name).select(columns).eq(field_name, value).execute()
             return response.data[0] if response.data else None
+
+        try:
+            return self._cached_read((columns, field_name, value), query)
         except Exception as e:
             raise DatabaseError(f"Failed to get record from {self.table_name}: {str(e)}")
     
-    def get_all(self) -> List[Dict[str, Any]]:
-        """Get all records from table"""
+    def get_all(self, columns: str = "*") -> List[Dict[str, Any]]:
+        """Get all records from table, with only the given columns (comma-separated)"""
         try:
-            response = self.db.table(self.table_name).select("*").execute()
+            response = self.db.table(self.table_name).select(columns).execute()
             return response.data
         except Exception as e:
             raise DatabaseError(f"Failed to get records from {self.table_name}: {str(e)}")
@@ -49,6 +161,8 @@ class BaseRepository(ABC):
             return response.data[0] if response.data else {}
         except Exception as e:
             raise DatabaseError(f"Failed to update record in {self.table_name}: {str(e)}")
+        finally:
+            self.invalidate_cache()
     
     def update_by_two_fields(self, field1_name: str, field1_value: Any, field2_name: str, field2_value: Any, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update record by two field values"""
@@ -62,6 +176,8 @@ class BaseRepository(ABC):
             return response.data[0] if response.data else {}
         except Exception as e:
             raise DatabaseError(f"Failed to update record in {self.table_name}: {str(e)}")
+        finally:
+            self.invalidate_cache()
         
     def delete_by_field(self, field_name: str, value: Any) -> bool:
         """Delete record by field value"""
@@ -70,27 +186,42 @@ class BaseRepository(ABC):
             return len(response.data) > 0
         except Exception as e:
             raise DatabaseError(f"Failed to delete record from {self.table_name}: {str(e)}")
+        finally:
+            self.invalidate_cache()
     
-    def get_multiple_by_field(self, field_name: str, value: Any) -> List[Dict[str, Any]]:
-        """Get multiple records by field value"""
+    def get_multiple_by_field(self, field_name: str, value: Any, columns: str = "*") -> List[Dict[str, Any]]:
+        """Get multiple records by field value, with only the given columns (comma-separated)"""
         try:
-            response = self.db.table(self.table_name).select("*").eq(field_name, value).execute()
+            response = self.db.table(self.table_name).select(columns).eq(field_name, value).execute()
             return response.data
         except Exception as e:
             raise DatabaseError(f"Failed to get multiple records from {self.table_name}: {str(e)}")
     
     def exists_by_field(self, field_name: str, value: Any) -> bool:
-        """Check if record exists by field value"""
+        """Check if record exists by field value (a HEAD count, no rows are transferred)"""
         try:
-            response = self.db.table(self.table_name).select("*").eq(field_name, value).limit(1).execute()
-            return len(response.data) > 0
-        except Exception as e:
+            return self.count({field_name: value}) > 0
+        except DatabaseError as e:
             raise DatabaseError(f"Failed to check existence in {self.table_name}: {str(e)}")
     
-    def get_by_two_fields(self, field1_name: str, field1_value: Any, field2_name: str, field2_value: Any) -> Optional[Dict[str, Any]]:
-        """Get single record by two field values"""
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count the records matching all field == value filters, server-side"""
         try:
-            response = self.db.table(self.table_name).select("*").eq(field1_name, field1_value).eq(field2_name, field2_value).execute()
+            query = self.db.table(self.table_name).select("*", count="exact", head=True)
+            for field_name, value in (filters or {}).items():
+                query = query.eq(field_name, value)
+            response = query.execute()
+            return response.count or 0
+        except Exception as e:
+            raise DatabaseError(f"Failed to count records in {self.table_name}: {str(e)}")
+    
+    def get_by_two_fields(self, field1_name: str, field1_value: Any, field2_name: str, field2_value: Any, columns: str = "*") -> Optional[Dict[str, Any]]:
+        """Get single record by two field values, with only the given columns (comma-separated)"""
+        def query():
+            response = self.db.table(self.table_name).select(columns).eq(field1_name, field1_value).eq(field2_name, field2_value).execute()
             return response.data[0] if response.data else None
+
+        try:
+            return self._cached_read((columns, field1_name, field1_value, field2_name, field2_value), query)
         except Exception as e:
             raise DatabaseError(f"Failed to get record from {self.table_name}: {str(e)}")
\ No newline at end of file
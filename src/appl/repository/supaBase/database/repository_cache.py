@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Returned by RepositoryCache.get when nothing is cached for the key
+CACHE_MISS = object()
+
+
+class RepositoryCache:
+    """
+    TTL read-through cache of one table's rows, keyed by the queried fields and
+    values. Any write to the table clears it, since a row cached under one field
+    (e.g. email) may be changed through another (e.g. google_user_id).
+    """
+
+    def __init__(self, table_name: str, ttl_seconds: float, max_entries: int = 1024):
+        self.table_name = table_name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (stored_at, row or None)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Bumped by every write, so a read that raced a write isn't stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """The cached row (None for a cached miss), or CACHE_MISS."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return CACHE_MISS
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, key: Hashable, row: Optional[Dict[str, Any]], generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), _copy(row))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+def _copy(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Callers get their own dict, so mutating a result can't change the cache
+    return dict(row) if row is not None else None
+
+
+# table name -> cache shared by every repository instance of that table
+_table_caches: Dict[str, RepositoryCache] = {}
+_table_caches_lock = threading.Lock()
+
+
+def get_table_cache(table_name: str, ttl_seconds: float) -> RepositoryCache:
+    with _table_caches_lock:
+        cache = _table_caches.get(table_name)
+        if cache is None:
+            cache = RepositoryCache(table_name, ttl_seconds)
+            _table_caches[table_name] = cache
+        return cache
+
+
+def repository_cache_stats() -> Dict[str, Any]:
+    """Hit rates of the repository caches, by table"""
+    with _table_caches_lock:
+        caches = dict(_table_caches)
+    return {table_name: cache.stats() for table_name, cache in sorted(caches.items())}
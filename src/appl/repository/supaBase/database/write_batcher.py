@@ -0,0 +1,162 @@
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_repository import MAX_BATCH_ROWS, BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBatcher:
+    """
+    Write-behind buffer of one table: rows submitted within window_seconds of
+    each other are sent together by a background thread, with create_many (or
+    upsert_many when on_conflict is given) instead of one request per row.
+    Pending rows are also sent when the buffer reaches max_rows, on flush(), and
+    at exit while the writer thread is running.
+    """
+
+    def __init__(
+        self,
+        repository: BaseRepository,
+        on_conflict: Optional[str] = None,
+        window_seconds: float = 0.05,
+        max_rows: int = MAX_BATCH_ROWS,
+    ):
+        self.repository = repository
+        self.on_conflict = on_conflict
+        self.window_seconds = window_seconds
+        self.max_rows = max_rows
+        self._condition = threading.Condition()
+        # (row, future) in submission order, and when the oldest was submitted
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+        self._oldest = 0.0
+        # Futures of the batch the writer thread is sending
+        self._in_flight: List[Future] = []
+        self._flush_requested = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.rows = 0
+        self.failed_rows = 0
+
+    def submit(self, row: Dict[str, Any]) -> Future:
+        """
+        Queue a row for the next batch.
+
+        Returns:
+            A future resolved once the batch is written; it holds the DatabaseError if it failed
+
+        Raises:
+            RuntimeError: The batcher is closed
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"Write batcher of {self.repository.table_name} is closed")
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((row, future))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"write-batcher-{self.repository.table_name}",
+                    daemon=True,
+                )
+                self._thread.start()
+                # The writer is a daemon thread, so pending rows are sent at exit
+                atexit.register(self.close)
+            self._condition.notify_all()
+        return future
+
+    def flush(self, timeout: Optional[float] = None):
+        """Send the pending rows now and wait until they are written."""
+        with self._condition:
+            futures = self._in_flight + [future for _, future in self._pending]
+            if not futures:
+                return
+            if self._pending:
+                self._flush_requested = True
+                self._condition.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            # Failures were already logged by the writer thread
+            future.exception(remaining)
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush the pending rows and stop the writer thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            atexit.unregister(self.close)
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._pending and (
+                        self._closed
+                        or self._flush_requested
+                        or len(self._pending) >= self.max_rows
+                    ):
+                        break
+                    if self._pending:
+                        remaining = self._oldest + self.window_seconds - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    elif self._closed:
+                        return
+                    else:
+                        self._condition.wait()
+                batch = self._pending[: self.max_rows]
+                self._pending = self._pending[self.max_rows :]
+                self._oldest = time.monotonic()
+                if not self._pending:
+                    self._flush_requested = False
+                self._in_flight = [future for _, future in batch]
+            self._write(batch)
+            with self._condition:
+                self._in_flight = []
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], Future]]):
+        rows = [row for row, _ in batch]
+        try:
+            if self.on_conflict:
+                self.repository.upsert_many(rows, on_conflict=self.on_conflict)
+            else:
+                self.repository.create_many(rows)
+        except Exception as e:
+            logger.error(
+                f"Write-behind batch of {len(rows)} rows to {self.repository.table_name} failed: {e}"
+            )
+            with self._condition:
+                self.failed_rows += len(rows)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._condition:
+            self.batches += 1
+            self.rows += len(rows)
+        for _, future in batch:
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "batches": self.batches,
+                "rows": self.rows,
+                "failed_rows": self.failed_rows,
+                "rows_per_batch": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            }
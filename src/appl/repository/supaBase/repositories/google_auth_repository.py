@@ -4,7 +4,7 @@ from ..database.base_repository import BaseRepository
 
 class GoogleAuthRepository(BaseRepository):
     def __init__(self):
-        super().__init__("google_auth")
+        super().__init__("google_auth", cache_ttl_seconds=60)
     
     def get_by_google_user_id(self, google_user_id: str) -> Optional[Dict[str, Any]]:
         return self.get_by_field("google_user_id", google_user_id)
@@ -12,6 +12,9 @@ class GoogleAuthRepository(BaseRepository):
     def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         return self.get_by_field("email", email.lower())
     
+    def upsert_by_google_user_id(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.upsert(data, on_conflict="google_user_id")
+    
     def update_by_google_user_id(self, google_user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         return self.update_by_field("google_user_id", google_user_id, data)
     
@@ -27,6 +27,21 @@ class GoogleFantasyRepository(BaseRepository):
         except Exception as e:
             raise DatabaseError(f"Failed to get record: {str(e)}")
     
+    def exists_by_google_and_platform(self, google_user_id: str, platform: str) -> bool:
+        """Check if a Google user has a connection to a platform (count only, no rows)"""
+        return self.count({"google_user_id": google_user_id, "fantasy_platform": platform}) > 0
+    
+    def count_by_platform(self, platform: str) -> int:
+        """Count connections to a platform, whatever case the platform was stored in"""
+        try:
+            response = (self.db.table(self.table_name)
+                       .select("*", count="exact", head=True)
+                       .ilike("fantasy_platform", platform)
+                       .execute())
+            return response.count or 0
+        except Exception as e:
+            raise DatabaseError(f"Failed to count records: {str(e)}")
+    
     def delete_by_google_and_platform(self, google_user_id: str, platform: str) -> bool:
         """Delete connection by Google user ID and platform"""
         try:
@@ -38,6 +53,8 @@ class GoogleFantasyRepository(BaseRepository):
             return len(response.data) > 0
         except Exception as e:
             raise DatabaseError(f"Failed to delete record: {str(e)}")
+        finally:
+            self.invalidate_cache()
     
     def get_by_composite_key(self, google_user_id: str, fantasy_user_id: str, fantasy_platform: str) -> Optional[Dict[str, Any]]:
         """Get connection by all three key fields (composite primary key)"""
@@ -52,6 +69,14 @@ class GoogleFantasyRepository(BaseRepository):
         except Exception as e:
             raise DatabaseError(f"Failed to get record: {str(e)}")
     
+    def exists_by_composite_key(self, google_user_id: str, fantasy_user_id: str, fantasy_platform: str) -> bool:
+        """Check if a connection exists by composite primary key (count only, no rows)"""
+        return self.count({
+            "google_user_id": google_user_id,
+            "fantasy_user_id": fantasy_user_id,
+            "fantasy_platform": fantasy_platform,
+        }) > 0
+    
     def delete_by_composite_key(self, google_user_id: str, fantasy_user_id: str, fantasy_platform: str) -> bool:
         """Delete connection by composite primary key"""
         try:
@@ -64,6 +89,8 @@ class GoogleFantasyRepository(BaseRepository):
             return len(response.data) > 0
         except Exception as e:
             raise DatabaseError(f"Failed to delete record: {str(e)}")
+        finally:
+            self.invalidate_cache()
     
     def get_google_users_by_yahoo_user(self, yahoo_user_id: str) -> List[Dict[str, Any]]:
         """Get all Google users connected to a specific Yahoo user"""
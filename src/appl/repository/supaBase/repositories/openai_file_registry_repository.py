@@ -0,0 +1,32 @@
+# openai_file_registry_repository.py
+from typing import Optional
+from ....model.vector_store import OpenaiFileRecord
+from ..database.base_repository import BaseRepository, DatabaseError
+
+# Unique key of a registration (schema: ../schema/openai_file_registry.sql)
+REGISTRY_KEY_COLUMNS = "vector_store_id,file_name,content_sha256"
+
+
+class OpenaiFileRegistryRepository(BaseRepository):
+    def __init__(self):
+        super().__init__("openai_file_registry")
+
+    def get_by_content_hash(
+        self, vector_store_id: str, file_name: str, content_sha256: str
+    ) -> Optional[OpenaiFileRecord]:
+        """Get the OpenAI file already uploaded for this exact section content"""
+        try:
+            response = (self.db.table(self.table_name)
+                       .select("*")
+                       .eq("vector_store_id", vector_store_id)
+                       .eq("file_name", file_name)
+                       .eq("content_sha256", content_sha256)
+                       .limit(1)
+                       .execute())
+            return OpenaiFileRecord(**response.data[0]) if response.data else None
+        except Exception as e:
+            raise DatabaseError(f"Failed to get record: {str(e)}")
+
+    def delete_by_openai_file_id(self, openai_file_id: str) -> bool:
+        """Forget an OpenAI file (e.g. after it was deleted in OpenAI)"""
+        return self.delete_by_field("openai_file_id", openai_file_id)
@@ -1,11 +1,14 @@
 # vector_metadata_repository.py
-from typing import Optional
+from typing import List, Optional
 from ....model.vector_store import VectorStoreMetadata
 from ..database.base_repository import BaseRepository
 
 
 class VectorStoreMetadataRepository(BaseRepository):
     def __init__(self):
+        # Not cached here: VectorStoreManager.get_openai_vector_store_id already
+        # caches the ids chat reads, and a second per-process layer would let
+        # other workers serve a replaced store id for twice as long
         super().__init__("vector_metadata")
 
     def get_by_vector_store_id(
@@ -22,15 +25,17 @@ class VectorStoreMetadataRepository(BaseRepository):
         data = self.get_by_field("openai_vector_id", openai_vector_id)
         return VectorStoreMetadata(**data) if data else None
 
+    def get_all_vector_stores(self) -> List[VectorStoreMetadata]:
+        """Get all vector metadata (the live vector store pointers)"""
+        return [VectorStoreMetadata(**data) for data in self.get_all()]
+
     def upsert_by_vector_store_id(
         self, vector_store_id: str, data: VectorStoreMetadata
     ) -> Optional[VectorStoreMetadata]:
-        """Update vector metadata by vector_store_id"""
-        if self.exists_by_field("vector_store_id", vector_store_id):
-            result = self.update_by_field("vector_store_id", vector_store_id, data.model_dump())
-        else:
-            result = self.create(data.model_dump())
-
+        """Create or update vector metadata by vector_store_id"""
+        payload = data.model_dump()
+        payload["vector_store_id"] = vector_store_id
+        result = self.upsert(payload, on_conflict="vector_store_id")
         return VectorStoreMetadata(**result)
 
     def delete_by_vector_store_id(self, vector_store_id: str) -> bool:
@@ -9,6 +9,12 @@ class YahooAuthRepository(BaseRepository):
     def get_by_yahoo_user_id(self, yahoo_user_id: str) -> Optional[Dict[str, Any]]:
         return self.get_by_field("yahoo_user_id", yahoo_user_id)
     
+    def exists_by_yahoo_user_id(self, yahoo_user_id: str) -> bool:
+        return self.exists_by_field("yahoo_user_id", yahoo_user_id)
+    
+    def upsert_by_yahoo_user_id(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.upsert(data, on_conflict="yahoo_user_id")
+    
     def update_by_yahoo_user_id(self, yahoo_user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         return self.update_by_field("yahoo_user_id", yahoo_user_id, data)
     
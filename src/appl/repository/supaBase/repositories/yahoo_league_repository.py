@@ -4,16 +4,20 @@ from ..database.base_repository import BaseRepository
 
 class YahooLeagueRepository(BaseRepository):
     def __init__(self):
-        super().__init__("yahoo_league")
+        # The cache is per process and only cleared by this process's writes: a
+        # worker may read a last_blob_sync up to 5 minutes older than another
+        # worker's sync wrote, so the sync TTL check can start one redundant sync
+        # (its uploads are skipped when the content is unchanged)
+        super().__init__("yahoo_league", cache_ttl_seconds=300)
     
     def get_by_yahoo_user_id(self, yahoo_user_id: str) -> List[Dict[str, Any]]:
         return self.get_multiple_by_field("yahoo_user_id", yahoo_user_id)
     
-    def get_by_league_id(self, league_id: str) -> Optional[Dict[str, Any]]:
-        return self.get_by_field("league_id", league_id)
+    def get_by_league_id(self, league_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+        return self.get_by_field("league_id", league_id, columns)
     
     def league_exist_for_user(self, league_id: str, yahoo_user_id: str) -> Optional[Dict[str, Any]]:
-        return self.get_by_two_fields("league_id", league_id, "yahoo_user_id", yahoo_user_id)
+        return self.get_by_two_fields("league_id", league_id, "yahoo_user_id", yahoo_user_id, columns="league_id")
         
         
     def delete_by_yahoo_user_id(self, yahoo_user_id: str) -> bool:
@@ -0,0 +1,17 @@
+-- openai_file_registry: files uploaded to OpenAI for a vector store, keyed by the
+-- content hash of the section they hold (see OpenaiFileRegistryRepository).
+-- Apply in the Supabase SQL editor before deploying the file registry.
+
+create table if not exists public.openai_file_registry (
+    vector_store_id text not null,  -- FilePurpose + leagueId, as in vector_metadata
+    file_name text not null,
+    content_sha256 text not null,
+    openai_file_id text not null,
+    created_at timestamptz not null default now(),
+    -- Lookup key of get_by_content_hash, and the conflict target of registrations
+    primary key (vector_store_id, file_name, content_sha256)
+);
+
+-- Stale files are unregistered by their OpenAI id
+create unique index if not exists openai_file_registry_openai_file_id_key
+    on public.openai_file_registry (openai_file_id);
@@ -15,24 +15,11 @@ class AuthService:
     # Google Authentication Methods
     def create_or_update_google_user(self, google_auth: GoogleAuth) -> GoogleAuth:
         """Create new Google user or update existing one"""
-        existing_user = self.google_auth_repo.get_by_google_user_id(
-            google_auth.google_user_id
-        )
-
-        if existing_user:
-            # Update existing user
-            update_payload = google_auth.to_dict()
-            update_payload["last_updated"] = datetime.now().isoformat()
-            updated_data = self.google_auth_repo.update_by_google_user_id(
-                google_auth.google_user_id, update_payload
-            )
-            return GoogleAuth.from_dict(updated_data)
-        else:
-            # Create new user
-            create_payload = google_auth.to_dict()
-            create_payload["last_updated"] = datetime.now().isoformat()
-            created_data = self.google_auth_repo.create(create_payload)
-            return GoogleAuth.from_dict(created_data)
+        # One round trip; the unique google_user_id decides between insert and update
+        payload = google_auth.to_dict()
+        payload["last_updated"] = datetime.now().isoformat()
+        saved_data = self.google_auth_repo.upsert_by_google_user_id(payload)
+        return GoogleAuth.from_dict(saved_data)
 
     def get_google_user(self, google_user_id: str) -> GoogleAuth:
         user_data = self.google_auth_repo.get_by_google_user_id(google_user_id)
@@ -60,24 +47,11 @@ class AuthService:
     # Yahoo Authentication Methods
     def create_or_update_yahoo_user(self, yahoo_auth: YahooAuth) -> YahooAuth:
         """Create new Yahoo user or update existing one"""
-        existing_user = self.yahoo_auth_repo.get_by_yahoo_user_id(
-            yahoo_auth.yahoo_user_id
-        )
-
-        if existing_user:
-            # Update existing user
-            update_payload = yahoo_auth.to_dict()
-            update_payload["last_updated"] = datetime.now().isoformat()
-            updated_data = self.yahoo_auth_repo.update_by_yahoo_user_id(
-                yahoo_auth.yahoo_user_id, update_payload
-            )
-            return YahooAuth.from_dict(updated_data)
-        else:
-            # Create new user
-            create_payload = yahoo_auth.to_dict()
-            create_payload["last_updated"] = datetime.now().isoformat()
-            created_data = self.yahoo_auth_repo.create(create_payload)
-            return YahooAuth.from_dict(created_data)
+        # One round trip; the unique yahoo_user_id decides between insert and update
+        payload = yahoo_auth.to_dict()
+        payload["last_updated"] = datetime.now().isoformat()
+        saved_data = self.yahoo_auth_repo.upsert_by_yahoo_user_id(payload)
+        return YahooAuth.from_dict(saved_data)
 
     def get_yahoo_user(self, yahoo_user_id: str) -> YahooAuth:
         user_data = self.yahoo_auth_repo.get_by_yahoo_user_id(yahoo_user_id)
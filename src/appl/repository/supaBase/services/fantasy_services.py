@@ -5,7 +5,7 @@ from ..repositories.google_fantasy_repository import GoogleFantasyRepository
 from ..repositories.google_auth_repository import GoogleAuthRepository
 from ..repositories.yahoo_auth_repository import YahooAuthRepository
 from ..exceptions.custom_exceptions import ValidationError, NotFoundError, DuplicateError
-from ..utils.validators import validate_user_id, validate_platform
+from ..utils.validators import ALLOWED_PLATFORMS, validate_user_id, validate_platform
 
 class FantasyService:
     def __init__(self):
@@ -20,6 +20,8 @@ class FantasyService:
         validate_user_id(google_fantasy.google_user_id, "Google")
         validate_user_id(google_fantasy.fantasy_user_id, "Fantasy")
         validate_platform(google_fantasy.fantasy_platform)
+        # Stored lowercase, so lookups and counts by platform match exactly
+        google_fantasy.fantasy_platform = google_fantasy.fantasy_platform.lower()
         
         # Validate that Google user exists
         google_user = self.google_auth_repo.get_by_google_user_id(google_fantasy.google_user_id)
@@ -28,18 +30,17 @@ class FantasyService:
         
         # For Yahoo platform, validate that Yahoo user exists
         if google_fantasy.fantasy_platform.lower() == "yahoo":
-            yahoo_user = self.yahoo_auth_repo.get_by_yahoo_user_id(google_fantasy.fantasy_user_id)
-            if not yahoo_user:
+            if not self.yahoo_auth_repo.exists_by_yahoo_user_id(google_fantasy.fantasy_user_id):
                 raise ValidationError(f"Yahoo user '{google_fantasy.fantasy_user_id}' does not exist")
         
         # Check if exact connection already exists (composite key check)
-        existing_connection = self.google_fantasy_repo.get_by_composite_key(
+        connection_exists = self.google_fantasy_repo.exists_by_composite_key(
             google_fantasy.google_user_id,
             google_fantasy.fantasy_user_id,
             google_fantasy.fantasy_platform
         )
         
-        if existing_connection:
+        if connection_exists:
             raise DuplicateError("This exact connection already exists")
         
         # Create the connection
@@ -70,8 +71,7 @@ class FantasyService:
         validate_user_id(google_user_id, "Google")
         validate_platform(platform)
         
-        existing_connection = self.google_fantasy_repo.get_by_google_and_platform(google_user_id, platform)
-        if not existing_connection:
+        if not self.google_fantasy_repo.exists_by_google_and_platform(google_user_id, platform):
             raise NotFoundError(f"No connection to '{platform}' platform exists for this user")
         
         return self.google_fantasy_repo.delete_by_google_and_platform(google_user_id, platform)
@@ -82,8 +82,7 @@ class FantasyService:
         validate_user_id(fantasy_user_id, "Fantasy")
         validate_platform(platform)
         
-        existing_connection = self.google_fantasy_repo.get_by_composite_key(google_user_id, fantasy_user_id, platform)
-        if not existing_connection:
+        if not self.google_fantasy_repo.exists_by_composite_key(google_user_id, fantasy_user_id, platform):
             raise NotFoundError("This specific connection does not exist")
         
         return self.google_fantasy_repo.delete_by_composite_key(google_user_id, fantasy_user_id, platform)
@@ -108,7 +107,7 @@ class FantasyService:
         validate_user_id(yahoo_user_id, "Yahoo")
         
         # Verify Yahoo user exists
-        if not self.yahoo_auth_repo.get_by_yahoo_user_id(yahoo_user_id):
+        if not self.yahoo_auth_repo.exists_by_yahoo_user_id(yahoo_user_id):
             raise NotFoundError(f"Yahoo user '{yahoo_user_id}' does not exist")
         
         connections_data = self.google_fantasy_repo.get_google_users_by_yahoo_user(yahoo_user_id)
@@ -119,23 +118,23 @@ class FantasyService:
         validate_user_id(google_user_id, "Google")
         validate_platform(platform)
         
-        connection = self.get_fantasy_connection(google_user_id, platform)
-        return connection is not None
+        return self.google_fantasy_repo.exists_by_google_and_platform(google_user_id, platform)
     
     def get_connection_count_for_google_user(self, google_user_id: str) -> int:
         """Get count of all fantasy platform connections for a Google user"""
         validate_user_id(google_user_id, "Google")
         
-        connections = self.get_user_fantasy_connections(google_user_id)
-        return len(connections)
+        # Verify Google user exists
+        if not self.google_auth_repo.get_by_google_user_id(google_user_id):
+            raise NotFoundError(f"Google user '{google_user_id}' does not exist")
+        
+        return self.google_fantasy_repo.count({"google_user_id": google_user_id})
     
     def get_platform_statistics(self) -> Dict[str, int]:
-        """Get statistics about platform connections"""
-        all_connections = self.google_fantasy_repo.get_all()
-        
-        stats = {}
-        for connection in all_connections:
-            platform = connection.get('fantasy_platform', '').lower()
-            stats[platform] = stats.get(platform, 0) + 1
-            
-        return stats
\ No newline at end of file
+        """Get statistics about platform connections (counted server-side)"""
+        # Case-insensitive, since older rows may not be stored lowercase
+        counts = {
+            platform: self.google_fantasy_repo.count_by_platform(platform)
+            for platform in ALLOWED_PLATFORMS
+        }
+        return {platform: count for platform, count in counts.items() if count}
\ No newline at end of file
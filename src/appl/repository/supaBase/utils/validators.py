@@ -3,6 +3,8 @@ import re
 
 from ..exceptions.custom_exceptions import ValidationError
 
+ALLOWED_PLATFORMS = ["yahoo", "espn"]  # Future-ready
+
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
@@ -23,10 +25,9 @@ def validate_platform(platform: str) -> bool:
     if not platform:
         raise ValidationError("Platform cannot be empty")
     
-    allowed_platforms = ["yahoo", "espn"]  # Future-ready
-    if platform.lower() not in allowed_platforms:
+    if platform.lower() not in ALLOWED_PLATFORMS:
 
-        raise ValidationError(f"Invalid platform '{platform}'. Allowed: {', '.join(allowed_platforms)}")
+        raise ValidationError(f"Invalid platform '{platform}'. Allowed: {', '.join(ALLOWED_PLATFORMS)}")
     return True
 
 def validate_user_id(user_id: str, platform: str = None) -> bool:
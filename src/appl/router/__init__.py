@@ -1,4 +1,5 @@
 from ..config.dependencies import (
+    answer_cache,
     openai_agent_manager,
     openai_file_manager,
 )
@@ -7,6 +8,10 @@ from .main_routes import MainRouter
 from .yahoo_routes import YahooRouter
 from .openai_agent_router import OpenaiAgentRouter
 from .openai_file_router import OpenaiFilesRouter
+from .metrics_router import MetricsRouter
+from ..service.latency_metrics import get_latency_recorder
+from ..service.openai_gateway import get_openai_gateway
+from ..repository.supaBase.database.repository_cache import repository_cache_stats
 
 
 def register_routes(app):
@@ -17,6 +22,14 @@ def register_routes(app):
     yahoo_router = YahooRouter(openai_file_manager())
     openai_agent_router = OpenaiAgentRouter(openai_agent_manager())
     openai_file_router = OpenaiFilesRouter(openai_file_manager())
+    metric_sources = {
+        "latency": get_latency_recorder().stats,
+        "openai_gateway": get_openai_gateway().stats,
+        "repository_cache": repository_cache_stats,
+    }
+    if answer_cache() is not None:
+        metric_sources["answer_cache"] = answer_cache().stats
+    metrics_router = MetricsRouter(metric_sources)
     
     # Register blueprints
     app.register_blueprint(main_router.get_bp())
@@ -24,3 +37,4 @@ def register_routes(app):
     app.register_blueprint(yahoo_router.get_bp())
     app.register_blueprint(openai_agent_router.get_bp())
     app.register_blueprint(openai_file_router.get_bp())
+    app.register_blueprint(metrics_router.get_bp())
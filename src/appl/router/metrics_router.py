@@ -0,0 +1,28 @@
+from typing import Any, Callable, Dict
+
+from flask import Blueprint, jsonify
+
+from ..middleware.auth_decorators import require_metrics_access
+
+
+class MetricsRouter:
+    def __init__(self, metric_sources: Dict[str, Callable[[], Dict[str, Any]]]):
+        # metrics section name -> function returning a JSON-serializable snapshot
+        self.metric_sources = metric_sources
+        self._blueprint = self._create_blueprint()
+
+    def _create_blueprint(self):
+        metrics_bp = Blueprint("metrics", __name__)
+
+        @metrics_bp.route("/metrics", methods=["GET"])
+        @require_metrics_access
+        def metrics():
+            """Snapshot of the in-process metrics of this worker"""
+            return jsonify(
+                {name: source() for name, source in self.metric_sources.items()}
+            )
+
+        return metrics_bp
+
+    def get_bp(self):
+        return self._blueprint
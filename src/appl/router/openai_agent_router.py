@@ -1,7 +1,13 @@
-from flask import Blueprint, request
+import json
+import logging
+
+from flask import Blueprint, Response, request, session, stream_with_context
 from ..model.chat import AssistantResponse
+from ..service.latency_metrics import mark, span, trace_request
 from ..service.openai_agent_manager import OpenaiAgentManager
 
+logger = logging.getLogger(__name__)
+
 
 class OpenaiAgentRouter:
     def __init__(self, openai_agent_manager: OpenaiAgentManager):
@@ -13,9 +19,37 @@ class OpenaiAgentRouter:
 
         @openai_agent_bp.route("/chat", methods=["POST"])
         async def chat() -> AssistantResponse:
+            with trace_request("chat") as trace:
+                with span("parse_request"):
+                    chat_request = request.get_json()
+                    chat_request["user_guid"] = session.get("user")
+                trace.league_id = chat_request.get("league_id")
+                assistant_response = await self.openai_agent_manager.chat(chat_request)
+                return assistant_response.output_text
+
+        @openai_agent_bp.route("/chat/stream", methods=["POST"])
+        def chat_stream():
+            """Stream the assistant response as Server-Sent Events."""
             chat_request = request.get_json()
-            assistant_response = await self.openai_agent_manager.chat(chat_request)
-            return assistant_response.output_text
+            chat_request["user_guid"] = session.get("user")
+
+            def events():
+                with trace_request("chat_stream", chat_request.get("league_id")):
+                    try:
+                        for event in self.openai_agent_manager.stream_chat(chat_request):
+                            yield f"data: {json.dumps(event)}\n\n"
+                    except Exception as e:
+                        logger.error(f"Chat stream failed: {e}", exc_info=True)
+                        mark("error")
+                        error = {"type": "error", "message": "Chat request failed"}
+                        yield f"data: {json.dumps(error)}\n\n"
+
+            return Response(
+                stream_with_context(events()),
+                mimetype="text/event-stream",
+                # Keep proxies (e.g. nginx, ngrok) from buffering the stream
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
 
         return openai_agent_bp
 
@@ -1,6 +1,7 @@
 from typing import Dict
 
 from flask import Blueprint, request
+from ..service.league_document_renderer import render_league_documents
 from ..service.openai_file_manager import OpenaiFileManager
 
 
@@ -16,7 +17,9 @@ class OpenaiFilesRouter:
         def update_league_files(league_id: str):
             # TODO: validate all league files are in the list
             files = request.get_json()
-            self.openai_file_manager.update_league_files(league_id, files)
+            self.openai_file_manager.update_league_files(
+                league_id, render_league_documents(files)
+            )
 
         @openai_file_bp.route("/update_rules", methods=["POST"])
         def update_rules(file: Dict[str, str]):
@@ -11,7 +11,7 @@ from ..fantasy_integrations.yahoo.sync_league.yahoo_service import (
 )
 from flask import Blueprint, request, session
 from ..middleware.auth_decorators import require_google_auth
-from ..repository.azure.azure_blob_storage import AzureBlobStorage
+from ..repository.storage.store_factory import create_league_data_store
 from ..repository.supaBase.repositories.yahoo_league_repository import (
     YahooLeagueRepository,
 )
@@ -190,7 +190,7 @@ class YahooRouter:
 
                 # Sync league data
                 yahoo_league = YahooLeague(league)
-                results = yahoo_league.sync_full_league()
+                results = yahoo_league.sync_full_league(create_league_data_store())
 
                 return f"<h2>Debug League Sync Complete!</h2><p>{db_message}</p><p>Sync Results: {results}</p><br><a href='/dashboard'>← Back to Dashboard</a>"
 
@@ -23,6 +23,9 @@ from appl.service.vector_store_manager import VectorStoreManager
 from appl.repository.supaBase.repositories.vector_metadata_repository import (
     VectorStoreMetadataRepository,
 )
+from appl.repository.supaBase.repositories.openai_file_registry_repository import (
+    OpenaiFileRegistryRepository,
+)
 
 load_dotenv()
 
@@ -45,8 +48,13 @@ def setup_services() -> tuple[OpenaiFileManager, VectorStoreManager]:
 
     # Initialize repositories and services
     vector_store_repo = VectorStoreMetadataRepository()
-    vector_store_manager = VectorStoreManager(vector_store_repo, openai_client)
-    openai_file_manager = OpenaiFileManager(vector_store_manager, openai_client)
+    file_registry_repo = OpenaiFileRegistryRepository()
+    vector_store_manager = VectorStoreManager(
+        vector_store_repo, openai_client, file_registry_repo
+    )
+    openai_file_manager = OpenaiFileManager(
+        vector_store_manager, openai_client, file_registry_repo
+    )
 
     return openai_file_manager, vector_store_manager
 
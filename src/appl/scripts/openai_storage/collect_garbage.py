@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+OpenAI Storage Garbage Collection Script
+
+Deletes OpenAI vector stores and files that are no longer referenced by the
+vector_metadata table, once they are older than the grace period.
+Runs as a dry run unless --execute is given.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+
+from dotenv import load_dotenv
+from openai import OpenAI
+
+from appl.service.openai_storage_gc import OpenaiStorageGarbageCollector
+from appl.repository.supaBase.repositories.vector_metadata_repository import (
+    VectorStoreMetadataRepository,
+)
+from appl.repository.supaBase.repositories.openai_file_registry_repository import (
+    OpenaiFileRegistryRepository,
+)
+
+load_dotenv()
+
+
+def main():
+    """
+    Main function to run the OpenAI storage garbage collection job.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--execute", action="store_true", help="Actually delete (default is a dry run)"
+    )
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=24,
+        help="Only delete objects older than this many hours",
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=100, help="Objects listed per API page"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Concurrent delete requests"
+    )
+    args = parser.parse_args()
+
+    print("🧹 Starting OpenAI Storage Garbage Collection")
+    print("=" * 50)
+
+    try:
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not openai_api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is required")
+
+        collector = OpenaiStorageGarbageCollector(
+            OpenAI(api_key=openai_api_key),
+            VectorStoreMetadataRepository(),
+            OpenaiFileRegistryRepository(),
+            grace_period=timedelta(hours=args.grace_hours),
+            page_size=args.page_size,
+            max_workers=args.workers,
+        )
+        report = collector.run(dry_run=not args.execute)
+
+        action = "Deleted" if args.execute else "Would delete"
+        print(f"{action} {len(report.deleted_vector_stores)} vector stores")
+        print(f"{action} {len(report.deleted_files)} files")
+        print(f"Skipped {report.skipped_in_grace_period} objects in grace period")
+        print(json.dumps(report.to_dict(), indent=2))
+
+        if report.errors:
+            print(f"\n⚠️ Completed with {len(report.errors)} errors")
+            sys.exit(1)
+
+        print("\n🎉 Script completed successfully!")
+        print("=" * 50)
+
+    except Exception as e:
+        print(f"\n❌ Script failed with error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
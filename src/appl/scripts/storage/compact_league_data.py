@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+League Data Retention Script
+
+Deletes old versions of versioned league data (uploaded with
+AzureBlobStorage.upload_league_data), keeping the newest versions recorded
+in each league manifest.
+"""
+
+import argparse
+import sys
+
+from dotenv import load_dotenv
+
+from appl.repository.azure.azure_blob_storage import AzureBlobStorage
+
+load_dotenv()
+
+
+def main():
+    """
+    Main function to run the league data retention job.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("league_ids", nargs="+", help="Leagues to compact")
+    parser.add_argument(
+        "--container", default="fantasy1", help="Azure blob container name"
+    )
+    parser.add_argument(
+        "--keep", type=int, default=5, help="Versions to keep per data type"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report what would be deleted"
+    )
+    args = parser.parse_args()
+
+    print("🧹 Starting League Data Retention Script")
+    print("=" * 50)
+
+    try:
+        azure_storage = AzureBlobStorage(container_name=args.container)
+
+        for league_id in args.league_ids:
+            report = azure_storage.compact_league_data(
+                league_id, keep_versions=args.keep, dry_run=args.dry_run
+            )
+            for data_type, blob_names in report.items():
+                action = "Would delete" if args.dry_run else "Deleted"
+                print(f"{league_id}/{data_type}: {action} {len(blob_names)} versions")
+
+        print("\n🎉 Script completed successfully!")
+        print("=" * 50)
+
+    except Exception as e:
+        print(f"\n❌ Script failed with error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
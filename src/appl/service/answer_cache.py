@@ -0,0 +1,86 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = "?!. "
+
+
+def normalize_question(question: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the answer."""
+    return _WHITESPACE_PATTERN.sub(" ", question).strip().lower().rstrip(
+        _TRAILING_PUNCTUATION
+    )
+
+
+def answer_cache_key(
+    league_id: str,
+    data_version: str,
+    question: str,
+    context_hash: Optional[str] = None,
+) -> str:
+    """
+    Key of a cached answer: the league, the version of its data, the normalized
+    question and a hash of any other per-user prompt context (e.g. the digest).
+    """
+    parts = [league_id, data_version, context_hash or "", normalize_question(question)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU of chat answers with a TTL. Entries older than ttl_seconds
+    are dropped on read; the least recently used entry is evicted once
+    max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 900):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (stored_at, answer)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, answer: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -0,0 +1,68 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ChatEventLoop:
+    """
+    Long-lived event loop of the chat path, run in a daemon thread.
+    Flask runs each async view in a new loop, so clients bound to a loop (e.g.
+    AsyncOpenAI's connection pool) can only be shared across requests when the
+    turns themselves run here.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """
+        Run a coroutine on the loop. The caller's context variables (e.g. the
+        latency trace) are visible to it; cancelling the future cancels it.
+        """
+        context = contextvars.copy_context()
+        return asyncio.run_coroutine_threadsafe(
+            self._run_in_context(coro, context), self._get_loop()
+        )
+
+    @staticmethod
+    async def _run_in_context(coro: Coroutine[Any, Any, T], context: contextvars.Context) -> T:
+        return await asyncio.get_running_loop().create_task(coro, context=context)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name="chat-event-loop", daemon=True
+                    ).start()
+                    logger.info("Started the chat event loop")
+                    self._loop = loop
+        return self._loop
+
+
+_chat_event_loop_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_chat_event_loop() -> ChatEventLoop:
+    """
+    Get or create the global chat event loop singleton instance.
+    Thread-safe lazy initialization.
+    """
+    global _chat_event_loop_instance
+
+    if _chat_event_loop_instance is None:
+        with _instance_lock:
+            if _chat_event_loop_instance is None:
+                _chat_event_loop_instance = ChatEventLoop()
+
+    return _chat_event_loop_instance
@@ -1,26 +1,115 @@
-from typing import Dict
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 from ..model.chat import ChatSession
+from ..repository.storage.chat_session_store import ChatSessionStore
+
+logger = logging.getLogger(__name__)
 
 
 class ChatSessionManager:
+    """
+    Chat sessions of this worker in a bounded LRU: sessions idle for longer than
+    idle_ttl_seconds expire and the least recently used session is evicted past
+    max_sessions. With a shared store, sessions are read from and written to the
+    store first, so any worker can continue a conversation; the in-memory copy
+    is the fallback when the store fails.
+    """
 
-    def __init__(self):
-        self.chat_sessions: Dict[str, ChatSession] = {}
+    def __init__(
+        self,
+        store: Optional[ChatSessionStore] = None,
+        max_sessions: int = 10000,
+        idle_ttl_seconds: float = 6 * 60 * 60,
+        purge_interval_seconds: float = 10 * 60,
+    ):
+        self.store = store
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        # session_id -> (last_used, session), least recently used first
+        self.chat_sessions: "OrderedDict[str, Tuple[float, ChatSession]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
 
     def get_existing_or_create(self, session_id: str) -> ChatSession:
-        chat_session = self.chat_sessions.get(session_id)
+        self._purge_expired()
+        chat_session = self._load(session_id)
         if chat_session is None:
             chat_session = ChatSession(
                 session_id=session_id,
                 previous_openai_response_id=None
             )
-            self.add_chat_session(chat_session)
+            # Stored once it has a response to continue from
+            self._remember(chat_session)
         return chat_session
 
     def add_chat_session(self, chat_session: ChatSession):
-        self.chat_sessions[chat_session.session_id] = chat_session
+        self._remember(chat_session)
+        if self.store is not None:
+            try:
+                self.store.save(chat_session)
+            except Exception as e:
+                logger.warning(f"Could not store chat session {chat_session.session_id}: {e}")
 
     def update_chat_session(self, chat_session_id: str, previous_openai_response_id: str):
-        chat_session = self.chat_sessions[chat_session_id]
-        chat_session.previous_openai_response_id = previous_openai_response_id
-        self.chat_sessions[chat_session.session_id] = chat_session
+        # The session may have been evicted since it was loaded
+        chat_session = ChatSession(
+            session_id=chat_session_id,
+            previous_openai_response_id=previous_openai_response_id,
+        )
+        self.add_chat_session(chat_session)
+
+    def _load(self, session_id: str) -> Optional[ChatSession]:
+        if self.store is not None:
+            try:
+                chat_session = self.store.get(session_id, self.idle_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Could not load chat session {session_id}: {e}")
+            else:
+                if chat_session is not None:
+                    self._remember(chat_session)
+                    return chat_session
+
+        with self._lock:
+            cached = self.chat_sessions.get(session_id)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[0] >= self.idle_ttl_seconds:
+                del self.chat_sessions[session_id]
+                return None
+            self.chat_sessions[session_id] = (time.monotonic(), cached[1])
+            self.chat_sessions.move_to_end(session_id)
+            return cached[1]
+
+    def _remember(self, chat_session: ChatSession):
+        with self._lock:
+            self.chat_sessions[chat_session.session_id] = (time.monotonic(), chat_session)
+            self.chat_sessions.move_to_end(chat_session.session_id)
+            while len(self.chat_sessions) > self.max_sessions:
+                self.chat_sessions.popitem(last=False)
+
+    def _purge_expired(self):
+        """Drop idle sessions from memory and the store, at most once per purge interval."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_purge < self.purge_interval_seconds:
+                return
+            self._last_purge = now
+            # Least recently used first, so stop at the first live session
+            while self.chat_sessions:
+                session_id, (last_used, _) = next(iter(self.chat_sessions.items()))
+                if now - last_used < self.idle_ttl_seconds:
+                    break
+                del self.chat_sessions[session_id]
+
+        if self.store is not None:
+            try:
+                deleted = self.store.delete_idle(self.idle_ttl_seconds)
+                if deleted:
+                    logger.info(f"Deleted {deleted} idle chat sessions")
+            except Exception as e:
+                logger.warning(f"Could not delete idle chat sessions: {e}")
@@ -0,0 +1,217 @@
+import bisect
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is unbounded
+BUCKET_BOUNDS_MS = [
+    1, 2, 5, 10, 20, 50, 100, 200, 500,
+    1000, 2000, 5000, 10000, 20000, 30000, 60000, 120000,
+]
+
+# Leagues tracked separately per stage; beyond that only the totals are kept
+MAX_TRACKED_LEAGUES = 500
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are interpolated within a bucket."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= target:
+                lower = BUCKET_BOUNDS_MS[bucket - 1] if bucket > 0 else 0.0
+                upper = (
+                    BUCKET_BOUNDS_MS[bucket]
+                    if bucket < len(BUCKET_BOUNDS_MS)
+                    else self.max_ms
+                )
+                estimate = lower + (upper - lower) * (target - seen) / bucket_count
+                return min(estimate, self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 2),
+            "p90_ms": round(self.percentile(0.90), 2),
+            "p99_ms": round(self.percentile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class LatencyRecorder:
+    """Thread-safe histograms of stage latencies, overall and per league."""
+
+    def __init__(self):
+        # stage -> histogram over all leagues
+        self._stages: Dict[str, LatencyHistogram] = {}
+        # (stage, league_id) -> histogram
+        self._league_stages: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._leagues = set()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, duration_ms: float, league_id: Optional[str] = None):
+        with self._lock:
+            self._stages.setdefault(stage, LatencyHistogram()).record(duration_ms)
+            if league_id is None:
+                return
+            if league_id not in self._leagues:
+                if len(self._leagues) >= MAX_TRACKED_LEAGUES:
+                    return
+                self._leagues.add(league_id)
+            self._league_stages.setdefault(
+                (stage, league_id), LatencyHistogram()
+            ).record(duration_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                stage: {"all": histogram.to_dict(), "by_league": {}}
+                for stage, histogram in sorted(self._stages.items())
+            }
+            for (stage, league_id), histogram in sorted(self._league_stages.items()):
+                stages[stage]["by_league"][league_id] = histogram.to_dict()
+            return stages
+
+
+class LatencyTrace:
+    """Stage timings of one request. Spans of the same stage add up."""
+
+    def __init__(self, name: str, league_id: Optional[str] = None):
+        self.name = name
+        self.league_id = league_id
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, duration_ms: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + duration_ms
+
+    def mark(self, event: str):
+        """Record the time since the request started, the first time an event happens."""
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        with self._lock:
+            self.marks.setdefault(event, elapsed_ms)
+
+    def finish(self, recorder: "LatencyRecorder", status: str) -> float:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        with self._lock:
+            stages = dict(self.stages)
+            marks = dict(self.marks)
+
+        recorder.record(f"{self.name}.total", total_ms, self.league_id)
+        for stage, duration_ms in stages.items():
+            recorder.record(f"{self.name}.{stage}", duration_ms, self.league_id)
+        for event, elapsed_ms in marks.items():
+            recorder.record(f"{self.name}.{event}", elapsed_ms, self.league_id)
+
+        logger.info(
+            json.dumps(
+                {
+                    "event": "latency",
+                    "request": self.name,
+                    "league_id": self.league_id,
+                    "status": status,
+                    "total_ms": round(total_ms, 2),
+                    "stages_ms": {k: round(v, 2) for k, v in stages.items()},
+                    "marks_ms": {k: round(v, 2) for k, v in marks.items()},
+                }
+            )
+        )
+        return total_ms
+
+
+# Trace of the request being handled; copied into asyncio.to_thread workers
+_current_trace: contextvars.ContextVar[Optional[LatencyTrace]] = contextvars.ContextVar(
+    "latency_trace", default=None
+)
+
+
+@contextmanager
+def trace_request(name: str, league_id: Optional[str] = None) -> Iterator[LatencyTrace]:
+    """Trace a request: spans inside it are attributed to it and recorded on exit."""
+    trace = LatencyTrace(name, league_id)
+    token = _current_trace.set(trace)
+    status = "error"
+    try:
+        yield trace
+        status = "ok"
+    finally:
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # A streamed response closed from another context; the trace still counts
+            pass
+        trace.finish(get_latency_recorder(), status)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a stage of the current request; a no-op outside trace_request."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(stage, (time.perf_counter() - started) * 1000)
+
+
+def add_span(stage: str, duration_ms: float):
+    """Add an already measured duration to a stage of the current request."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, duration_ms)
+
+
+def mark(event: str):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark(event)
+
+
+_recorder_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    """
+    Get or create the global latency recorder singleton instance.
+    Thread-safe lazy initialization.
+    """
+    global _recorder_instance
+
+    if _recorder_instance is None:
+        with _instance_lock:
+            if _recorder_instance is None:
+                _recorder_instance = LatencyRecorder()
+
+    return _recorder_instance
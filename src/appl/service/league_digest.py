@@ -0,0 +1,411 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ..model.file import SerializedSection
+from ..repository.storage.league_data_store import LeagueDataStore
+from ..repository.storage.store_factory import create_league_data_store
+
+logger = logging.getLogger(__name__)
+
+# Rough budget for the digest added to the instructions; ~4 characters per token
+DIGEST_MAX_TOKENS = 400
+CHARS_PER_TOKEN = 4
+
+DIGEST_SECTIONS = ["league_settings", "standings", "matchups", "team_rosters"]
+
+# Matchup stats where the lower value wins the category
+LOWER_IS_BETTER = {"Turnovers"}
+# Made/attempted stats are shown in matchups but are not scoring categories
+NON_CATEGORY_STATS = {
+    "Field Goals Made/Attempted (FGM/FGA)",
+    "Free Throws Made/Attempted (FTM/FTA)",
+}
+
+
+def build_league_digest(
+    sections: Dict[str, Union[SerializedSection, Any]],
+    team_key: str,
+    max_tokens: int = DIGEST_MAX_TOKENS,
+) -> str:
+    """
+    Summarize a league from one team's point of view: league format, the team's
+    record, the current matchup by category, season category ranks, the top of
+    the standings and injured players.
+
+    Parts are added in priority order until the token budget is used up.
+
+    Args:
+        sections: Section name -> SerializedSection (or raw data), as returned by sync_full_league
+        team_key: Yahoo team key of the user's team
+        max_tokens: Approximate size limit of the digest
+    """
+    data = {name: _load(sections.get(name)) for name in DIGEST_SECTIONS}
+    settings = data["league_settings"] or {}
+    standings = data["standings"] or []
+    matchups = data["matchups"] or []
+    rosters = data["team_rosters"] or {}
+
+    team = next((t for t in standings if t.get("team_key") == team_key), None)
+    team_name = (
+        team.get("name") if team else _team_name_from_matchups(matchups, team_key)
+    )
+
+    parts: List[Callable[[], Optional[str]]] = [
+        lambda: _league_line(settings),
+        lambda: _team_line(team, len(standings)),
+        lambda: _current_matchup(matchups, team_key, settings.get("current_week")),
+        lambda: _category_ranks(matchups, team_key, settings.get("current_week")),
+        lambda: _standings_top(standings, team_key),
+        lambda: _injured_players(rosters.get(team_name) or []),
+    ]
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    lines = []
+    for part in parts:
+        try:
+            text = part()
+        except Exception as e:
+            logger.debug(f"Skipping digest part: {e}")
+            continue
+        if not text:
+            continue
+        if sum(len(line) + 1 for line in lines) + len(text) > budget:
+            break
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def digest_data_hash(
+    sections: Dict[str, Union[SerializedSection, Any]], team_key: str
+) -> str:
+    """Hash of the digest inputs; an unchanged hash means the digest is unchanged."""
+    digest = hashlib.sha256(team_key.encode("utf-8"))
+    for name in DIGEST_SECTIONS:
+        section = sections.get(name)
+        if section is None:
+            continue
+        if not isinstance(section, SerializedSection):
+            section = SerializedSection.from_data(name, section)
+        digest.update(f"{name}:{section.content_sha256}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load(section: Union[SerializedSection, Any]) -> Any:
+    if isinstance(section, SerializedSection):
+        return json.loads(section.payload)
+    return section
+
+
+def _to_number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sides(matchup: Dict[str, Any], team_key: str) -> Optional[Tuple[Dict, Dict]]:
+    team_1 = matchup.get("team_1") or {}
+    team_2 = matchup.get("team_2") or {}
+    if team_1.get("team_key") == team_key:
+        return team_1, team_2
+    if team_2.get("team_key") == team_key:
+        return team_2, team_1
+    return None
+
+
+def _team_name_from_matchups(matchups: List[List[Dict]], team_key: str) -> Optional[str]:
+    for week_matchups in matchups:
+        for matchup in week_matchups:
+            sides = _sides(matchup, team_key)
+            if sides:
+                return sides[0].get("team_name")
+    return None
+
+
+def _league_line(settings: Dict[str, Any]) -> Optional[str]:
+    if not settings:
+        return None
+    return (
+        f"League: {settings.get('name')} | {settings.get('num_teams')} teams | "
+        f"scoring {settings.get('scoring_type')} | week {settings.get('current_week')} "
+        f"of {settings.get('end_week')} | playoffs from week "
+        f"{settings.get('playoff_start_week')} ({settings.get('num_playoff_teams')} teams)"
+    )
+
+
+def _team_line(team: Optional[Dict[str, Any]], team_count: int) -> Optional[str]:
+    if not team:
+        return None
+    totals = team.get("outcome_totals") or {}
+    return (
+        f"Your team: {team.get('name')} | rank {team.get('rank')}/{team_count} | "
+        f"{totals.get('wins')}-{totals.get('losses')}-{totals.get('ties')} "
+        f"({totals.get('percentage')}) | GB {team.get('games_back')}"
+    )
+
+
+def _current_matchup(
+    matchups: List[List[Dict]], team_key: str, current_week: Any
+) -> Optional[str]:
+    # Latest synced week up to the current one
+    candidates = []
+    for week_matchups in matchups:
+        for matchup in week_matchups:
+            sides = _sides(matchup, team_key)
+            week = _to_number(matchup.get("week"))
+            if sides and week is not None:
+                candidates.append((week, sides))
+    current = _to_number(current_week)
+    if current is not None:
+        candidates = [c for c in candidates if c[0] <= current] or candidates
+    if not candidates:
+        return None
+
+    week, (mine, theirs) = max(candidates, key=lambda c: c[0])
+    mine_stats = mine.get("stats") or {}
+    theirs_stats = theirs.get("stats") or {}
+    leading, trailing = [], []
+    for stat_name, value in mine_stats.items():
+        if stat_name in NON_CATEGORY_STATS:
+            continue
+        mine_value = _to_number(value)
+        theirs_value = _to_number(theirs_stats.get(stat_name))
+        if mine_value is None or theirs_value is None or mine_value == theirs_value:
+            continue
+        ahead = (mine_value < theirs_value) == (stat_name in LOWER_IS_BETTER)
+        (leading if ahead else trailing).append(_short_stat(stat_name))
+
+    return (
+        f"Week {int(week)} vs {theirs.get('team_name')}: {mine.get('score')}-"
+        f"{theirs.get('score')} | leading {', '.join(leading) or '-'} | "
+        f"trailing {', '.join(trailing) or '-'}"
+    )
+
+
+def _category_ranks(
+    matchups: List[List[Dict]], team_key: str, current_week: Any
+) -> Optional[str]:
+    """Rank of each team's weekly category average, from the user's team's view."""
+    # Weeks after the current one are synced with empty stats
+    last_week = _to_number(current_week)
+    totals: Dict[str, Dict[str, List[float]]] = {}
+    for week_matchups in matchups:
+        for matchup in week_matchups:
+            week = _to_number(matchup.get("week"))
+            if last_week is not None and week is not None and week > last_week:
+                continue
+            for side in (matchup.get("team_1") or {}, matchup.get("team_2") or {}):
+                for stat_name, value in (side.get("stats") or {}).items():
+                    number = _to_number(value)
+                    if number is None or stat_name in NON_CATEGORY_STATS:
+                        continue
+                    totals.setdefault(stat_name, {}).setdefault(
+                        side.get("team_key"), []
+                    ).append(number)
+
+    ranks = []
+    for stat_name, by_team in totals.items():
+        if team_key not in by_team:
+            continue
+        averages = {key: sum(values) / len(values) for key, values in by_team.items()}
+        ordered = sorted(
+            averages,
+            key=lambda key: averages[key],
+            reverse=stat_name not in LOWER_IS_BETTER,
+        )
+        ranks.append(f"{_short_stat(stat_name)} {ordered.index(team_key) + 1}")
+    if not ranks:
+        return None
+    team_count = max(len(by_team) for by_team in totals.values())
+    return f"Season category ranks (of {team_count}): " + ", ".join(ranks)
+
+
+def _standings_top(standings: List[Dict[str, Any]], team_key: str) -> Optional[str]:
+    ordered = sorted(standings, key=lambda t: _to_number(t.get("rank")) or 0)[:4]
+    if not ordered:
+        return None
+    entries = []
+    for team in ordered:
+        totals = team.get("outcome_totals") or {}
+        marker = "*" if team.get("team_key") == team_key else ""
+        entries.append(
+            f"{team.get('rank')}. {team.get('name')}{marker} "
+            f"{totals.get('wins')}-{totals.get('losses')}-{totals.get('ties')}"
+        )
+    return "Top: " + " | ".join(entries)
+
+
+def _injured_players(players: List[Dict[str, Any]]) -> Optional[str]:
+    injured = [
+        f"{player.get('name')} ({player.get('status')})"
+        for player in players
+        if player.get("status")
+    ]
+    if not injured:
+        return None
+    return "Injured on your roster: " + ", ".join(injured)
+
+
+def _short_stat(stat_name: str) -> str:
+    # "Field Goal Percentage (FG%)" -> "FG%"
+    if stat_name.endswith(")") and "(" in stat_name:
+        return stat_name[stat_name.rindex("(") + 1 : -1]
+    return {
+        "Points": "PTS",
+        "Rebounds": "REB",
+        "Assists": "AST",
+        "Steals": "STL",
+        "Blocks": "BLK",
+        "Turnovers": "TO",
+    }.get(stat_name, stat_name)
+
+
+def manager_team_keys(teams: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Map each manager's Yahoo guid to their team key.
+
+    Args:
+        teams: Team key -> team info with its "managers", as returned by league.teams()
+    """
+    team_keys = {}
+    for team_key, team in (teams or {}).items():
+        for manager in team.get("managers") or []:
+            guid = (manager.get("manager") or manager).get("guid")
+            if guid:
+                team_keys[guid] = team_key
+    return team_keys
+
+
+class LeagueDigestService:
+    """
+    Keeps the digests of every team of a league. They are generated at the end of
+    a sync, so members whose own sync was skipped as fresh get one too; a team's
+    digest is regenerated only when its input data hash changes. Each league's
+    digests and its manager -> team map are stored in <league_id>/digests.json so
+    other workers can load them, and chat picks the digest of the user's team.
+    """
+
+    def __init__(self, container_name: str = "fantasy1", reload_seconds: float = 300):
+        self.container_name = container_name
+        self.reload_seconds = reload_seconds
+        # league_id -> (loaded_at, {"managers": {guid: team_key}, "teams": {team_key: entry}})
+        self._digests: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _blob_name(self, league_id: str) -> str:
+        return f"{league_id}/digests.json"
+
+    def update_digests(
+        self,
+        league_id: str,
+        sections: Dict[str, Union[SerializedSection, Any]],
+        team_keys_by_manager: Dict[str, str],
+        data_store: Optional[LeagueDataStore] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Regenerate the digest of every team of the league whose input data changed.
+
+        Args:
+            league_id: League identifier
+            sections: Section name -> SerializedSection, as returned by sync_full_league
+            team_keys_by_manager: Manager guid -> team key (see manager_team_keys)
+            data_store: Store to write the digests to (defaults to the configured store)
+
+        Returns:
+            The league's digests, or None if none could be built
+        """
+        standings = _load(sections.get("standings")) or []
+        team_keys = {team.get("team_key") for team in standings} | set(
+            team_keys_by_manager.values()
+        )
+        team_keys.discard(None)
+
+        current = self._get_league_digests(league_id) or {}
+        current_teams = current.get("teams") or {}
+        teams = {}
+        rebuilt = 0
+        for team_key in sorted(team_keys):
+            data_hash = digest_data_hash(sections, team_key)
+            entry = current_teams.get(team_key)
+            if entry is not None and entry.get("data_hash") == data_hash:
+                teams[team_key] = entry
+                continue
+            try:
+                digest = build_league_digest(sections, team_key)
+            except Exception as e:
+                logger.error(f"League {league_id}: failed to build digest of {team_key}: {e}")
+                continue
+            teams[team_key] = {"data_hash": data_hash, "digest": digest}
+            rebuilt += 1
+
+        if not teams:
+            return None
+        # Keep managers seen by earlier syncs; a manager's current team wins
+        managers = {**(current.get("managers") or {}), **team_keys_by_manager}
+        digests = {"managers": managers, "teams": teams}
+        with self._lock:
+            self._digests[league_id] = (time.monotonic(), digests)
+        if rebuilt == 0 and managers == current.get("managers"):
+            logger.info(f"League {league_id}: digests unchanged, skipping")
+            return digests
+
+        try:
+            data_store = data_store or create_league_data_store(self.container_name)
+            data_store.upload_json_with_retries(digests, self._blob_name(league_id))
+        except Exception as e:
+            logger.warning(f"League {league_id}: could not store digests: {e}")
+        logger.info(f"League {league_id}: rebuilt {rebuilt}/{len(teams)} team digests")
+        return digests
+
+    def get_digest(self, league_id: str, user_guid: Optional[str]) -> Optional[str]:
+        """Digest of the user's team in the league, if the user manages one."""
+        if not league_id or not user_guid:
+            return None
+        digests = self._get_league_digests(league_id)
+        if not digests:
+            return None
+        team_key = (digests.get("managers") or {}).get(user_guid)
+        entry = (digests.get("teams") or {}).get(team_key) if team_key else None
+        return entry.get("digest") if entry else None
+
+    def _get_league_digests(self, league_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._digests.get(league_id)
+        if cached is not None and time.monotonic() - cached[0] < self.reload_seconds:
+            return cached[1]
+
+        try:
+            data_store = create_league_data_store(self.container_name)
+            digests = data_store.download_json_data(self._blob_name(league_id))
+        except Exception as e:
+            logger.warning(f"League {league_id}: could not load digests: {e}")
+            digests = None
+        if digests is None and cached is not None:
+            digests = cached[1]
+
+        with self._lock:
+            self._digests[league_id] = (time.monotonic(), digests)
+        return digests
+
+
+_digest_service_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_league_digest_service() -> LeagueDigestService:
+    """
+    Get or create the global league digest service singleton instance.
+    Thread-safe lazy initialization.
+    """
+    global _digest_service_instance
+
+    if _digest_service_instance is None:
+        with _instance_lock:
+            if _digest_service_instance is None:
+                _digest_service_instance = LeagueDigestService()
+
+    return _digest_service_instance
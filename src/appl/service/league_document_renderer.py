@@ -0,0 +1,203 @@
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, List, Union
+
+from ..model.file import SerializedSection
+
+logger = logging.getLogger(__name__)
+
+# Free agents are grouped by base position; composite slots (G, F, Util) would
+# only repeat the same players
+FREE_AGENT_POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+
+SHORT_STAT_NAMES = {
+    "Points": "PTS",
+    "Rebounds": "REB",
+    "Assists": "AST",
+    "Steals": "STL",
+    "Blocks": "BLK",
+    "Turnovers": "TO",
+}
+
+
+def render_league_documents(
+    sections: Dict[str, Union[SerializedSection, Any]]
+) -> Dict[str, SerializedSection]:
+    """
+    Render synced league sections into small, self-contained documents for file_search.
+
+    Rosters become one document per team, matchups one per week and free agents one
+    per position, each with a header naming what it covers and short field names,
+    so a question retrieves a few relevant chunks instead of slices of one large
+    JSON file. Sections without a renderer, or whose shape is unexpected, are
+    passed through unchanged.
+
+    Args:
+        sections: Section name -> SerializedSection (or raw data), as returned by sync_full_league
+
+    Returns:
+        Dict[str, SerializedSection]: Document name -> rendered document
+    """
+    documents: Dict[str, SerializedSection] = {}
+    for section_name, section in sections.items():
+        renderer = _RENDERERS.get(section_name)
+        if renderer is None:
+            documents[section_name] = _as_section(section_name, section)
+            continue
+
+        try:
+            data = (
+                json.loads(section.payload)
+                if isinstance(section, SerializedSection)
+                else section
+            )
+            rendered = renderer(data)
+        except Exception as e:
+            logger.warning(f"Could not render '{section_name}', uploading as JSON: {e}")
+            documents[section_name] = _as_section(section_name, section)
+            continue
+
+        for document_name, text in rendered.items():
+            documents[document_name] = SerializedSection.from_text(document_name, text)
+
+    return documents
+
+
+def _as_section(name: str, section: Union[SerializedSection, Any]) -> SerializedSection:
+    if isinstance(section, SerializedSection):
+        return section
+    return SerializedSection.from_data(name, section)
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(value).lower()).strip("_") or "unknown"
+
+
+def _unique_name(name: str, taken: Dict[str, Any]) -> str:
+    if name not in taken:
+        return name
+    suffix = 2
+    while f"{name}_{suffix}" in taken:
+        suffix += 1
+    return f"{name}_{suffix}"
+
+
+def _short_stat_name(name: str) -> str:
+    # "Field Goal Percentage (FG%)" -> "FG%"
+    match = re.search(r"\(([^)]+)\)\s*$", name)
+    if match:
+        return match.group(1)
+    return SHORT_STAT_NAMES.get(name, name)
+
+
+def _to_number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _render_standings(standings: List[Dict[str, Any]]) -> Dict[str, str]:
+    lines = [
+        "# League standings",
+        "rank | team | W-L-T | win% | GB | playoff seed",
+    ]
+    for team in sorted(standings, key=lambda t: _to_number(t.get("rank"))):
+        totals = team.get("outcome_totals") or {}
+        lines.append(
+            f"{team.get('rank')} | {team.get('name')} | "
+            f"{totals.get('wins')}-{totals.get('losses')}-{totals.get('ties')} | "
+            f"{totals.get('percentage')} | {team.get('games_back')} | "
+            f"{team.get('playoff_seed') or '-'}"
+        )
+    return {"standings": "\n".join(lines) + "\n"}
+
+
+def _render_matchups(weeks: List[List[Dict[str, Any]]]) -> Dict[str, str]:
+    documents = {}
+    for week_matchups in weeks:
+        if not week_matchups:
+            continue
+        week = week_matchups[0].get("week")
+        lines = [f"# Matchups, week {week}"]
+        for matchup in week_matchups:
+            team_1 = matchup.get("team_1") or {}
+            team_2 = matchup.get("team_2") or {}
+            score_1 = _to_number(team_1.get("score"))
+            score_2 = _to_number(team_2.get("score"))
+            if score_1 == score_2:
+                result = "tie"
+            else:
+                winner = team_1 if score_1 > score_2 else team_2
+                result = f"winner {winner.get('team_name')}"
+
+            lines.append("")
+            lines.append(
+                f"## {team_1.get('team_name')} {team_1.get('score')} - "
+                f"{team_2.get('score')} {team_2.get('team_name')} ({result})"
+            )
+            stats_1 = team_1.get("stats") or {}
+            stats_2 = team_2.get("stats") or {}
+            for stat_name in stats_1:
+                lines.append(
+                    f"{_short_stat_name(stat_name)}: "
+                    f"{stats_1.get(stat_name)} vs {stats_2.get(stat_name)}"
+                )
+        documents[f"matchups_week_{week}"] = "\n".join(lines) + "\n"
+    return documents
+
+
+def _render_team_rosters(rosters: Dict[str, List[Dict[str, Any]]]) -> Dict[str, str]:
+    documents = {}
+    for team_name, players in rosters.items():
+        lines = [
+            f"# Roster: {team_name}",
+            "player | slot | eligible | status",
+        ]
+        for player in players:
+            lines.append(
+                f"{player.get('name')} | {player.get('selected_position')} | "
+                f"{','.join(player.get('eligible_positions') or [])} | "
+                f"{player.get('status') or 'OK'}"
+            )
+        name = _unique_name(f"roster_{_slug(team_name)}", documents)
+        documents[name] = "\n".join(lines) + "\n"
+    return documents
+
+
+def _render_free_agents(free_agents: List[Dict[str, Any]]) -> Dict[str, str]:
+    by_position: Dict[str, List[Dict[str, Any]]] = {
+        position: [] for position in FREE_AGENT_POSITIONS
+    }
+    for player in free_agents:
+        for position in player.get("eligible_positions") or []:
+            if position in by_position:
+                by_position[position].append(player)
+
+    documents = {}
+    for position, players in by_position.items():
+        if not players:
+            continue
+        lines = [
+            f"# Free agents: {position}",
+            "player | own% | eligible | status",
+        ]
+        for player in sorted(
+            players, key=lambda p: _to_number(p.get("percent_owned")), reverse=True
+        ):
+            lines.append(
+                f"{player.get('name')} | {player.get('percent_owned')} | "
+                f"{','.join(player.get('eligible_positions') or [])} | "
+                f"{player.get('status') or 'OK'}"
+            )
+        documents[f"free_agents_{position.lower()}"] = "\n".join(lines) + "\n"
+    return documents
+
+
+_RENDERERS: Dict[str, Callable[[Any], Dict[str, str]]] = {
+    "standings": _render_standings,
+    "matchups": _render_matchups,
+    "team_rosters": _render_team_rosters,
+    "free_agents": _render_free_agents,
+}
@@ -0,0 +1,270 @@
+import difflib
+import json
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ..model.file import SerializedSection
+
+# Tool category codes -> stat names used in player_stats
+CATEGORY_STAT_NAMES = {
+    "PTS": "Points",
+    "REB": "Rebounds",
+    "AST": "Assists",
+    "STL": "Steals",
+    "BLK": "Blocks",
+    "TOV": "Turnovers",
+    "FG_PCT": "Field Goal Percentage",
+    "FT_PCT": "Free Throw Percentage",
+    "FG3M": "3PT Made",
+}
+# Categories where a lower value is better
+ASCENDING_CATEGORIES = {"TOV"}
+
+STAT_PERIODS = ["season", "last_season", "last_30_days", "last_14_days", "last_7_days"]
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase and strip accents and punctuation so 'Dončić' matches 'doncic'."""
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join("".join(c if c.isalnum() else " " for c in stripped.lower()).split())
+
+
+class LeagueQueryIndex:
+    """
+    Lookup tables over one league's synced sections, built once so the chat
+    function tools answer with dictionary lookups instead of file search.
+    """
+
+    def __init__(
+        self,
+        standings: List[Dict[str, Any]],
+        matchups: List[List[Dict[str, Any]]],
+        team_rosters: Dict[str, List[Dict[str, Any]]],
+        free_agents: List[Dict[str, Any]],
+        player_stats: Dict[str, Dict[str, Any]],
+    ):
+        self.standings = sorted(standings, key=lambda team: _to_number(team.get("rank")))
+        self.matchups_by_week: Dict[int, List[Dict[str, Any]]] = {}
+        for week_matchups in matchups:
+            for matchup in week_matchups:
+                week = int(_to_number(matchup.get("week")))
+                self.matchups_by_week.setdefault(week, []).append(matchup)
+
+        self.rosters_by_team = {
+            normalize_name(team_name): (team_name, players)
+            for team_name, players in team_rosters.items()
+        }
+        self.player_stats = {
+            normalize_name(player_name): (player_name, stats)
+            for player_name, stats in player_stats.items()
+        }
+
+        self.free_agents_by_position: Dict[str, List[Dict[str, Any]]] = {}
+        for player in free_agents:
+            for position in player.get("eligible_positions") or []:
+                self.free_agents_by_position.setdefault(position, []).append(player)
+        self.free_agents = free_agents
+
+        self.rostered_players = [
+            (team_name, player)
+            for team_name, players in team_rosters.items()
+            for player in players
+        ]
+
+    @classmethod
+    def from_sections(
+        cls,
+        sections: Dict[str, Union[SerializedSection, Any]],
+        player_stats: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> "LeagueQueryIndex":
+        """
+        Args:
+            sections: Section name -> SerializedSection (or raw data), as returned by sync_full_league
+            player_stats: NBA stats by player and period (see get_nba_player_stats)
+        """
+
+        def load(name: str, default: Any) -> Any:
+            section = sections.get(name)
+            if section is None:
+                return default
+            if isinstance(section, SerializedSection):
+                return json.loads(section.payload)
+            return section
+
+        return cls(
+            standings=load("standings", []),
+            matchups=load("matchups", []),
+            team_rosters=load("team_rosters", {}),
+            free_agents=load("free_agents", []),
+            player_stats=player_stats or {},
+        )
+
+    def get_standings(self) -> Dict[str, Any]:
+        return {
+            "standings": [
+                {
+                    "rank": team.get("rank"),
+                    "team": team.get("name"),
+                    "wins": (team.get("outcome_totals") or {}).get("wins"),
+                    "losses": (team.get("outcome_totals") or {}).get("losses"),
+                    "ties": (team.get("outcome_totals") or {}).get("ties"),
+                    "pct": (team.get("outcome_totals") or {}).get("percentage"),
+                    "games_back": team.get("games_back"),
+                    "playoff_seed": team.get("playoff_seed"),
+                }
+                for team in self.standings
+            ]
+        }
+
+    def get_matchups(self, week: int, team_name: Optional[str] = None) -> Dict[str, Any]:
+        matchups = self.matchups_by_week.get(int(week))
+        if matchups is None:
+            return {
+                "error": f"No matchups for week {week}",
+                "weeks": sorted(self.matchups_by_week),
+            }
+
+        if team_name:
+            team = self._match_team(team_name)
+            if team is None:
+                return {"error": f"Unknown team '{team_name}'", "teams": self._team_names()}
+            matchups = [
+                matchup
+                for matchup in matchups
+                if team
+                in (
+                    (matchup.get("team_1") or {}).get("team_name"),
+                    (matchup.get("team_2") or {}).get("team_name"),
+                )
+            ]
+
+        return {
+            "week": int(week),
+            "matchups": [
+                {
+                    "team_1": _matchup_side(matchup.get("team_1") or {}),
+                    "team_2": _matchup_side(matchup.get("team_2") or {}),
+                }
+                for matchup in matchups
+            ],
+        }
+
+    def get_team_roster(self, team_name: str) -> Dict[str, Any]:
+        # Match against the rosters only: standings may list teams without a roster
+        key = self._match_key(team_name, self.rosters_by_team)
+        if key is None:
+            return {"error": f"Unknown team '{team_name}'", "teams": self._team_names()}
+        name, players = self.rosters_by_team[key]
+        return {
+            "team": name,
+            "players": [
+                {
+                    "name": player.get("name"),
+                    "slot": player.get("selected_position"),
+                    "eligible": player.get("eligible_positions"),
+                    "status": player.get("status") or None,
+                }
+                for player in players
+            ],
+        }
+
+    def get_player_stats(self, player_name: str, period: str = "season") -> Dict[str, Any]:
+        key = self._match_key(player_name, self.player_stats)
+        if key is None:
+            return {"error": f"No stats for player '{player_name}'"}
+        name, stats = self.player_stats[key]
+        return {"player": name, "period": period, "stats": (stats or {}).get(period)}
+
+    def get_free_agents(
+        self, position: str = "any", category: str = "percent_owned", limit: int = 10
+    ) -> Dict[str, Any]:
+        players = (
+            self.free_agents
+            if position == "any"
+            else self.free_agents_by_position.get(position, [])
+        )
+        ranked = self._rank(players, category)
+        return {
+            "position": position,
+            "category": category,
+            "players": [
+                {
+                    "name": player.get("name"),
+                    "eligible": player.get("eligible_positions"),
+                    "percent_owned": player.get("percent_owned"),
+                    "status": player.get("status") or None,
+                    "value": value,
+                }
+                for value, player in ranked[: max(1, int(limit))]
+            ],
+        }
+
+    def get_league_leaders(self, category: str, limit: int = 10) -> Dict[str, Any]:
+        """Rostered players ranked by a stat category (season stats)."""
+        ranked = self._rank(self.rostered_players, category, player=lambda item: item[1])
+        return {
+            "category": category,
+            "leaders": [
+                {"name": player.get("name"), "team": team_name, "value": value}
+                for value, (team_name, player) in ranked[: max(1, int(limit))]
+            ],
+        }
+
+    def _rank(
+        self,
+        items: List[Any],
+        category: str,
+        player: Callable[[Any], Dict[str, Any]] = lambda item: item,
+    ) -> List[Tuple[Any, Any]]:
+        """(value, item) pairs sorted best first; items without the stat are left out."""
+        if category == "percent_owned":
+            values = [(_to_number(player(i).get("percent_owned")), i) for i in items]
+            return sorted(values, key=lambda pair: pair[0], reverse=True)
+
+        stat_name = CATEGORY_STAT_NAMES.get(category)
+        if stat_name is None:
+            return []
+        values = []
+        for item in items:
+            entry = self.player_stats.get(normalize_name(player(item).get("name", "")))
+            season = ((entry[1] or {}).get("season") or {}) if entry else {}
+            if season.get(stat_name) is not None:
+                values.append((season[stat_name], item))
+        return sorted(
+            values,
+            key=lambda pair: _to_number(pair[0]),
+            reverse=category not in ASCENDING_CATEGORIES,
+        )
+
+    def _team_names(self) -> List[str]:
+        return [name for name, _ in self.rosters_by_team.values()] or [
+            team.get("name") for team in self.standings
+        ]
+
+    def _match_team(self, team_name: str) -> Optional[str]:
+        names = {normalize_name(name): name for name in self._team_names()}
+        key = self._match_key(team_name, names)
+        return names[key] if key is not None else None
+
+    def _match_key(self, name: str, table: Dict[str, Any]) -> Optional[str]:
+        key = normalize_name(name)
+        if key in table:
+            return key
+        close = difflib.get_close_matches(key, table.keys(), n=1, cutoff=0.75)
+        return close[0] if close else None
+
+
+def _matchup_side(team: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "team": team.get("team_name"),
+        "score": team.get("score"),
+        "stats": team.get("stats"),
+    }
+
+
+def _to_number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,187 @@
+import hashlib
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..model.file import SerializedSection
+
+_TOKEN_PATTERN = re.compile(r"[\w%]+")
+
+# Long documents are split so a passage stays small enough to paste into a prompt
+MAX_PASSAGE_CHARS = 1200
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def league_data_version(documents: Dict[str, SerializedSection]) -> str:
+    """Hash of the content hashes of all league documents; changes with any of them."""
+    digest = hashlib.sha256()
+    for name in sorted(documents):
+        digest.update(f"{name}:{documents[name].content_sha256}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LeagueSearchIndex:
+    """
+    In-process BM25 index over the passages of one league's synced data.
+    The inverted index (term -> [(passage, term frequency)]) is plain JSON so it can
+    be stored next to the league blobs and loaded without re-tokenizing.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        passages: List[str],
+        postings: Dict[str, List[Tuple[int, int]]],
+        lengths: List[int],
+        k1: float = 1.5,
+        b: float = 0.75,
+        data_version: Optional[str] = None,
+    ):
+        self.passages = passages
+        self.postings = postings
+        self.lengths = lengths
+        self.k1 = k1
+        self.b = b
+        # Version of the documents the index was built from (see league_data_version)
+        self.data_version = data_version
+        self.average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    @classmethod
+    def from_documents(cls, documents: Dict[str, SerializedSection]) -> "LeagueSearchIndex":
+        """
+        Build an index from rendered league documents (see render_league_documents).
+        Text documents are split on their '## ' blocks or table rows; JSON sections
+        on their top-level entries.
+        """
+        passages = []
+        for name, document in documents.items():
+            if document.extension == "json":
+                passages.extend(_json_passages(name, json.loads(document.payload)))
+            else:
+                passages.extend(_text_passages(document.payload.decode("utf-8")))
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        for passage_id, passage in enumerate(passages):
+            tokens = tokenize(passage)
+            lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                postings.setdefault(term, []).append((passage_id, frequency))
+
+        return cls(passages, postings, lengths, data_version=league_data_version(documents))
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[float, str]]:
+        """
+        Rank passages against the query with BM25.
+
+        Returns:
+            List of (score, passage), best first
+        """
+        passage_count = len(self.passages)
+        if passage_count == 0:
+            return []
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+            document_frequency = len(term_postings)
+            idf = math.log(
+                1 + (passage_count - document_frequency + 0.5) / (document_frequency + 0.5)
+            )
+            for passage_id, frequency in term_postings:
+                length_norm = 1 - self.b + self.b * (
+                    self.lengths[passage_id] / self.average_length
+                )
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                )
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(score, self.passages[passage_id]) for passage_id, score in best]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "data_version": self.data_version,
+            "passages": self.passages,
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LeagueSearchIndex":
+        if data.get("version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported search index version: {data.get('version')}")
+        return cls(
+            passages=data["passages"],
+            postings={
+                term: [tuple(posting) for posting in term_postings]
+                for term, term_postings in data["postings"].items()
+            },
+            lengths=data["lengths"],
+            k1=data["k1"],
+            b=data["b"],
+            data_version=data.get("data_version"),
+        )
+
+
+def _split(title: str, lines: List[str]) -> Iterable[str]:
+    """Group lines under the title into passages of at most MAX_PASSAGE_CHARS."""
+    current: List[str] = []
+    size = len(title)
+    for line in lines:
+        if current and size + len(line) + 1 > MAX_PASSAGE_CHARS:
+            yield "\n".join([title] + current)
+            current, size = [], len(title)
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        yield "\n".join([title] + current)
+
+
+def _text_passages(text: str) -> Iterable[str]:
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return
+    title, body = lines[0], lines[1:]
+    # Table documents repeat their column header in every passage
+    if body and " | " in body[0] and not body[0].startswith("## "):
+        title = f"{title}\n{body[0]}"
+        body = body[1:]
+
+    block: List[str] = []
+    for line in body:
+        if line.startswith("## ") and block:
+            yield from _split(title, block)
+            block = []
+        block.append(line)
+    if block:
+        yield from _split(title, block)
+
+
+def _json_passages(name: str, data: Any) -> Iterable[str]:
+    if isinstance(data, dict):
+        entries = data.items()
+    elif isinstance(data, list):
+        entries = enumerate(data)
+    else:
+        entries = [(name, data)]
+
+    for key, value in entries:
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        chunks = [
+            text[offset : offset + MAX_PASSAGE_CHARS]
+            for offset in range(0, len(text), MAX_PASSAGE_CHARS)
+        ]
+        yield from _split(f"# {name}: {key}", chunks)
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .league_search_index import LeagueSearchIndex
+from ..model.file import SerializedSection
+from ..repository.storage.league_data_store import LeagueDataStore
+from ..repository.storage.store_factory import create_league_data_store
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_BLOB_NAME = "search_index.json"
+
+
+class LeagueSearchService:
+    """
+    Builds each league's BM25 index at sync time, stores it next to the league
+    blobs and answers local retrieval queries for chat.
+    Loaded indexes are kept in memory and re-read after reload_seconds, so an
+    index rebuilt by another worker is picked up.
+    """
+
+    def __init__(self, container_name: str = "fantasy1", reload_seconds: float = 300):
+        self.container_name = container_name
+        self.reload_seconds = reload_seconds
+        # league_id -> (loaded_at, index)
+        self._indexes: Dict[str, Tuple[float, Optional[LeagueSearchIndex]]] = {}
+        self._lock = threading.Lock()
+
+    def index_league(
+        self,
+        league_id: str,
+        documents: Dict[str, SerializedSection],
+        data_store: Optional[LeagueDataStore] = None,
+    ) -> Optional[LeagueSearchIndex]:
+        """
+        Build and store the search index for a league.
+
+        Args:
+            league_id: League identifier
+            documents: Rendered league documents (see render_league_documents)
+            data_store: Store to write the index to (defaults to the configured store)
+
+        Returns:
+            The new index, or None if it could not be built
+        """
+        try:
+            index = LeagueSearchIndex.from_documents(documents)
+        except Exception as e:
+            logger.error(f"League {league_id}: failed to build search index: {e}")
+            return None
+
+        with self._lock:
+            self._indexes[league_id] = (time.monotonic(), index)
+
+        try:
+            data_store = data_store or create_league_data_store(self.container_name)
+            data_store.upload_json_with_retries(
+                index.to_dict(), f"{league_id}/{SEARCH_INDEX_BLOB_NAME}"
+            )
+        except Exception as e:
+            logger.warning(f"League {league_id}: could not store search index: {e}")
+
+        logger.info(
+            f"League {league_id}: indexed {len(index.passages)} passages, "
+            f"{len(index.postings)} terms"
+        )
+        return index
+
+    def get_index(self, league_id: str) -> Optional[LeagueSearchIndex]:
+        with self._lock:
+            cached = self._indexes.get(league_id)
+        if cached is not None and time.monotonic() - cached[0] < self.reload_seconds:
+            return cached[1]
+
+        try:
+            data_store = create_league_data_store(self.container_name)
+            data = data_store.download_json_data(f"{league_id}/{SEARCH_INDEX_BLOB_NAME}")
+            index = LeagueSearchIndex.from_dict(data) if data else None
+        except Exception as e:
+            logger.warning(f"League {league_id}: could not load search index: {e}")
+            index = None
+
+        if index is None and cached is not None:
+            # Keep serving the previous index if a reload fails
+            index = cached[1]
+
+        # Missing indexes are cached too, so leagues that were never synced
+        # don't hit the store on every chat turn
+        with self._lock:
+            self._indexes[league_id] = (time.monotonic(), index)
+        return index
+
+    def retrieve(self, league_id: str, query: str, top_k: int = 5) -> List[str]:
+        """
+        Top passages of the league data for the query, best first.
+        Empty if the league has no index yet.
+        """
+        index = self.get_index(league_id)
+        if index is None:
+            return []
+        return [passage for _, passage in index.search(query, top_k=top_k)]
+
+    def get_data_version(self, league_id: str) -> Optional[str]:
+        """Content version of the league data behind the current index, if known."""
+        index = self.get_index(league_id)
+        return index.data_version if index is not None else None
+
+
+_search_service_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_league_search_service() -> LeagueSearchService:
+    """
+    Get or create the global league search service singleton instance.
+    Thread-safe lazy initialization.
+    """
+    global _search_service_instance
+
+    if _search_service_instance is None:
+        with _instance_lock:
+            if _search_service_instance is None:
+                _search_service_instance = LeagueSearchService()
+
+    return _search_service_instance
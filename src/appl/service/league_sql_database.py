@@ -0,0 +1,459 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..model.file import SerializedSection
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_PLAYER_STATS_PATH = DATA_DIR / "player_reports" / "player_stats_2025-26.json"
+DEFAULT_SCHEDULE_PATH = DATA_DIR / "schedule" / "NBA_schedule.json"
+
+# Shared in-memory database with the league-independent NBA tables, attached as "nba"
+# to every league database so it is loaded once per process
+NBA_DATABASE_URI = "file:nba_shared?mode=memory&cache=shared"
+
+MAX_ROWS = 200
+MAX_QUERY_SECONDS = 2.0
+# A single function call can allocate a huge value before the time limit is
+# checked (e.g. randomblob(1e9)), so values and statements are capped in size
+MAX_VALUE_BYTES = 1_000_000
+MAX_SQL_BYTES = 20_000
+
+LEAGUE_SCHEMA = """
+CREATE TABLE standings (
+    team_key TEXT, team TEXT, rank INTEGER, playoff_seed INTEGER,
+    wins INTEGER, losses INTEGER, ties INTEGER, win_pct REAL, games_back REAL
+);
+CREATE TABLE matchups (
+    week INTEGER, team TEXT, team_key TEXT, opponent TEXT, score REAL, opponent_score REAL,
+    fgm INTEGER, fga INTEGER, fg_pct REAL, ftm INTEGER, fta INTEGER, ft_pct REAL,
+    fg3m REAL, pts REAL, reb REAL, ast REAL, stl REAL, blk REAL, tov REAL
+);
+CREATE INDEX matchups_week ON matchups (week);
+CREATE INDEX matchups_team ON matchups (team);
+CREATE TABLE rosters (
+    team TEXT, player_id INTEGER, player TEXT, slot TEXT, eligible_positions TEXT, status TEXT
+);
+CREATE INDEX rosters_team ON rosters (team);
+CREATE INDEX rosters_player ON rosters (player);
+CREATE TABLE free_agents (
+    player_id INTEGER, player TEXT, eligible_positions TEXT, percent_owned REAL, status TEXT
+);
+CREATE INDEX free_agents_player ON free_agents (player);
+"""
+
+NBA_SCHEMA = """
+CREATE TABLE player_stats (
+    player TEXT, period TEXT, games_played REAL, minutes REAL,
+    fgm REAL, fga REAL, fg_pct REAL, ftm REAL, fta REAL, ft_pct REAL,
+    fg3m REAL, pts REAL, reb REAL, ast REAL, stl REAL, blk REAL, tov REAL
+);
+CREATE INDEX player_stats_player ON player_stats (player, period);
+CREATE TABLE box_scores (
+    game_id TEXT, game_date TEXT, player TEXT, team TEXT, opponent TEXT, minutes REAL,
+    fgm INTEGER, fga INTEGER, fg_pct REAL, fg3m INTEGER, fg3a INTEGER, ftm INTEGER,
+    fta INTEGER, ft_pct REAL, oreb INTEGER, dreb INTEGER, reb INTEGER, ast INTEGER,
+    stl INTEGER, blk INTEGER, tov INTEGER, pts INTEGER
+);
+CREATE INDEX box_scores_player ON box_scores (player, game_date);
+CREATE INDEX box_scores_date ON box_scores (game_date);
+CREATE TABLE schedule (game_date TEXT, game_id TEXT, home_team TEXT, away_team TEXT);
+CREATE INDEX schedule_date ON schedule (game_date);
+"""
+
+# Described to the model in the run_sql tool
+SQL_SCHEMA_DESCRIPTION = (
+    "SQLite, read-only. League tables: "
+    "standings(team_key, team, rank, playoff_seed, wins, losses, ties, win_pct, games_back); "
+    "matchups(week, team, team_key, opponent, score, opponent_score, fgm, fga, fg_pct, "
+    "ftm, fta, ft_pct, fg3m, pts, reb, ast, stl, blk, tov) - one row per team per week; "
+    "rosters(team, player_id, player, slot, eligible_positions, status); "
+    "free_agents(player_id, player, eligible_positions, percent_owned, status). "
+    "NBA tables: nba.player_stats(player, period, games_played, minutes, fgm, fga, fg_pct, "
+    "ftm, fta, ft_pct, fg3m, pts, reb, ast, stl, blk, tov) with period in season, "
+    "last_season, last_30_days, last_14_days, last_7_days (per-game values); "
+    "nba.box_scores(game_id, game_date, player, team, opponent, minutes, fgm, fga, fg_pct, "
+    "fg3m, fg3a, ftm, fta, ft_pct, oreb, dreb, reb, ast, stl, blk, tov, pts); "
+    "nba.schedule(game_date, game_id, home_team, away_team). "
+    "eligible_positions is comma separated. Dates are YYYY-MM-DD."
+)
+
+MATCHUP_STAT_COLUMNS = {
+    "Field Goal Percentage (FG%)": "fg_pct",
+    "Free Throw Percentage (FT%)": "ft_pct",
+    "3-Point Field Goals Made (3PTM)": "fg3m",
+    "Points": "pts",
+    "Rebounds": "reb",
+    "Assists": "ast",
+    "Steals": "stl",
+    "Blocks": "blk",
+    "Turnovers": "tov",
+}
+
+PLAYER_STAT_COLUMNS = {
+    "Games Played": "games_played",
+    "Minutes": "minutes",
+    "Field Goals Made": "fgm",
+    "Field Goals Attempted": "fga",
+    "Field Goal Percentage": "fg_pct",
+    "Free Throws Made": "ftm",
+    "Free Throws Attempted": "fta",
+    "Free Throw Percentage": "ft_pct",
+    "3PT Made": "fg3m",
+    "Points": "pts",
+    "Rebounds": "reb",
+    "Assists": "ast",
+    "Steals": "stl",
+    "Blocks": "blk",
+    "Turnovers": "tov",
+}
+
+BOX_SCORE_COLUMNS = {
+    "game_id": "game_id",
+    "game_date": "game_date",
+    "player_name": "player",
+    "team": "team",
+    "opponent": "opponent",
+    "MIN": "minutes",
+    "FGM": "fgm",
+    "FGA": "fga",
+    "FG_PCT": "fg_pct",
+    "FG3M": "fg3m",
+    "FG3A": "fg3a",
+    "FTM": "ftm",
+    "FTA": "fta",
+    "FT_PCT": "ft_pct",
+    "OREB": "oreb",
+    "DREB": "dreb",
+    "REB": "reb",
+    "AST": "ast",
+    "STL": "stl",
+    "BLK": "blk",
+    "TO": "tov",
+    "PTS": "pts",
+}
+
+# Statements a read-only query may run: reading tables and calling functions
+_ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    getattr(sqlite3, "SQLITE_RECURSIVE", 33),
+}
+# Functions that only allocate blobs; of no use to league queries
+_DENIED_FUNCTIONS = {"randomblob", "zeroblob"}
+
+
+class LeagueSqlDatabase:
+    """
+    In-memory SQLite database with one league's synced sections as typed, indexed
+    tables, plus the shared NBA tables attached as "nba".
+    Queries run read-only with a row cap and a time limit.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_sections(
+        cls, sections: Dict[str, Union[SerializedSection, Any]]
+    ) -> "LeagueSqlDatabase":
+        def load(name: str, default: Any) -> Any:
+            section = sections.get(name)
+            if section is None:
+                return default
+            if isinstance(section, SerializedSection):
+                return json.loads(section.payload)
+            return section
+
+        # uri=True so the shared NBA database can be attached by URI
+        connection = sqlite3.connect(":memory:", uri=True, check_same_thread=False)
+        connection.executescript(LEAGUE_SCHEMA)
+        _insert(connection, "standings", _standings_rows(load("standings", [])))
+        _insert(connection, "matchups", _matchup_rows(load("matchups", [])))
+        _insert(connection, "rosters", _roster_rows(load("team_rosters", {})))
+        _insert(connection, "free_agents", _free_agent_rows(load("free_agents", [])))
+        connection.commit()
+
+        _ensure_nba_database()
+        connection.execute("ATTACH DATABASE ? AS nba", (NBA_DATABASE_URI,))
+        connection.execute("PRAGMA query_only = ON")
+        connection.set_authorizer(_read_only_authorizer)
+        # Connection.setlimit needs Python 3.11+
+        if hasattr(connection, "setlimit"):
+            connection.setlimit(sqlite3.SQLITE_LIMIT_LENGTH, MAX_VALUE_BYTES)
+            connection.setlimit(sqlite3.SQLITE_LIMIT_SQL_LENGTH, MAX_SQL_BYTES)
+        return cls(connection)
+
+    def run_query(
+        self,
+        sql: str,
+        max_rows: int = MAX_ROWS,
+        max_seconds: float = MAX_QUERY_SECONDS,
+    ) -> Dict[str, Any]:
+        """
+        Run one read-only statement.
+
+        Returns:
+            {"columns": [...], "rows": [[...]], "truncated": bool}
+
+        Raises:
+            sqlite3.Error: Invalid SQL, a write attempt, or the time limit was hit
+        """
+        deadline = time.monotonic() + max_seconds
+
+        def check_deadline() -> int:
+            # A non-zero return aborts the running statement
+            return 1 if time.monotonic() > deadline else 0
+
+        with self._lock:
+            self._connection.set_progress_handler(check_deadline, 10000)
+            try:
+                cursor = self._connection.execute(sql)
+                rows = cursor.fetchmany(max_rows + 1)
+                columns = [column[0] for column in cursor.description or []]
+                cursor.close()
+            finally:
+                self._connection.set_progress_handler(None, 0)
+
+        return {
+            "columns": columns,
+            "rows": [list(row) for row in rows[:max_rows]],
+            "truncated": len(rows) > max_rows,
+        }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _read_only_authorizer(action: int, arg1, arg2, db_name, trigger) -> int:
+    if action == sqlite3.SQLITE_FUNCTION and str(arg2).lower() in _DENIED_FUNCTIONS:
+        return sqlite3.SQLITE_DENY
+    return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+_nba_connection: Optional[sqlite3.Connection] = None
+_nba_lock = threading.Lock()
+
+
+def _ensure_nba_database():
+    """
+    Load the NBA tables into the shared in-memory database once per process.
+    The holder connection stays open, otherwise SQLite drops the database.
+    """
+    global _nba_connection
+
+    if _nba_connection is not None:
+        return
+    with _nba_lock:
+        if _nba_connection is not None:
+            return
+        connection = sqlite3.connect(
+            NBA_DATABASE_URI, uri=True, check_same_thread=False
+        )
+        connection.executescript(NBA_SCHEMA)
+
+        player_stats = get_nba_player_stats()
+        if player_stats:
+            _insert(connection, "player_stats", _player_stat_rows(player_stats))
+
+        box_scores_path = os.environ.get("BOX_SCORES_PATH")
+        box_scores = _read_json_file(box_scores_path) if box_scores_path else None
+        if box_scores:
+            _insert(connection, "box_scores", _box_score_rows(box_scores))
+
+        schedule = _read_json_file(
+            os.environ.get("SCHEDULE_PATH", DEFAULT_SCHEDULE_PATH)
+        )
+        if schedule:
+            _insert(connection, "schedule", _schedule_rows(schedule))
+
+        connection.commit()
+        _nba_connection = connection
+
+
+_nba_player_stats: Optional[Dict[str, Dict[str, Any]]] = None
+_player_stats_lock = threading.Lock()
+
+
+def get_nba_player_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    NBA stats by player and period from the general player stats file
+    (PLAYER_STATS_PATH), read once per process. Empty if the file is missing.
+    """
+    global _nba_player_stats
+
+    if _nba_player_stats is None:
+        with _player_stats_lock:
+            if _nba_player_stats is None:
+                _nba_player_stats = (
+                    _read_json_file(
+                        os.environ.get("PLAYER_STATS_PATH", DEFAULT_PLAYER_STATS_PATH)
+                    )
+                    or {}
+                )
+    return _nba_player_stats
+
+
+def _read_json_file(path) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.info(f"SQL data file not found, skipping: {path}")
+    except Exception as e:
+        logger.warning(f"Could not load SQL data file {path}: {e}")
+    return None
+
+
+def _insert(connection: sqlite3.Connection, table: str, rows: Iterable[Sequence]):
+    rows = list(rows)
+    if not rows:
+        return
+    placeholders = ", ".join("?" * len(rows[0]))
+    connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _integer(value: Any) -> Optional[int]:
+    number = _number(value)
+    return int(number) if number is not None else None
+
+
+def _made_attempted(value: Any) -> Tuple[Optional[int], Optional[int]]:
+    # "412/880" -> (412, 880)
+    made, _, attempted = str(value or "").partition("/")
+    return _integer(made), _integer(attempted)
+
+
+def _minutes(value: Any) -> Optional[float]:
+    # "33:09" -> 33.15
+    if isinstance(value, str) and ":" in value:
+        minutes, _, seconds = value.partition(":")
+        return round((_number(minutes) or 0) + (_number(seconds) or 0) / 60, 2)
+    return _number(value)
+
+
+def _standings_rows(standings: List[Dict[str, Any]]) -> Iterable[Tuple]:
+    for team in standings:
+        totals = team.get("outcome_totals") or {}
+        yield (
+            team.get("team_key"),
+            team.get("name"),
+            _integer(team.get("rank")),
+            _integer(team.get("playoff_seed")),
+            _integer(totals.get("wins")),
+            _integer(totals.get("losses")),
+            _integer(totals.get("ties")),
+            _number(totals.get("percentage")),
+            _number(team.get("games_back")),
+        )
+
+
+def _matchup_rows(weeks: List[List[Dict[str, Any]]]) -> Iterable[Tuple]:
+    for week_matchups in weeks:
+        for matchup in week_matchups:
+            sides = [matchup.get("team_1") or {}, matchup.get("team_2") or {}]
+            for team, opponent in (sides, sides[::-1]):
+                stats = team.get("stats") or {}
+                columns = {
+                    MATCHUP_STAT_COLUMNS[name]: _number(value)
+                    for name, value in stats.items()
+                    if name in MATCHUP_STAT_COLUMNS
+                }
+                fgm, fga = _made_attempted(
+                    stats.get("Field Goals Made/Attempted (FGM/FGA)")
+                )
+                ftm, fta = _made_attempted(
+                    stats.get("Free Throws Made/Attempted (FTM/FTA)")
+                )
+                yield (
+                    _integer(matchup.get("week")),
+                    team.get("team_name"),
+                    team.get("team_key"),
+                    opponent.get("team_name"),
+                    _number(team.get("score")),
+                    _number(opponent.get("score")),
+                    fgm,
+                    fga,
+                    columns.get("fg_pct"),
+                    ftm,
+                    fta,
+                    columns.get("ft_pct"),
+                    *(
+                        columns.get(column)
+                        for column in ("fg3m", "pts", "reb", "ast", "stl", "blk", "tov")
+                    ),
+                )
+
+
+def _roster_rows(rosters: Dict[str, List[Dict[str, Any]]]) -> Iterable[Tuple]:
+    for team_name, players in rosters.items():
+        for player in players:
+            yield (
+                team_name,
+                _integer(player.get("player_id")),
+                player.get("name"),
+                player.get("selected_position"),
+                ",".join(player.get("eligible_positions") or []),
+                player.get("status") or None,
+            )
+
+
+def _free_agent_rows(free_agents: List[Dict[str, Any]]) -> Iterable[Tuple]:
+    for player in free_agents:
+        yield (
+            _integer(player.get("player_id")),
+            player.get("name"),
+            ",".join(player.get("eligible_positions") or []),
+            _number(player.get("percent_owned")),
+            player.get("status") or None,
+        )
+
+
+def _player_stat_rows(player_stats: Dict[str, Dict[str, Any]]) -> Iterable[Tuple]:
+    for player_name, periods in player_stats.items():
+        for period, stats in (periods or {}).items():
+            if not stats:
+                continue
+            values = dict(stats)
+            values.setdefault("Minutes", stats.get("Average Minutes"))
+            yield (
+                player_name,
+                period,
+                *(_number(values.get(name)) for name in PLAYER_STAT_COLUMNS),
+            )
+
+
+def _box_score_rows(box_scores: List[Dict[str, Any]]) -> Iterable[Tuple]:
+    for row in box_scores:
+        yield tuple(
+            _minutes(row.get(key)) if column == "minutes" else row.get(key)
+            for key, column in BOX_SCORE_COLUMNS.items()
+        )
+
+
+def _schedule_rows(schedule: Dict[str, List[Dict[str, Any]]]) -> Iterable[Tuple]:
+    for game_date, games in schedule.items():
+        for game in games:
+            yield (
+                game_date,
+                game.get("game_id"),
+                game.get("home_team"),
+                game.get("away_team"),
+            )
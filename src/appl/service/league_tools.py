@@ -0,0 +1,357 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .league_query_index import CATEGORY_STAT_NAMES, STAT_PERIODS, LeagueQueryIndex
+from .league_sql_database import (
+    MAX_QUERY_SECONDS,
+    MAX_ROWS,
+    SQL_SCHEMA_DESCRIPTION,
+    LeagueSqlDatabase,
+    get_nba_player_stats,
+)
+from ..model.file import SerializedSection
+from ..repository.storage.league_data_store import LeagueDataStore
+from ..repository.storage.store_factory import create_league_data_store
+
+logger = logging.getLogger(__name__)
+
+POSITIONS = ["any", "PG", "SG", "G", "SF", "PF", "F", "C"]
+CATEGORIES = list(CATEGORY_STAT_NAMES)
+
+# Section name -> blob name written by sync_full_league
+SECTION_BLOB_NAMES = {
+    "standings": "standings.json",
+    "matchups": "matchups.json",
+    "team_rosters": "team_roster.json",
+    "free_agents": "free_agents.json",
+}
+# Written next to the league blobs at sync time, so a reload can tell whether
+# the sections changed without downloading them
+TOOL_DATA_VERSION_BLOB_NAME = "tool_data_version.json"
+
+
+def tool_data_version(sections: Dict[str, Union[SerializedSection, Any]]) -> str:
+    """Hash of the content hashes of the sections the tools are built from."""
+    digest = hashlib.sha256()
+    for name in sorted(SECTION_BLOB_NAMES):
+        section = sections.get(name)
+        if section is None:
+            continue
+        if not isinstance(section, SerializedSection):
+            # Same compact JSON as the uploaded blob, so the hash matches the sync's
+            section = SerializedSection.from_data(name, section)
+        digest.update(f"{name}:{section.content_sha256}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _function_tool(
+    name: str, description: str, properties: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "type": "function",
+        "name": name,
+        "description": description,
+        "parameters": {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False,
+        },
+        "strict": True,
+    }
+
+
+LEAGUE_FUNCTION_TOOLS = [
+    _function_tool(
+        "get_standings",
+        "Current league standings: rank, record, win percentage, games back, playoff seed.",
+        {},
+    ),
+    _function_tool(
+        "get_matchups",
+        "Matchup scores and category stats for a week, optionally only one team's matchup.",
+        {
+            "week": {"type": "integer", "description": "Fantasy week number"},
+            "team_name": {
+                "type": ["string", "null"],
+                "description": "Fantasy team name, or null for all matchups",
+            },
+        },
+    ),
+    _function_tool(
+        "get_team_roster",
+        "Current roster of a fantasy team with lineup slots and injury status.",
+        {"team_name": {"type": "string", "description": "Fantasy team name"}},
+    ),
+    _function_tool(
+        "get_player_stats",
+        "NBA stats of a player for a period.",
+        {
+            "player_name": {"type": "string"},
+            "period": {"type": "string", "enum": STAT_PERIODS},
+        },
+    ),
+    _function_tool(
+        "get_free_agents",
+        "Available free agents, best first by ownership or by a season stat category.",
+        {
+            "position": {"type": "string", "enum": POSITIONS},
+            "category": {"type": "string", "enum": ["percent_owned"] + CATEGORIES},
+            "limit": {"type": "integer", "description": "Number of players (max 25)"},
+        },
+    ),
+    _function_tool(
+        "get_league_leaders",
+        "Rostered players in this league ranked by a season stat category.",
+        {
+            "category": {"type": "string", "enum": CATEGORIES},
+            "limit": {"type": "integer", "description": "Number of players (max 25)"},
+        },
+    ),
+    _function_tool(
+        "run_sql",
+        "Run one read-only SQL SELECT over this league's data for aggregations across "
+        f"weeks, teams or players (max {MAX_ROWS} rows, {MAX_QUERY_SECONDS:g}s). "
+        + SQL_SCHEMA_DESCRIPTION,
+        {"sql": {"type": "string", "description": "A single SELECT statement"}},
+    ),
+]
+
+MAX_RESULT_LIMIT = 25
+
+
+@dataclass
+class _LeagueData:
+    index: LeagueQueryIndex
+    database: Optional[LeagueSqlDatabase]
+    # Version of the sections both were built from (see tool_data_version)
+    data_version: str
+
+
+class LeagueToolService:
+    """
+    Holds a LeagueQueryIndex and a LeagueSqlDatabase per league and runs the chat
+    function tools against them. Both are built from the sync results, or loaded
+    from the league blobs when this process hasn't synced the league.
+
+    After reload_seconds, chat keeps being served from the loaded data while a
+    background thread compares the stored data version with it; the sections are
+    only downloaded and rebuilt when another worker synced newer data.
+    """
+
+    def __init__(self, container_name: str = "fantasy1", reload_seconds: float = 300):
+        self.container_name = container_name
+        self.reload_seconds = reload_seconds
+        # league_id -> (loaded_at, league data)
+        self._leagues: Dict[str, Tuple[float, Optional[_LeagueData]]] = {}
+        # Leagues with a background reload in progress
+        self._reloading = set()
+        self._lock = threading.Lock()
+
+    def index_league(
+        self,
+        league_id: str,
+        sections: Dict[str, Union[SerializedSection, Any]],
+        data_store: Optional[LeagueDataStore] = None,
+    ) -> Optional[LeagueQueryIndex]:
+        """
+        Build a league's tool data from freshly synced sections and store their
+        version, so other workers reload it.
+
+        Args:
+            league_id: League identifier
+            sections: Section name -> SerializedSection, as returned by sync_full_league
+            data_store: Store to write the version to (defaults to the configured store)
+        """
+        league = self._build(league_id, sections, tool_data_version(sections))
+        if league is None:
+            return None
+
+        try:
+            data_store = data_store or create_league_data_store(self.container_name)
+            data_store.upload_json_with_retries(
+                {"data_version": league.data_version},
+                f"{league_id}/{TOOL_DATA_VERSION_BLOB_NAME}",
+            )
+        except Exception as e:
+            logger.warning(f"League {league_id}: could not store tool data version: {e}")
+        return league.index
+
+    def get_index(self, league_id: str) -> Optional[LeagueQueryIndex]:
+        league = self._get_league(league_id)
+        return league.index if league is not None else None
+
+    def get_database(self, league_id: str) -> Optional[LeagueSqlDatabase]:
+        league = self._get_league(league_id)
+        return league.database if league is not None else None
+
+    def _build(
+        self,
+        league_id: str,
+        sections: Dict[str, Union[SerializedSection, Any]],
+        data_version: str,
+    ) -> Optional[_LeagueData]:
+        try:
+            index = LeagueQueryIndex.from_sections(sections, get_nba_player_stats())
+        except Exception as e:
+            logger.error(f"League {league_id}: failed to build query index: {e}")
+            return None
+
+        try:
+            database = LeagueSqlDatabase.from_sections(sections)
+        except Exception as e:
+            logger.error(f"League {league_id}: failed to build SQL database: {e}")
+            database = None
+
+        league = _LeagueData(index, database, data_version)
+        # The replaced database is closed when the last in-flight query releases it
+        with self._lock:
+            self._leagues[league_id] = (time.monotonic(), league)
+        return league
+
+    def _get_league(self, league_id: str) -> Optional[_LeagueData]:
+        with self._lock:
+            cached = self._leagues.get(league_id)
+        if cached is None:
+            return self._reload(league_id)
+
+        loaded_at, league = cached
+        if time.monotonic() - loaded_at < self.reload_seconds:
+            return league
+        if league is None:
+            # Nothing to serve meanwhile; the lookups of an unsynced league are cheap
+            return self._reload(league_id)
+
+        self._reload_in_background(league_id)
+        return league
+
+    def _reload_in_background(self, league_id: str):
+        with self._lock:
+            if league_id in self._reloading:
+                return
+            self._reloading.add(league_id)
+
+        def reload():
+            try:
+                self._reload(league_id)
+            finally:
+                with self._lock:
+                    self._reloading.discard(league_id)
+
+        threading.Thread(
+            target=reload, name=f"league-tools-reload-{league_id}", daemon=True
+        ).start()
+
+    def _reload(self, league_id: str) -> Optional[_LeagueData]:
+        """Load the league's sections from the store unless the loaded data is current."""
+        with self._lock:
+            cached = self._leagues.get(league_id)
+        current = cached[1] if cached is not None else None
+
+        sections = {}
+        try:
+            data_store = create_league_data_store(self.container_name)
+            if current is not None:
+                stored = data_store.download_json_data(
+                    f"{league_id}/{TOOL_DATA_VERSION_BLOB_NAME}"
+                )
+                if stored and stored.get("data_version") == current.data_version:
+                    return self._keep(league_id, current)
+
+            for section_name, blob_name in SECTION_BLOB_NAMES.items():
+                data = data_store.download_json_data(f"{league_id}/{blob_name}")
+                if data is not None:
+                    sections[section_name] = data
+        except Exception as e:
+            logger.warning(f"League {league_id}: could not load league sections: {e}")
+
+        if sections:
+            data_version = tool_data_version(sections)
+            if current is not None and data_version == current.data_version:
+                return self._keep(league_id, current)
+            league = self._build(league_id, sections, data_version)
+            if league is not None:
+                return league
+
+        # Keep the previous data if a reload fails; cache misses too so
+        # unsynced leagues don't hit the store on every turn
+        return self._keep(league_id, current)
+
+    def _keep(self, league_id: str, league: Optional[_LeagueData]) -> Optional[_LeagueData]:
+        """Serve the loaded data for another reload_seconds."""
+        with self._lock:
+            self._leagues[league_id] = (time.monotonic(), league)
+        return league
+
+    def run_tool(self, league_id: str, name: str, arguments: str) -> str:
+        """
+        Run a function tool call and return its JSON output.
+        Errors are returned to the model as {"error": ...} instead of raised.
+        """
+        started = time.perf_counter()
+        try:
+            result = self._dispatch(league_id, name, json.loads(arguments or "{}"))
+        except Exception as e:
+            logger.warning(f"Tool {name} failed for league {league_id}: {e}")
+            result = {"error": f"{type(e).__name__}: {e}"}
+        logger.debug(
+            f"Tool {name} for league {league_id} took "
+            f"{(time.perf_counter() - started) * 1000:.2f} ms"
+        )
+        return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+    def _dispatch(self, league_id: str, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        league = self._get_league(league_id)
+        if league is None:
+            return {"error": "League data is not synced yet"}
+        index = league.index
+
+        if name == "run_sql":
+            if league.database is None:
+                return {"error": "SQL is not available for this league"}
+            return league.database.run_query(args["sql"])
+
+        limit = min(int(args.get("limit") or 10), MAX_RESULT_LIMIT)
+        if name == "get_standings":
+            return index.get_standings()
+        if name == "get_matchups":
+            return index.get_matchups(args["week"], args.get("team_name"))
+        if name == "get_team_roster":
+            return index.get_team_roster(args["team_name"])
+        if name == "get_player_stats":
+            return index.get_player_stats(
+                args["player_name"], args.get("period") or "season"
+            )
+        if name == "get_free_agents":
+            return index.get_free_agents(
+                args.get("position") or "any",
+                args.get("category") or "percent_owned",
+                limit,
+            )
+        if name == "get_league_leaders":
+            return index.get_league_leaders(args["category"], limit)
+        return {"error": f"Unknown tool '{name}'"}
+
+
+_tool_service_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_league_tool_service() -> LeagueToolService:
+    """
+    Get or create the global league tool service singleton instance.
+    Thread-safe lazy initialization.
+    """
+    global _tool_service_instance
+
+    if _tool_service_instance is None:
+        with _instance_lock:
+            if _tool_service_instance is None:
+                _tool_service_instance = LeagueToolService()
+
+    return _tool_service_instance
@@ -1,15 +1,42 @@
+import asyncio
+import hashlib
 import logging
 import os
+import queue
+import time
 from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 
 from ..model.chat import ChatRequest
 from ..model.file import FilePurpose
 from ..model.vector_store import generate_league_vector_store_id
-from openai import OpenAI
+from openai import NOT_GIVEN, AsyncOpenAI, NotGiven, OpenAI
 from openai.types.responses import Response
+from .answer_cache import AnswerCache, answer_cache_key
+from .chat_event_loop import ChatEventLoop, get_chat_event_loop
 from .chat_session_manager import ChatSessionManager
+from .league_digest import LeagueDigestService
+from .league_search_service import LeagueSearchService
+from .latency_metrics import add_span, mark, span
+from .league_tools import LEAGUE_FUNCTION_TOOLS, LeagueToolService
+from .openai_gateway import RESPONSES, OpenaiGateway, get_openai_gateway
 from .vector_store_manager import VectorStoreManager
 
+OPENAI_CHAT_MODEL = "gpt-5.1-mini"
+# Upper bound on model -> function call -> model round trips per chat turn
+MAX_TOOL_ROUNDS = 5
+
+
+def tool_choice(tool_round: int, tools: List[dict]) -> Union[str, NotGiven]:
+    """
+    The round after the last allowed function calls may not call tools, so the turn
+    always ends with an answer. A response with unanswered function calls would
+    break the session's next turn.
+    """
+    if not tools:
+        return NOT_GIVEN
+    return "none" if tool_round >= MAX_TOOL_ROUNDS else "auto"
+
 
 class OpenaiAgentManager:
     def __init__(
@@ -17,63 +44,416 @@ class OpenaiAgentManager:
         chat_session_manager: ChatSessionManager,
         vector_store_manager: VectorStoreManager,
         openai_client: OpenAI,
+        league_search_service: Optional[LeagueSearchService] = None,
+        league_tool_service: Optional[LeagueToolService] = None,
+        league_digest_service: Optional[LeagueDigestService] = None,
+        answer_cache: Optional[AnswerCache] = None,
+        openai_gateway: Optional[OpenaiGateway] = None,
+        chat_event_loop: Optional[ChatEventLoop] = None,
     ):
         self.chat_session_manager = chat_session_manager
         self.vector_store_manager = vector_store_manager
         self.openai_client = openai_client
+        self.league_search_service = league_search_service
+        self.league_tool_service = league_tool_service
+        self.league_digest_service = league_digest_service
+        self.answer_cache = answer_cache
+        self.openai_gateway = openai_gateway or get_openai_gateway()
+        self.chat_event_loop = chat_event_loop or get_chat_event_loop()
+        self._async_client: Optional[AsyncOpenAI] = None
+        # Passages of local league data put into the prompt (0 disables local retrieval)
+        self.local_retrieval_top_k = int(os.environ.get("LOCAL_RETRIEVAL_TOP_K", "5"))
+        # (prompt path, mtime_ns, text) of the last loaded system prompt
+        self._instructions: Optional[Tuple[Path, int, str]] = None
+
+    def get_async_client(self) -> AsyncOpenAI:
+        """
+        AsyncOpenAI client shared by all chat turns. Its connection pool is bound
+        to the chat event loop, so it must only be used by coroutines running there.
+        """
+        # Only the chat event loop's thread gets here, so no lock is needed
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.openai_client.api_key,
+                organization=self.openai_client.organization,
+                base_url=self.openai_client.base_url,
+                max_retries=self.openai_client.max_retries,
+            )
+        return self._async_client
 
     async def chat(self, chat_request: ChatRequest) -> Response:
-        chat_session = self.chat_session_manager.get_existing_or_create(
-            chat_request["session_id"]
+        """Run a chat turn on the chat event loop, where the shared AsyncOpenAI client lives."""
+        return await asyncio.wrap_future(
+            self.chat_event_loop.submit(self._chat(chat_request))
         )
-        assistant_response = self.start_chat_with_openai(
+
+    async def _chat(self, chat_request: ChatRequest) -> Response:
+        with span("session_load"):
+            chat_session = await asyncio.to_thread(
+                self.chat_session_manager.get_existing_or_create,
+                chat_request["session_id"],
+            )
+
+        cache_key = None
+        if chat_session.previous_openai_response_id is None:
+            with span("answer_cache"):
+                cache_key = await asyncio.to_thread(
+                    self.get_answer_cache_key,
+                    chat_request["league_id"],
+                    chat_request.get("user_guid"),
+                    chat_request["user_message"],
+                )
+                cached_response = (
+                    self.answer_cache.get(cache_key) if cache_key else None
+                )
+            if cached_response is not None:
+                with span("session_update"):
+                    await asyncio.to_thread(
+                        self.chat_session_manager.update_chat_session,
+                        chat_session.session_id,
+                        cached_response.id,
+                    )
+                return cached_response
+
+        assistant_response = await self.start_chat_with_openai(
             previous_response_id=chat_session.previous_openai_response_id,
             new_user_message=chat_request["user_message"],
             league_id=chat_request["league_id"],
+            user_guid=chat_request.get("user_guid"),
         )
-        self.chat_session_manager.update_chat_session(
-            chat_session.session_id, assistant_response.id
-        )
+        with span("session_update"):
+            await asyncio.to_thread(
+                self.chat_session_manager.update_chat_session,
+                chat_session.session_id,
+                assistant_response.id,
+            )
+        self.cache_answer(cache_key, assistant_response)
 
         return assistant_response
 
-    def start_chat_with_openai(
-        self, previous_response_id: str, new_user_message: str, league_id: str
-    ) -> Response:
-        tools = self.create_tools(league_id)
+    def stream_chat(self, chat_request: ChatRequest) -> Iterator[Dict[str, Any]]:
+        """
+        Same turn as chat(), streamed. Yields {"type": "delta", "text": ...} as output
+        text arrives and {"type": "done", "response_id": ...} at the end. The turn
+        runs on the chat event loop; the calling thread only waits for its events.
+        """
+        events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
 
-        if tools is None:
-            # Create a custom Response object with all required fields
-            tools = []
+        async def produce():
+            try:
+                async for event in self._stream_chat(chat_request):
+                    events.put(event)
+            finally:
+                events.put(None)
+
+        future = self.chat_event_loop.submit(produce())
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                yield event
+            # Raises the error the turn failed with, if any
+            future.result()
+        finally:
+            # The client went away mid-stream: stop the turn
+            future.cancel()
+
+    async def _stream_chat(self, chat_request: ChatRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Function calls are run between streamed responses. The session is updated
+        only once the final response has completed.
+        """
+        with span("session_load"):
+            chat_session = await asyncio.to_thread(
+                self.chat_session_manager.get_existing_or_create,
+                chat_request["session_id"],
+            )
+        league_id = chat_request["league_id"]
+
+        cache_key = None
+        if chat_session.previous_openai_response_id is None:
+            with span("answer_cache"):
+                cache_key = await asyncio.to_thread(
+                    self.get_answer_cache_key,
+                    league_id,
+                    chat_request.get("user_guid"),
+                    chat_request["user_message"],
+                )
+                cached_response = (
+                    self.answer_cache.get(cache_key) if cache_key else None
+                )
+            if cached_response is not None:
+                with span("session_update"):
+                    await asyncio.to_thread(
+                        self.chat_session_manager.update_chat_session,
+                        chat_session.session_id,
+                        cached_response.id,
+                    )
+                mark("first_delta")
+                yield {"type": "delta", "text": cached_response.output_text}
+                yield {"type": "done", "response_id": cached_response.id}
+                return
 
-        instructions = self.get_instructions()
+        instructions, turn_input, tools = await self.prepare_turn_async(
+            chat_request["user_message"], league_id, chat_request.get("user_guid")
+        )
+
+        client = self.get_async_client()
+        previous_response_id = chat_session.previous_openai_response_id
+        for tool_round in range(MAX_TOOL_ROUNDS + 1):
+            response = None
+            started = time.perf_counter()
+            stream = await self.openai_gateway.acall(
+                RESPONSES,
+                client.responses.create,
+                model=OPENAI_CHAT_MODEL,
+                instructions=instructions,
+                input=turn_input,
+                previous_response_id=previous_response_id,
+                tools=tools,
+                tool_choice=tool_choice(tool_round, tools),
+                stream=True,
+            )
+            async with stream:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        mark("first_delta")
+                        yield {"type": "delta", "text": event.delta}
+                    elif event.type == "response.completed":
+                        response = event.response
+                    elif event.type in ("response.failed", "error"):
+                        raise RuntimeError(f"OpenAI stream failed: {event}")
+
+            if response is None:
+                raise RuntimeError("OpenAI stream ended without a completed response")
+            # Includes the time the client spent consuming the deltas
+            self.record_model_call(response, started)
+            previous_response_id = response.id
+            if tool_round == MAX_TOOL_ROUNDS:
+                break
+            turn_input = await asyncio.to_thread(self.run_function_calls, league_id, response)
+            if not turn_input:
+                break
+
+        with span("session_update"):
+            await asyncio.to_thread(
+                self.chat_session_manager.update_chat_session,
+                chat_session.session_id,
+                previous_response_id,
+            )
+        self.cache_answer(cache_key, response)
+        yield {"type": "done", "response_id": previous_response_id}
+
+    async def start_chat_with_openai(
+        self,
+        previous_response_id: str,
+        new_user_message: str,
+        league_id: str,
+        user_guid: Optional[str] = None,
+    ) -> Response:
+        instructions, turn_input, tools = await self.prepare_turn_async(
+            new_user_message, league_id, user_guid
+        )
 
-        return self.openai_client.responses.create(
-            model="gpt-5.1-mini",
+        client = self.get_async_client()
+        started = time.perf_counter()
+        response = await self.openai_gateway.acall(
+            RESPONSES,
+            client.responses.create,
+            model=OPENAI_CHAT_MODEL,
             instructions=instructions,
-            input=new_user_message,
+            input=turn_input,
             previous_response_id=previous_response_id,
             tools=tools,
+            tool_choice=tool_choice(0, tools),
         )
+        self.record_model_call(response, started)
 
-    def create_tools(self, league_id: str):
-        openai_league_vs = self.vector_store_manager.get_vector_store_by_id(
-            generate_league_vector_store_id(league_id)
+        for tool_round in range(1, MAX_TOOL_ROUNDS + 1):
+            tool_outputs = await asyncio.to_thread(
+                self.run_function_calls, league_id, response
+            )
+            if not tool_outputs:
+                break
+            started = time.perf_counter()
+            response = await self.openai_gateway.acall(
+                RESPONSES,
+                client.responses.create,
+                model=OPENAI_CHAT_MODEL,
+                instructions=instructions,
+                input=tool_outputs,
+                previous_response_id=response.id,
+                tools=tools,
+                tool_choice=tool_choice(tool_round, tools),
+            )
+            self.record_model_call(response, started)
+
+        return response
+
+    async def prepare_turn_async(
+        self, new_user_message: str, league_id: str, user_guid: Optional[str] = None
+    ) -> Tuple[str, Any, List[dict]]:
+        """
+        Build the instructions, input and tools of a chat turn. The Supabase lookups,
+        index loads and prompt file read run concurrently in worker threads so the
+        event loop is never blocked on them.
+        """
+        passages, instructions, digest = await asyncio.gather(
+            asyncio.to_thread(self.retrieve_league_passages, league_id, new_user_message),
+            asyncio.to_thread(self.get_instructions),
+            asyncio.to_thread(self.get_league_digest, league_id, user_guid),
         )
+        # With local passages in the prompt the hosted search over league files is
+        # skipped; the rules store is still searchable
+        tools = await asyncio.to_thread(
+            self.create_tools, league_id, include_league_store=not passages
+        )
+        return self.assemble_turn(new_user_message, passages, tools, instructions, digest)
 
-        if openai_league_vs is None:
+    def assemble_turn(
+        self,
+        new_user_message: str,
+        passages: List[str],
+        tools: Optional[List[dict]],
+        instructions: str,
+        digest: Optional[str],
+    ) -> Tuple[str, Any, List[dict]]:
+        if tools is None:
+            # Create a custom Response object with all required fields
+            tools = []
+        if self.league_tool_service is not None:
+            tools = tools + LEAGUE_FUNCTION_TOOLS
+
+        if digest:
+            instructions = f"{instructions}\n\n##League Digest##\n{digest}\n"
+
+        return instructions, self.build_input(new_user_message, passages), tools
+
+    def record_model_call(self, response: Response, started: float):
+        """
+        Time a model round trip. file_search runs inside it, so rounds that used it
+        are also recorded separately to tell its cost apart.
+        """
+        duration_ms = (time.perf_counter() - started) * 1000
+        add_span("openai_response", duration_ms)
+        if any(item.type == "file_search_call" for item in response.output):
+            add_span("openai_response_file_search", duration_ms)
+
+    def run_function_calls(self, league_id: str, response: Response) -> List[dict]:
+        """Run the function calls requested in a response and build their outputs."""
+        if self.league_tool_service is None:
+            return []
+        with span("function_calls"):
+            return self._run_function_calls(league_id, response)
+
+    def _run_function_calls(self, league_id: str, response: Response) -> List[dict]:
+        return [
+            {
+                "type": "function_call_output",
+                "call_id": item.call_id,
+                "output": self.league_tool_service.run_tool(
+                    league_id, item.name, item.arguments
+                ),
+            }
+            for item in response.output
+            if item.type == "function_call"
+        ]
+
+    def get_answer_cache_key(
+        self, league_id: str, user_guid: Optional[str], user_message: str
+    ) -> Optional[str]:
+        """
+        Answer cache key of a first-turn question, or None if answers can't be
+        cached (no cache, or no known data version for the league). The prompt
+        and the user's digest are part of the key since they shape the answer.
+        """
+        if self.answer_cache is None or self.league_search_service is None:
+            return None
+        try:
+            data_version = self.league_search_service.get_data_version(league_id)
+            if data_version is None:
+                return None
+            context = self.get_instructions() + (
+                self.get_league_digest(league_id, user_guid) or ""
+            )
+        except Exception as e:
+            logging.warning(f"Answer cache key failed for league {league_id}: {e}")
+            return None
+        context_hash = hashlib.sha256(context.encode("utf-8")).hexdigest()
+        return answer_cache_key(league_id, data_version, user_message, context_hash)
+
+    def cache_answer(self, cache_key: Optional[str], response: Response):
+        # Only complete answers are reused
+        if (
+            cache_key is None
+            or getattr(response, "status", None) != "completed"
+            or not response.output_text
+        ):
+            return
+        self.answer_cache.put(cache_key, response)
+
+    def get_league_digest(self, league_id: str, user_guid: Optional[str]) -> Optional[str]:
+        if self.league_digest_service is None:
+            return None
+        try:
+            with span("digest"):
+                return self.league_digest_service.get_digest(league_id, user_guid)
+        except Exception as e:
+            logging.warning(f"Could not load digest for league {league_id}: {e}")
             return None
 
-        vector_store_ids = [openai_league_vs.openai_vector_id]
+    def retrieve_league_passages(self, league_id: str, user_message: str) -> List[str]:
+        if self.league_search_service is None or self.local_retrieval_top_k <= 0:
+            return []
+        try:
+            with span("retrieval"):
+                return self.league_search_service.retrieve(
+                    league_id, user_message, top_k=self.local_retrieval_top_k
+                )
+        except Exception as e:
+            logging.warning(f"Local retrieval failed for league {league_id}: {e}")
+            return []
 
-        openai_rules_vs = self.vector_store_manager.get_vector_store_by_id(
+    def build_input(self, user_message: str, passages: List[str]):
+        if not passages:
+            return user_message
+        context = "League data relevant to the question:\n\n" + "\n\n---\n\n".join(
+            passages
+        )
+        return [
+            {"role": "developer", "content": context},
+            {"role": "user", "content": user_message},
+        ]
+
+    def create_tools(self, league_id: str, include_league_store: bool = True):
+        with span("create_tools"):
+            return self._create_tools(league_id, include_league_store)
+
+    def _create_tools(self, league_id: str, include_league_store: bool):
+        vector_store_ids = []
+
+        if include_league_store:
+            openai_league_vs_id = self.vector_store_manager.get_openai_vector_store_id(
+                generate_league_vector_store_id(league_id)
+            )
+
+            if openai_league_vs_id is None:
+                return None
+
+            vector_store_ids.append(openai_league_vs_id)
+
+        openai_rules_vs_id = self.vector_store_manager.get_openai_vector_store_id(
             FilePurpose.GENERAL.value
         )
 
-        if openai_rules_vs is None:
+        if openai_rules_vs_id is None:
             logging.error("No rules vector store found")
         else:
-            vector_store_ids.append(openai_rules_vs.openai_vector_id)
+            vector_store_ids.append(openai_rules_vs_id)
+
+        if not vector_store_ids:
+            return None
 
         return [
             {
@@ -83,6 +463,10 @@ class OpenaiAgentManager:
         ]
 
     def get_instructions(self):
+        with span("instructions"):
+            return self._load_instructions()
+
+    def _load_instructions(self):
         # Uri did it because he had a problem with the system prompt
 
         default_prompt_path = (
@@ -95,4 +479,13 @@ class OpenaiAgentManager:
             if env_prompt_path is not None
             else default_prompt_path
         )
-        return instructions_path.read_text(encoding="utf-8")
+
+        # Re-read the prompt only when the file changes
+        mtime_ns = instructions_path.stat().st_mtime_ns
+        cached = self._instructions
+        if cached is not None and cached[:2] == (instructions_path, mtime_ns):
+            return cached[2]
+
+        instructions = instructions_path.read_text(encoding="utf-8")
+        self._instructions = (instructions_path, mtime_ns, instructions)
+        return instructions
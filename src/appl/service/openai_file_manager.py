@@ -1,31 +1,72 @@
-from io import BytesIO
-import json
-from typing import Any, Dict
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 from openai import OpenAI
 
+from .openai_gateway import FILES, OpenaiGateway, get_openai_gateway
 from .vector_store_manager import VectorStoreManager
-from ..model.vector_store import generate_league_vector_store_id
-from ..model.file import FilePurpose
+from ..model.vector_store import OpenaiFileRecord, generate_league_vector_store_id
+from ..model.file import FilePurpose, SerializedSection
+from ..repository.supaBase.database.write_batcher import WriteBehindBatcher
+from ..repository.supaBase.repositories.openai_file_registry_repository import (
+    REGISTRY_KEY_COLUMNS,
+    OpenaiFileRegistryRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_UPLOADS = 8
 
 
 class OpenaiFileManager:
-    def __init__(self, vector_store_manager: VectorStoreManager, openai_client: OpenAI):
+    def __init__(
+        self,
+        vector_store_manager: VectorStoreManager,
+        openai_client: OpenAI,
+        file_registry_repository: OpenaiFileRegistryRepository,
+        openai_gateway: Optional[OpenaiGateway] = None,
+    ):
         self.vector_store_manager = vector_store_manager
         self.openai_client = openai_client
+        self.file_registry_repository = file_registry_repository
+        # Registrations from the concurrent uploads are sent together in bulk upserts;
+        # a concurrent sync that registered the same content first is overwritten
+        self.file_registry_batcher = WriteBehindBatcher(
+            file_registry_repository, on_conflict=REGISTRY_KEY_COLUMNS
+        )
+        self.openai_gateway = openai_gateway or get_openai_gateway()
 
     def _upload_local_file(self, file_path: str) -> str:
         with open(file_path, "rb") as f:
-            openai_file = self.openai_client.files.create(file=f, purpose="assistants")
-        return openai_file.id
 
-    def update_league_files(self, league_id: str, files: Dict[str, any]):
-        openai_file_ids = []
+            def create():
+                # Rewind so a retried upload sends the whole file again
+                f.seek(0)
+                return self.openai_client.files.create(file=f, purpose="assistants")
 
-        for file_name, file_content in files.items():
-            openai_file_ids.append(self.upload_file_in_openai(file_name, file_content))
+            openai_file = self.openai_gateway.call(FILES, create)
+        return openai_file.id
 
+    def update_league_files(
+        self, league_id: str, documents: Dict[str, SerializedSection]
+    ):
+        """
+        Upload a league's rendered documents (see render_league_documents) and point
+        its vector store at them. Unchanged documents are reused through the registry.
+        """
         vector_store_id = generate_league_vector_store_id(league_id)
+
+        def upload(item) -> str:
+            file_name, section = item
+            return self._get_or_upload_section(vector_store_id, file_name, section)
+
+        try:
+            openai_file_ids = self._run_concurrently(upload, documents.items())
+        finally:
+            # Files uploaded before a failed upload are registered too, so a retry reuses them
+            self.file_registry_batcher.flush()
+
         self.vector_store_manager.update_vector_store(vector_store_id, openai_file_ids)
 
     def update_rules(self, pdf_path: str):
@@ -39,11 +80,8 @@ class OpenaiFileManager:
     def update_player_stats(
         self, json_path: str, pdf_path: str | None = None, schedule_path: str | None = None
     ):
-        openai_file_ids = [self._upload_local_file(json_path)]
-        if pdf_path:
-            openai_file_ids.append(self._upload_local_file(pdf_path))
-        if schedule_path:
-            openai_file_ids.append(self._upload_local_file(schedule_path))
+        file_paths = [path for path in (json_path, pdf_path, schedule_path) if path]
+        openai_file_ids = self._run_concurrently(self._upload_local_file, file_paths)
 
         vector_store_id = FilePurpose.GENERAL.value
         vector_store_metadata = self.vector_store_manager.update_vector_store(
@@ -51,11 +89,71 @@ class OpenaiFileManager:
         )
         return vector_store_metadata
 
-    def upload_file_in_openai(self, file_name: str, file_content: any):
-        json_content = json.dumps(file_content, ensure_ascii=False)
-        file_object = BytesIO(json_content.encode("utf-8"))
-        file_object.name = f"{file_name}.json"
-        openai_file = self.openai_client.files.create(
-            file=file_object, purpose="assistants"
+    def _run_concurrently(self, upload: Callable[[Any], str], items: Iterable) -> List[str]:
+        """Run uploads on a bounded thread pool, returning file ids in input order."""
+        items = list(items)
+        if len(items) <= 1:
+            return [upload(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_UPLOADS, len(items))
+        ) as executor:
+            return list(executor.map(upload, items))
+
+    def _to_section(
+        self, file_name: str, file_content: Union[SerializedSection, Any]
+    ) -> SerializedSection:
+        if isinstance(file_content, SerializedSection):
+            return file_content
+        return SerializedSection.from_data(file_name, file_content)
+
+    def _get_or_upload_section(
+        self,
+        vector_store_id: str,
+        file_name: str,
+        section: SerializedSection,
+    ) -> str:
+        """
+        Reuse the OpenAI file already uploaded for this section content, or upload it
+        and register its hash. Registry failures fall back to a plain upload.
+        """
+        try:
+            record = self.file_registry_repository.get_by_content_hash(
+                vector_store_id, file_name, section.content_sha256
+            )
+        except Exception as e:
+            logger.warning(f"File registry lookup failed for '{file_name}': {e}")
+            record = None
+
+        if record is not None:
+            logger.info(f"Reusing OpenAI file for '{file_name}' (content unchanged)")
+            return record.openai_file_id
+
+        openai_file_id = self.upload_file_in_openai(file_name, section)
+        self._register_file(
+            OpenaiFileRecord(
+                vector_store_id=vector_store_id,
+                file_name=file_name,
+                content_sha256=section.content_sha256,
+                openai_file_id=openai_file_id,
+            )
+        )
+        return openai_file_id
+
+    def _register_file(self, record: OpenaiFileRecord):
+        """Queue an uploaded file's hash for the registry; write failures are logged by the batcher."""
+        try:
+            self.file_registry_batcher.submit(record.model_dump())
+        except Exception as e:
+            logger.warning(f"Could not register OpenAI file '{record.file_name}': {e}")
+
+    def upload_file_in_openai(
+        self, file_name: str, file_content: Union[SerializedSection, Any]
+    ):
+        section = self._to_section(file_name, file_content)
+        openai_file = self.openai_gateway.call(
+            FILES,
+            self.openai_client.files.create,
+            file=(section.file_name, section.payload),
+            purpose="assistants",
         )
         return openai_file.id
@@ -0,0 +1,293 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from openai import APIConnectionError, APIStatusError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+RESPONSES = "responses"
+FILES = "files"
+VECTOR_STORES = "vector_stores"
+
+# Concurrent OpenAI calls allowed per operation, per process
+DEFAULT_LIMITS = {RESPONSES: 16, FILES: 8, VECTOR_STORES: 8}
+
+# Recent queue waits kept per operation for the percentiles
+WAIT_SAMPLE_SIZE = 1024
+
+
+class OpenaiGatewayBusyError(Exception):
+    """The call was not admitted: the wait queue was full or the wait timed out"""
+
+    pass
+
+
+class _OperationLimiter:
+    """
+    Concurrency limit of one operation with a bounded priority wait queue.
+    Waiters are admitted by priority, then in arrival order.
+    """
+
+    def __init__(self, operation: str, max_concurrency: int, max_queue: int):
+        self.operation = operation
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._condition = threading.Condition()
+        self._active = 0
+        # heap of (priority, arrival) of the waiting calls
+        self._waiters = []
+        self._arrivals = itertools.count()
+        self.calls = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.retries = 0
+        self._waits = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._max_wait = 0.0
+
+    def try_acquire(self) -> bool:
+        """Take a free slot without waiting, if nobody is queued ahead."""
+        with self._condition:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._admit(0.0)
+                return True
+            return False
+
+    def acquire(self, priority: int, timeout: float):
+        """
+        Wait for a slot.
+
+        Raises:
+            OpenaiGatewayBusyError: The queue is full, or no slot freed up within timeout
+        """
+        started = time.monotonic()
+        with self._condition:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._admit(0.0)
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise OpenaiGatewayBusyError(
+                    f"OpenAI {self.operation} queue is full ({self.max_queue} waiting)"
+                )
+
+            waiter = (priority, next(self._arrivals))
+            heapq.heappush(self._waiters, waiter)
+            try:
+                while not (
+                    self._active < self.max_concurrency and self._waiters[0] == waiter
+                ):
+                    remaining = started + timeout - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise OpenaiGatewayBusyError(
+                            f"No OpenAI {self.operation} slot free after {timeout:g}s"
+                        )
+                    self._condition.wait(remaining)
+                heapq.heappop(self._waiters)
+                self._admit(time.monotonic() - started)
+            except BaseException:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    heapq.heapify(self._waiters)
+                raise
+            finally:
+                # The next waiter may be admissible now
+                self._condition.notify_all()
+
+    def release(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def record_retry(self):
+        with self._condition:
+            self.retries += 1
+
+    def _admit(self, waited: float):
+        self._active += 1
+        self.calls += 1
+        self._waits.append(waited)
+        self._max_wait = max(self._max_wait, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            waits = sorted(self._waits)
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._active,
+                "queued": len(self._waiters),
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "retries": self.retries,
+                "queue_wait_ms": {
+                    "p50": _percentile_ms(waits, 0.50),
+                    "p95": _percentile_ms(waits, 0.95),
+                    "p99": _percentile_ms(waits, 0.99),
+                    "max": round(self._max_wait * 1000, 2),
+                },
+            }
+
+
+def _percentile_ms(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors and connection failures are worth retrying."""
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, APIConnectionError)
+
+
+class OpenaiGateway:
+    """
+    Admission control for OpenAI calls shared by chat and ingestion.
+    Each operation (responses, files, vector_stores) has its own concurrency
+    limit and bounded wait queue; interactive calls are admitted before
+    background ones. Retryable failures are retried with full-jitter
+    exponential backoff, releasing the slot while backing off.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 64,
+        queue_timeout_seconds: float = 30.0,
+        max_retries: int = 3,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 8.0,
+    ):
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._limiters = {
+            operation: _OperationLimiter(operation, limit, max_queue)
+            for operation, limit in {**DEFAULT_LIMITS, **(limits or {})}.items()
+        }
+
+    def call(
+        self,
+        operation: str,
+        fn: Callable[..., T],
+        *args,
+        priority: int = PRIORITY_BACKGROUND,
+        **kwargs,
+    ) -> T:
+        """Run a blocking OpenAI call once admitted, retrying retryable failures."""
+        limiter = self._limiters[operation]
+        for attempt in itertools.count():
+            limiter.acquire(priority, self.queue_timeout_seconds)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(limiter, attempt, e)
+            finally:
+                limiter.release()
+            time.sleep(delay)
+
+    async def acall(
+        self,
+        operation: str,
+        fn: Callable[..., Awaitable[T]],
+        *args,
+        priority: int = PRIORITY_INTERACTIVE,
+        **kwargs,
+    ) -> T:
+        """call() for AsyncOpenAI; only a call that has to queue waits in a worker thread."""
+        limiter = self._limiters[operation]
+        for attempt in itertools.count():
+            if not limiter.try_acquire():
+                await self._acquire_in_thread(limiter, priority)
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(limiter, attempt, e)
+            finally:
+                limiter.release()
+            await asyncio.sleep(delay)
+
+    async def _acquire_in_thread(self, limiter: _OperationLimiter, priority: int):
+        acquired = asyncio.get_running_loop().run_in_executor(
+            None, limiter.acquire, priority, self.queue_timeout_seconds
+        )
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            # The waiting thread can't be interrupted; give its slot back if it gets one
+            acquired.add_done_callback(
+                lambda future: future.exception() is None and limiter.release()
+            )
+            raise
+
+    def _retry_delay(
+        self, limiter: _OperationLimiter, attempt: int, error: Exception
+    ) -> float:
+        """Backoff before the next attempt; re-raises the error when it is final."""
+        if attempt >= self.max_retries or not is_retryable(error):
+            raise error
+        delay = random.uniform(
+            0, min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+        )
+        # Honor the server's hint when it asks for a longer pause
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay_seconds))
+
+        limiter.record_retry()
+        logger.warning(
+            f"OpenAI {limiter.operation} call failed ({type(error).__name__}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+        )
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            operation: limiter.stats() for operation, limiter in self._limiters.items()
+        }
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+_gateway_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_openai_gateway() -> OpenaiGateway:
+    """
+    Get or create the global OpenAI gateway singleton instance.
+    Thread-safe lazy initialization.
+    """
+    global _gateway_instance
+
+    if _gateway_instance is None:
+        with _instance_lock:
+            if _gateway_instance is None:
+                _gateway_instance = OpenaiGateway()
+
+    return _gateway_instance
@@ -0,0 +1,200 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from openai import NotFoundError, OpenAI
+
+from ..repository.supaBase.repositories.openai_file_registry_repository import (
+    OpenaiFileRegistryRepository,
+)
+from ..repository.supaBase.repositories.vector_metadata_repository import (
+    VectorStoreMetadataRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GarbageCollectionReport:
+    dry_run: bool
+    live_vector_stores: int = 0
+    live_files: int = 0
+    scanned_vector_stores: int = 0
+    scanned_files: int = 0
+    skipped_in_grace_period: int = 0
+    deleted_vector_stores: List[str] = field(default_factory=list)
+    deleted_files: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class OpenaiStorageGarbageCollector:
+    """
+    Deletes OpenAI vector stores and files that are no longer referenced.
+
+    Live objects are the vector stores pointed to by vector_metadata and the
+    files attached to them. Anything else older than the grace period is
+    deleted, so stores and files from a sync that is still running are left alone.
+    """
+
+    def __init__(
+        self,
+        openai_client: OpenAI,
+        vector_store_metadata_repository: VectorStoreMetadataRepository,
+        file_registry_repository: Optional[OpenaiFileRegistryRepository] = None,
+        grace_period: timedelta = timedelta(hours=24),
+        page_size: int = 100,
+        max_workers: int = 8,
+    ):
+        self.openai_client = openai_client
+        self.vector_store_metadata_repository = vector_store_metadata_repository
+        self.file_registry_repository = file_registry_repository
+        self.grace_period = grace_period
+        self.page_size = page_size
+        self.max_workers = max_workers
+
+    def run(self, dry_run: bool = True) -> GarbageCollectionReport:
+        """
+        Collect unreferenced vector stores, then unreferenced files.
+        Stores go first so files of a deleted store are collected in the same run.
+
+        Args:
+            dry_run: Only report what would be deleted
+
+        Returns:
+            GarbageCollectionReport
+        """
+        started = time.monotonic()
+        report = GarbageCollectionReport(dry_run=dry_run)
+        cutoff = time.time() - self.grace_period.total_seconds()
+
+        live_store_ids = self._live_vector_store_ids()
+        if not live_store_ids:
+            # An empty pointer table more likely means a misconfigured database than
+            # an unused account; refuse rather than delete everything
+            report.errors.append("No live vector stores found, aborting")
+            logger.error("OpenAI GC: no live vector stores found, aborting")
+            return report
+        live_file_ids = self._live_file_ids(live_store_ids)
+        report.live_vector_stores = len(live_store_ids)
+        report.live_files = len(live_file_ids)
+
+        self._collect(
+            pages=self.openai_client.vector_stores.list(limit=self.page_size),
+            live_ids=live_store_ids,
+            cutoff=cutoff,
+            delete=self._delete_vector_store,
+            deleted=report.deleted_vector_stores,
+            report=report,
+            scanned_attr="scanned_vector_stores",
+            dry_run=dry_run,
+        )
+        self._collect(
+            pages=self.openai_client.files.list(
+                purpose="assistants", limit=self.page_size
+            ),
+            live_ids=live_file_ids,
+            cutoff=cutoff,
+            delete=self._delete_file,
+            deleted=report.deleted_files,
+            report=report,
+            scanned_attr="scanned_files",
+            dry_run=dry_run,
+        )
+
+        report.duration_seconds = round(time.monotonic() - started, 3)
+        logger.info(
+            f"OpenAI GC {'(dry run) ' if dry_run else ''}finished: "
+            f"{len(report.deleted_vector_stores)} vector stores and "
+            f"{len(report.deleted_files)} files {'would be ' if dry_run else ''}deleted, "
+            f"{report.skipped_in_grace_period} in grace period, {len(report.errors)} errors"
+        )
+        return report
+
+    def _live_vector_store_ids(self) -> Set[str]:
+        return {
+            metadata.openai_vector_id
+            for metadata in self.vector_store_metadata_repository.get_all_vector_stores()
+            if metadata.openai_vector_id
+        }
+
+    def _live_file_ids(self, live_store_ids: Set[str]) -> Set[str]:
+        live_file_ids = set()
+        for vector_store_id in live_store_ids:
+            try:
+                for vector_store_file in self.openai_client.vector_stores.files.list(
+                    vector_store_id=vector_store_id, limit=self.page_size
+                ):
+                    live_file_ids.add(vector_store_file.id)
+            except NotFoundError:
+                logger.warning(f"Live vector store {vector_store_id} no longer exists")
+        return live_file_ids
+
+    def _collect(
+        self,
+        pages,
+        live_ids: Set[str],
+        cutoff: float,
+        delete: Callable[[str], Optional[str]],
+        deleted: List[str],
+        report: GarbageCollectionReport,
+        scanned_attr: str,
+        dry_run: bool,
+    ):
+        """
+        Walk a paginated listing, then delete the unreferenced items. Listing is
+        cursor-based (after=<last id>), so nothing is deleted until every page is read.
+        """
+        candidates = []
+        for page in pages.iter_pages():
+            for item in page.data:
+                setattr(report, scanned_attr, getattr(report, scanned_attr) + 1)
+                if item.id in live_ids:
+                    continue
+                if item.created_at > cutoff:
+                    report.skipped_in_grace_period += 1
+                    continue
+                candidates.append(item.id)
+
+        if dry_run:
+            deleted.extend(candidates)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item_id, error in zip(candidates, executor.map(delete, candidates)):
+                if error is None:
+                    deleted.append(item_id)
+                else:
+                    report.errors.append(error)
+
+    def _delete_vector_store(self, vector_store_id: str) -> Optional[str]:
+        try:
+            self.openai_client.vector_stores.delete(vector_store_id)
+            return None
+        except NotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not delete vector store {vector_store_id}: {e}")
+            return f"vector store {vector_store_id}: {e}"
+
+    def _delete_file(self, file_id: str) -> Optional[str]:
+        try:
+            self.openai_client.files.delete(file_id)
+        except NotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not delete file {file_id}: {e}")
+            return f"file {file_id}: {e}"
+
+        if self.file_registry_repository is not None:
+            try:
+                self.file_registry_repository.delete_by_openai_file_id(file_id)
+            except Exception as e:
+                logger.warning(f"Could not unregister file {file_id}: {e}")
+        return None
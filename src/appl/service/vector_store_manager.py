@@ -1,30 +1,63 @@
-from typing import Optional
+import logging
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple, Union
 
-from openai import OpenAI
+from openai import NOT_GIVEN, NotFoundError, NotGiven, OpenAI
 
 from ..repository.supaBase.repositories.vector_metadata_repository import (
     VectorStoreMetadataRepository,
 )
+from ..repository.supaBase.repositories.openai_file_registry_repository import (
+    OpenaiFileRegistryRepository,
+)
 from ..model.vector_store import VectorStoreMetadata
+from .openai_gateway import FILES, VECTOR_STORES, OpenaiGateway, get_openai_gateway
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
 
 class VectorStoreManager:
     def __init__(
         self,
         vector_store_respository: VectorStoreMetadataRepository,
         openai_client: OpenAI,
+        file_registry_repository: Optional[OpenaiFileRegistryRepository] = None,
+        index_timeout_seconds: float = 300,
+        poll_interval_seconds: float = 1.0,
+        id_cache_seconds: float = 300,
+        openai_gateway: Optional[OpenaiGateway] = None,
     ):
         self.vector_store_meatadata_repository = vector_store_respository
         self.openai_client = openai_client
+        self.file_registry_repository = file_registry_repository
+        self.index_timeout_seconds = index_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.id_cache_seconds = id_cache_seconds
+        self.openai_gateway = openai_gateway or get_openai_gateway()
+        # vector_store_id -> (loaded_at, openai vector store id or None)
+        self._openai_ids: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._openai_ids_lock = threading.Lock()
 
     def update_vector_store(
-        self, vector_store_metadata_id: str, openai_file_ids: list[str]
+        self,
+        vector_store_metadata_id: str,
+        openai_file_ids: list[str],
+        incremental: bool = True,
     ):
-        openai_vector_store_id = self.create_vector_store_in_openai(
-            vector_store_metadata_id, openai_file_ids
-        )
+        """
+        Point the vector store at exactly the given files.
 
+        In incremental mode the existing OpenAI store is kept: only new files are
+        attached and only stale files are detached and deleted. A new store is
+        created when there is none yet, when it no longer exists in OpenAI, or
+        when incremental is False.
+
+        Metadata only moves to a new store once its files are indexed (blue/green),
+        so chat never queries a store that is still empty. If indexing doesn't
+        finish in time, the current metadata is returned unchanged.
+        """
         vector_store_metadata = (
             self.vector_store_meatadata_repository.get_by_vector_store_id(
                 vector_store_metadata_id
@@ -35,24 +68,183 @@ class VectorStoreManager:
                 vector_store_id=vector_store_metadata_id
             )
 
+        try:
+            openai_vector_store_id = None
+            if incremental and vector_store_metadata.openai_vector_id:
+                openai_vector_store_id = self.sync_vector_store_files(
+                    vector_store_metadata.openai_vector_id, openai_file_ids
+                )
+
+            if openai_vector_store_id is None:
+                openai_vector_store_id = self.create_vector_store_in_openai(
+                    vector_store_metadata_id, openai_file_ids
+                )
+        except TimeoutError as e:
+            logger.error(f"Vector store {vector_store_metadata_id} not updated: {e}")
+            return vector_store_metadata
+
         vector_store_metadata.openai_vector_id = openai_vector_store_id
         vector_store_metadata.last_synced = datetime.now(timezone.utc).isoformat()
 
-        return self.vector_store_meatadata_repository.upsert_by_vector_store_id(
-            vector_store_metadata_id, vector_store_metadata
+        try:
+            return self.vector_store_meatadata_repository.upsert_by_vector_store_id(
+                vector_store_metadata_id, vector_store_metadata
+            )
+        finally:
+            self.invalidate_openai_vector_store_id(vector_store_metadata_id)
+
+    def sync_vector_store_files(
+        self, openai_vector_store_id: str, openai_file_ids: list[str]
+    ) -> Optional[str]:
+        """
+        Diff the desired files against the files attached to an existing store.
+        New files are attached and indexed before stale ones are removed, so the
+        store never goes empty during an update.
+
+        Returns:
+            The store id, or None if the store no longer exists in OpenAI
+
+        Raises:
+            TimeoutError: New files were not indexed in time (stale files are kept)
+        """
+        try:
+            vector_store = self.openai_gateway.call(
+                VECTOR_STORES,
+                self.openai_client.vector_stores.retrieve,
+                openai_vector_store_id,
+            )
+        except NotFoundError:
+            logger.warning(
+                f"Vector store {openai_vector_store_id} no longer exists, creating a new one"
+            )
+            return None
+        if vector_store.status == "expired":
+            logger.warning(f"Vector store {openai_vector_store_id} expired, creating a new one")
+            return None
+
+        attached_file_ids = self._list_attached_file_ids(openai_vector_store_id)
+        desired_file_ids = set(openai_file_ids)
+        new_file_ids = [
+            file_id for file_id in desired_file_ids if file_id not in attached_file_ids
+        ]
+        stale_file_ids = attached_file_ids - desired_file_ids
+
+        self.attach_files(openai_vector_store_id, new_file_ids)
+        for file_id in stale_file_ids:
+            self._remove_file(openai_vector_store_id, file_id)
+
+        logger.info(
+            f"Vector store {openai_vector_store_id}: attached {len(new_file_ids)}, "
+            f"removed {len(stale_file_ids)}, kept {len(desired_file_ids) - len(new_file_ids)} files"
         )
+        return openai_vector_store_id
+
+    def _list_attached_file_ids(self, openai_vector_store_id: str) -> Set[str]:
+        """
+        Ids of all files attached to a store. Pages are requested one by one with
+        after=<last id> so each request goes through the gateway.
+        """
+        file_ids: Set[str] = set()
+        after: Union[str, NotGiven] = NOT_GIVEN
+        while True:
+            page = self.openai_gateway.call(
+                VECTOR_STORES,
+                self.openai_client.vector_stores.files.list,
+                vector_store_id=openai_vector_store_id,
+                limit=100,
+                after=after,
+            )
+            file_ids.update(vector_store_file.id for vector_store_file in page.data)
+            if not page.has_more or not page.data:
+                return file_ids
+            after = page.data[-1].id
+
+    def attach_files(self, openai_vector_store_id: str, openai_file_ids: list[str]):
+        """
+        Attach files with a single file batch and wait until they are indexed.
+
+        Raises:
+            TimeoutError: The batch did not finish indexing in time, or failed
+        """
+        file_ids = list(dict.fromkeys(openai_file_ids))
+        if not file_ids:
+            return
+
+        file_batch = self.openai_gateway.call(
+            VECTOR_STORES,
+            self.openai_client.vector_stores.file_batches.create,
+            vector_store_id=openai_vector_store_id,
+            file_ids=file_ids,
+        )
+        self._wait_until_indexed(openai_vector_store_id, file_batch.id)
+
+    def _wait_until_indexed(self, openai_vector_store_id: str, file_batch_id: str):
+        """Poll a file batch until OpenAI has finished indexing it."""
+        deadline = time.monotonic() + self.index_timeout_seconds
+        while True:
+            file_batch = self.openai_gateway.call(
+                VECTOR_STORES,
+                self.openai_client.vector_stores.file_batches.retrieve,
+                file_batch_id,
+                vector_store_id=openai_vector_store_id,
+            )
+            if file_batch.status == "completed":
+                if file_batch.file_counts.failed:
+                    logger.warning(
+                        f"Vector store {openai_vector_store_id}: "
+                        f"{file_batch.file_counts.failed} files failed to index"
+                    )
+                return
+            if file_batch.status in ("failed", "cancelled"):
+                raise TimeoutError(
+                    f"File batch {file_batch_id} {file_batch.status} while indexing"
+                )
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"File batch {file_batch_id} not indexed after {self.index_timeout_seconds}s"
+                )
+            time.sleep(self.poll_interval_seconds)
+
+    def _remove_file(self, openai_vector_store_id: str, file_id: str):
+        """Detach a stale file from the store, delete it in OpenAI and forget its content hash."""
+        try:
+            self.openai_gateway.call(
+                VECTOR_STORES,
+                self.openai_client.vector_stores.files.delete,
+                vector_store_id=openai_vector_store_id,
+                file_id=file_id,
+            )
+        except NotFoundError:
+            pass
+        try:
+            self.openai_gateway.call(FILES, self.openai_client.files.delete, file_id)
+        except NotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not delete stale file {file_id}: {e}")
+
+        if self.file_registry_repository is not None:
+            try:
+                self.file_registry_repository.delete_by_openai_file_id(file_id)
+            except Exception as e:
+                logger.warning(f"Could not unregister stale file {file_id}: {e}")
 
     def create_vector_store_in_openai(
         self, vector_store_metadata_id: str, openai_file_ids: list[str]
     ):
-        vector_store = self.openai_client.vector_stores.create(
-            name=vector_store_metadata_id
+        """
+        Create a new store and attach the files to it.
+
+        Raises:
+            TimeoutError: The files were not indexed in time
+        """
+        vector_store = self.openai_gateway.call(
+            VECTOR_STORES,
+            self.openai_client.vector_stores.create,
+            name=vector_store_metadata_id,
         )
 
-        for file_id in openai_file_ids:
-            self.openai_client.vector_stores.files.create(
-                vector_store_id=vector_store.id, file_id=file_id
-            )
+        self.attach_files(vector_store.id, openai_file_ids)
 
         return vector_store.id
 
@@ -62,3 +254,29 @@ class VectorStoreManager:
         return self.vector_store_meatadata_repository.get_by_vector_store_id(
             vector_store_id
         )
+
+    def get_openai_vector_store_id(self, vector_store_id: str) -> Optional[str]:
+        """
+        OpenAI vector store id for a store, cached for id_cache_seconds so the chat
+        path doesn't query Supabase on every turn. Missing stores are cached too.
+        This process drops the entry whenever it updates the store; updates made
+        by other processes are picked up when the entry expires.
+        """
+        with self._openai_ids_lock:
+            cached = self._openai_ids.get(vector_store_id)
+        if cached is not None and time.monotonic() - cached[0] < self.id_cache_seconds:
+            return cached[1]
+
+        vector_store_metadata = self.get_vector_store_by_id(vector_store_id)
+        openai_vector_id = (
+            vector_store_metadata.openai_vector_id
+            if vector_store_metadata is not None
+            else None
+        )
+        with self._openai_ids_lock:
+            self._openai_ids[vector_store_id] = (time.monotonic(), openai_vector_id)
+        return openai_vector_id
+
+    def invalidate_openai_vector_store_id(self, vector_store_id: str):
+        with self._openai_ids_lock:
+            self._openai_ids.pop(vector_store_id, None)
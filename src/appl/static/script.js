@@ -188,8 +188,12 @@ class FantasyBasketballChat {
         this.setLoading(true);
         
         try {
-            const response = await this.callChatAPI(message);
-            this.addAssistantMessage(response);
+            if (this.supportsStreaming()) {
+                await this.streamChatAPI(message);
+            } else {
+                const response = await this.callChatAPI(message);
+                this.addAssistantMessage(response);
+            }
             this.updateStatus('success', 'Message sent successfully');
         } catch (error) {
             console.error('Error sending message:', error);
@@ -220,6 +224,85 @@ class FantasyBasketballChat {
         return await response.text();
     }
     
+    supportsStreaming() {
+        return typeof TextDecoder !== 'undefined'
+            && typeof ReadableStream !== 'undefined'
+            && 'body' in Response.prototype;
+    }
+    
+    async streamChatAPI(message) {
+        // Server-Sent Events from /chat/stream: render the answer as it arrives
+        const response = await fetch(`/chat/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
+            },
+            body: JSON.stringify({
+                session_id: this.sessionId,
+                user_message: message,
+                league_id: this.league_id,
+            })
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let text = '';
+        let content = null;
+        let renderScheduled = false;
+        
+        // Re-render at most once per frame instead of once per token
+        const render = () => {
+            renderScheduled = false;
+            content.innerHTML = this.formatAssistantResponse(text);
+            this.scrollToBottom();
+        };
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            
+            buffer += decoder.decode(value, { stream: true });
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop();
+            
+            for (const frame of frames) {
+                const data = frame
+                    .split('\n')
+                    .filter(line => line.startsWith('data: '))
+                    .map(line => line.slice(6))
+                    .join('\n');
+                if (!data) continue;
+                
+                const event = JSON.parse(data);
+                if (event.type === 'delta') {
+                    if (!content) {
+                        content = this.addAssistantMessage('');
+                        this.updateStatus('loading', 'Receiving response...');
+                    }
+                    text += event.text;
+                    if (!renderScheduled) {
+                        renderScheduled = true;
+                        requestAnimationFrame(render);
+                    }
+                } else if (event.type === 'error') {
+                    throw new Error(event.message);
+                }
+            }
+        }
+        
+        if (content) {
+            render();
+        } else {
+            this.addAssistantMessage(text);
+        }
+    }
+    
     addUserMessage(message) {
         const messageDiv = document.createElement('div');
         messageDiv.className = 'message user-message';
@@ -239,6 +322,7 @@ class FantasyBasketballChat {
         `;
         this.chatMessages.appendChild(messageDiv);
         this.scrollToBottom();
+        return messageDiv.querySelector('.message-content');
     }
     
     addSystemMessage(message) {